@@ -9,21 +9,53 @@ e o executor de código (code_executor).
 # ... imports ...
 # ... inicialização do app Flask ...
 
+import hashlib
+import hmac
+import json
 import logging
+import mimetypes
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
 
-from flask import Flask, abort, jsonify, render_template, request
+from flask import Flask, Response, abort, jsonify, make_response, render_template, request, url_for
 from flask_cors import CORS
+from werkzeug.security import safe_join
 
 from . import code_executor
 from .achievement_manager import AchievementManager
-from .content_renderer import render_content
+from .code_cache import code_cache, code_key
+from .compression import (
+    CompressionCache,
+    compress_response,
+    etag_variants,
+    is_precompressible,
+    negotiate,
+    static_variant,
+)
+from .content_build import BUNDLE_FILENAME, bundle_version, load_bundle
+from .content_cache import content_cache
+from .content_renderer import (
+    ContentRendererFactory,
+    get_highlight_cache_stats,
+    install_highlight_cache,
+    render_content,
+)
 
 # Assume que estes módulos estão no mesmo diretório (projects/)
 # Corrigido para import relativo consistente
+from .course_index import get_course_index
 from .course_manager import CourseManager
+from .execution_limits import resolve_limits, timeout_seconds
 from .exercise_manager import ExerciseManager
+from .exercise_validator import DEFAULT_TIMEOUT as VALIDATION_TIMEOUT
+from .exercise_validator import validate_catalog
+from .job_queue import JobQueue, JobQueueFull
 from .lesson_manager import LessonManager
 from .progress_manager import ProgressManager
+from .result_cache import TRANSIENT_ERROR_TYPES, ResultCache, is_cacheable_exercise, result_key
+from .sandbox_pool import execute_isolated, execute_isolated_with_test, stream_isolated
 
 # Configuração básica de logging
 # Idealmente, esta configuração pode ser mais elaborada e centralizada
@@ -58,8 +90,458 @@ app.jinja_env.filters["plain_text"] = plain_text_filter
 course_mgr = CourseManager()
 lesson_mgr = LessonManager()
 exercise_mgr = ExerciseManager()
-progress_mgr = ProgressManager()
+# Backend de progresso: 'json' (padrão, user_progress.json) ou 'sqlite' (user_progress.db, modo WAL).
+# PROGRESS_WRITE_BEHIND=1 agrupa as gravações em segundo plano (a cada PROGRESS_FLUSH_INTERVAL segundos).
+progress_mgr = ProgressManager(
+    storage_backend=os.environ.get("PROGRESS_STORAGE", "json"),
+    write_behind=os.environ.get("PROGRESS_WRITE_BEHIND", "0") == "1",
+    flush_interval=float(os.environ.get("PROGRESS_FLUSH_INTERVAL", "1.0")),
+)
 achievement_mgr = AchievementManager()
+# Execução do código do usuário: 'pool' (padrão, processos isolados com limites de tempo/memória)
+# ou 'inline' (exec na própria thread do servidor, comportamento original).
+CODE_SANDBOX = os.environ.get("CODE_SANDBOX", "pool")
+# Reaproveitamento de vereditos de submissões idênticas (RESULT_CACHE=1). Exercícios com testes
+# não determinísticos declaram "cache_results": false no exercises.json.
+RESULT_CACHE_ENABLED = os.environ.get("RESULT_CACHE", "0") == "1"
+result_cache = ResultCache(
+    max_entries=int(os.environ.get("RESULT_CACHE_MAX_ENTRIES", "10000")),
+    ttl=float(os.environ.get("RESULT_CACHE_TTL", "3600")),
+)
+# Fila de execução em segundo plano (/api/jobs/*): JOB_WORKERS threads consomem no máximo
+# JOB_QUEUE_SIZE tarefas pendentes; com a fila cheia, a API responde 429 + Retry-After.
+job_queue = JobQueue(
+    workers=int(os.environ.get("JOB_WORKERS", "0")) or None,
+    max_pending=int(os.environ.get("JOB_QUEUE_SIZE", "64")),
+    result_ttl=float(os.environ.get("JOB_RESULT_TTL", "300")),
+    error_result=lambda e: {"success": False, "output": "", "details": f"Erro interno do servidor: {str(e)}"},
+)
+# Limite de bytes de saída (stdout + stderr) capturados por execução em /api/execute-code/stream
+STREAM_MAX_OUTPUT_BYTES = int(os.environ.get("STREAM_MAX_OUTPUT_BYTES", str(code_executor.DEFAULT_MAX_OUTPUT_BYTES)))
+# Token dos endpoints administrativos (/api/admin/*); sem ele, esses endpoints ficam desativados
+ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN", "")
+# Validação do catálogo em andamento: cada uma cria seu próprio pool de processos, então só
+# uma é aceita por vez (as demais recebem 409 até ela terminar)
+_catalog_validation = None
+_catalog_validation_lock = threading.Lock()
+# HTML pré-renderizado das lições (gerado por `python -m projects.content_build`); o filtro
+# `markdown` renderiza ao vivo apenas os textos ausentes do bundle.
+load_bundle(os.environ.get("CONTENT_BUNDLE") or course_mgr.data_dir / BUNDLE_FILENAME)
+# Cache de realce dos blocos de código, compartilhado entre lições (ver content_renderer)
+install_highlight_cache()
+# Compressão gzip/brotli das respostas (COMPRESSION=0 desativa); respostas com ETag e estáticos
+# CSS/JS são comprimidos uma única vez por versão (ver compression.py)
+COMPRESSION_ENABLED = os.environ.get("COMPRESSION", "1") == "1"
+COMPRESS_MIN_BYTES = int(os.environ.get("COMPRESS_MIN_BYTES", "1024"))
+compression_cache = CompressionCache(max_bytes=int(os.environ.get("COMPRESSION_CACHE_BYTES", str(16 * 1024 * 1024))))
+# Parte das ETags das páginas que muda com a configuração de renderização do Markdown
+PAGE_RENDER_VERSION = json.dumps(bundle_version(), sort_keys=True)
+# Intervalo dos comentários de keep-alive no stream SSE de uma tarefa
+JOB_EVENTS_HEARTBEAT = 15.0
+# Espera máxima (s) aceita no long-polling de GET /api/jobs/<id>?wait=N
+JOB_MAX_POLL_WAIT = 30.0
+
+
+def _get_course_index(course):
+    """Retorna o índice de lições/exercícios do curso para consultas O(1).
+
+    As listas vêm do cache de conteúdo dos managers, então o índice só é
+    reconstruído quando os arquivos JSON do curso mudam.
+
+    Args:
+        course (dict): Dados do curso.
+
+    Returns:
+        CourseIndex: Índice do curso.
+    """
+    lessons_file = course.get("lessons_file")
+    exercises_file = course.get("exercises_file")
+    lessons = lesson_mgr.load_lessons_from_file(lessons_file) if lessons_file else []
+    exercises = exercise_mgr.load_exercises_from_file(exercises_file) if exercises_file else []
+    return get_course_index(course, lessons, exercises)
+
+
+def _template_path(name):
+    """Caminho do arquivo de um template, para compor as validações HTTP das páginas."""
+    return Path(app.root_path) / app.template_folder / name
+
+
+def _content_validators(files, *parts):
+    """Calcula a ETag forte e o Last-Modified de uma resposta derivada de arquivos de conteúdo.
+
+    Usa apenas a assinatura (mtime, tamanho) dos arquivos, sem ler nem decodificar o JSON.
+
+    Args:
+        files (list): Arquivos dos quais a resposta depende (JSON de conteúdo, templates).
+        *parts: Demais valores que alteram a resposta (caminho da requisição, versões).
+
+    Returns:
+        tuple: (ETag, Last-Modified em UTC ou None se nenhum arquivo existir).
+    """
+    signatures = [(str(path), content_cache.file_signature(Path(path))) for path in files]
+    etag = hashlib.sha256(repr((parts, signatures)).encode("utf-8")).hexdigest()[:32]
+    mtimes = [signature[0] for _, signature in signatures if signature]
+    last_modified = datetime.fromtimestamp(max(mtimes) / 1e9, tz=timezone.utc) if mtimes else None
+    return etag, last_modified
+
+
+def _with_validators(response, etag, last_modified):
+    """Anexa ETag, Last-Modified e `Cache-Control: no-cache` (revalidar sempre) à resposta."""
+    response = make_response(response)
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def _not_modified(etag, last_modified):
+    """Retorna uma resposta 304 se o cliente já possui a versão atual, senão None.
+
+    `If-None-Match` tem precedência; `If-Modified-Since` só é considerado sem ele.
+    """
+    if request.if_none_match:
+        # O cliente pode ter recebido a variante comprimida, com ETag própria
+        fresh = any(request.if_none_match.contains(tag) for tag in etag_variants(etag))
+    else:
+        since = request.if_modified_since
+        fresh = bool(last_modified and since and last_modified.replace(microsecond=0) <= since)
+    if not fresh:
+        return None
+    return _with_validators(Response(status=304), etag, last_modified)
+
+
+@app.after_request
+def _compress(response):
+    """Comprime respostas de texto conforme o `Accept-Encoding` (ver `compression.compress_response`)."""
+    if COMPRESSION_ENABLED:
+        response = compress_response(response, request.accept_encodings, compression_cache, COMPRESS_MIN_BYTES)
+    return response
+
+
+def _serve_static(filename):
+    """Serve `static/`, usando as variantes pré-comprimidas de CSS/JS quando o cliente as aceita.
+
+    Substitui a view padrão do endpoint `static`; os demais arquivos seguem por `send_static_file`.
+
+    Args:
+        filename (str): Caminho relativo a `static/`.
+
+    Returns:
+        Response: Arquivo (comprimido ou não), ou 304 se o cliente já tiver a versão atual.
+    """
+    if not (COMPRESSION_ENABLED and is_precompressible(filename)):
+        return app.send_static_file(filename)
+    encoding = negotiate(request.accept_encodings)
+    file_path = safe_join(app.static_folder, filename)
+    data = static_variant(Path(file_path), encoding, compression_cache) if encoding and file_path else None
+    if data is None:
+        response = app.send_static_file(filename)
+        response.vary.add("Accept-Encoding")
+        return response
+
+    stat = os.stat(file_path)
+    response = Response(data, mimetype=mimetypes.guess_type(filename)[0] or "application/octet-stream")
+    response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    response.set_etag(f"{stat.st_mtime_ns:x}-{stat.st_size:x}-{encoding}")
+    response.last_modified = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+app.view_functions["static"] = _serve_static
+
+
+def _run_user_code(code_string, execution_globals=None, cache_key=None):
+    """Executa código do usuário conforme o modo configurado em CODE_SANDBOX.
+
+    Args:
+        code_string (str): Código Python a executar.
+        execution_globals (dict, optional): Escopo global inicial.
+        cache_key (tuple, optional): Chave de `code_cache.code_key` para código estático
+            do conteúdo (ex.: test_code), executado a partir do objeto já compilado.
+
+    Returns:
+        dict: Resultado no formato de `code_executor.execute_code`.
+    """
+    if CODE_SANDBOX == "inline":
+        code = code_string
+        if cache_key is not None:
+            try:
+                code = code_cache.get_or_compile(cache_key, code_string)
+            except (SyntaxError, ValueError):
+                pass  # O executor reporta o erro no formato padrão
+        return code_executor.execute_code(code, execution_globals)
+    return execute_isolated(code_string, execution_globals, cache_key=cache_key)
+
+
+def _run_submission(user_code, test_code=None, cache_key=None, limits=None):
+    """Executa o código do aluno e o `test_code` como uma única unidade (ver CODE_SANDBOX).
+
+    No modo "inline" apenas `max_output_bytes` é aplicado: tempo e memória só
+    podem ser limitados no processo trabalhador do sandbox.
+
+    Args:
+        user_code (str): Código submetido pelo aluno.
+        test_code (str, optional): Código de teste do exercício.
+        cache_key (tuple, optional): Chave de `code_cache.code_key` do `test_code`.
+        limits (dict, optional): Limites do exercício (ver `execution_limits.resolve_limits`).
+
+    Returns:
+        dict: Resultado no formato de `code_executor.execute_with_test` ({"user": ..., "test": ...}).
+    """
+    limits = limits or {}
+    if CODE_SANDBOX == "inline":
+        test = test_code
+        if test_code and cache_key is not None:
+            try:
+                test = code_cache.get_or_compile(cache_key, test_code)
+            except (SyntaxError, ValueError):
+                pass  # O executor reporta o erro no formato padrão
+        return code_executor.execute_with_test(user_code, test, limits.get("max_output_bytes"))
+    return execute_isolated_with_test(
+        user_code,
+        test_code,
+        cache_key=cache_key,
+        timeout=timeout_seconds(limits),
+        memory_limit_mb=limits.get("max_memory_mb"),
+        max_output_bytes=limits.get("max_output_bytes"),
+    )
+
+
+def _evaluate_submission(exercise, user_code, limits=None):
+    """Executa o código do aluno e o `test_code` do exercício e monta o veredito.
+
+    A saída do código do usuário é disponibilizada para o `test_code` através
+    da variável global `output`.
+
+    Args:
+        exercise (dict): Dados do exercício.
+        user_code (str): Código submetido pelo aluno.
+        limits (dict, optional): Limites de recursos da execução (ver `execution_limits`).
+
+    Returns:
+        tuple: (veredito, reaproveitável). O veredito é um dict com `success`,
+        `output` e `details`; reaproveitável é False quando alguma execução
+        terminou por um erro transitório (tempo esgotado, trabalhador ocupado etc.).
+    """
+    test_code = exercise.get("test_code", "")
+    error_types = set()
+
+    # Código do usuário e test_code rodam juntos; o test_code só executa se o código do usuário não falhar
+    test_key = code_key(exercise.get("id"), "test_code", test_code) if test_code else None
+    results = _run_submission(user_code, test_code, cache_key=test_key, limits=limits)
+
+    # 1. Saída da execução do código do usuário
+    user_exec_result = results["user"]
+    user_stdout = user_exec_result["stdout"]
+    user_stderr = user_exec_result["stderr"]
+    user_success = user_exec_result["returncode"] == 0
+    error_types.add(user_exec_result.get("error_type"))
+
+    # Inicializa 'output' com a saída do código do usuário.
+    # Será sobrescrito pela saída do test_code se este for executado.
+    api_output_response = user_stdout
+    details = user_stderr  # Detalhes podem vir do erro do usuário ou do teste
+    success = False  # Assume que falha até que o test_code passe ou não haja test_code
+
+    if not user_success:
+        # Se o código do usuário já falhou (ex: SyntaxError), não precisamos rodar o test_code
+        details = user_stderr if user_stderr else "Erro de sintaxe ou execução no seu código."
+        logger.info(f"POST /api/check-exercise - Código do usuário falhou. Details: {details}")
+    elif not test_code:
+        # Se não há test_code, o sucesso depende apenas da execução do user_code
+        success = user_success
+        # 'api_output_response' já é user_stdout
+        details = (
+            "Código executado (sem testes automáticos)."
+            if success
+            else (details or "Erro na execução do código do usuário.")
+        )
+    else:
+        # 2. Resultado do test_code, executado com a saída do user_code na variável global 'output'
+        test_exec_result = results["test"]
+        success = test_exec_result["returncode"] == 0
+        error_types.add(test_exec_result.get("error_type"))
+
+        # O 'output' da API deve combinar o stdout do user_code e do test_code
+        # Se o test_code produziu output (ex: "SUCCESS"), anexe-o.
+        # Se o user_code produziu output, ele já está em api_output_response.
+        if test_exec_result["stdout"]:
+            api_output_response = (api_output_response or "") + test_exec_result["stdout"]
+
+        # Os 'details' devem incluir o tipo de erro se houver
+        details_from_test_code = test_exec_result["stderr"]
+        error_type_from_test = test_exec_result.get("error_type")
+
+        if error_type_from_test:
+            details = f"{error_type_from_test}: {details_from_test_code}"
+        else:
+            details = (
+                details_from_test_code
+                if details_from_test_code
+                else ("Teste falhou sem stderr específico." if not success else "Teste passou.")
+            )
+        # Se o user_code teve stderr, mas o test_code passou, podemos querer limpar os detalhes ou priorizar os do teste.
+
+    if not test_code and success:
+        details = "Código executado com sucesso (nenhum teste automático para este exercício)."
+    elif not test_code and not success:
+        details = f"Erro ao executar o código: {details if details else 'Erro desconhecido'}"
+
+    cacheable = not (error_types & TRANSIENT_ERROR_TYPES)
+    return {"success": success, "output": api_output_response, "details": details}, cacheable
+
+
+def _sse_event(name, payload):
+    """Formata um evento Server-Sent Events com payload JSON."""
+    return f"event: {name}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+def _execute_code_payload(user_code):
+    """Executa um trecho de código e monta a resposta de `/api/execute-code`.
+
+    Args:
+        user_code (str): Código Python a executar.
+
+    Returns:
+        dict: `{"success": bool, "output": str, "details": str}`.
+    """
+    exec_result = _run_user_code(user_code)
+    success = exec_result["returncode"] == 0
+    output = exec_result["stdout"]
+    details = exec_result["stderr"]
+    if not success and not details and exec_result.get("error_type") == "SyntaxError":
+        details = "Erro de sintaxe no código."
+    elif not success and not details:
+        details = "Erro durante a execução do código."
+
+    logger.info(f"execute-code - Execução: success={success}")
+    return {"success": success, "output": output, "details": details}
+
+
+def _resolve_exercise_submission(data):
+    """Localiza o exercício de uma submissão de `/api/check-exercise`.
+
+    Args:
+        data (dict): JSON da requisição, já validado quanto aos campos obrigatórios.
+
+    Returns:
+        tuple: (exercício, None) se encontrado, ou (None, (payload de erro, status HTTP)).
+    """
+    course_id = data["course_id"]
+    exercise_id_str = str(data["exercise_id"])
+
+    course = course_mgr.get_course_by_id(course_id)
+    if not course:
+        logger.warning(f"check-exercise - Curso '{course_id}' não encontrado.")
+        return None, ({"success": False, "output": "", "details": f"Curso '{course_id}' não encontrado."}, 404)
+
+    exercises_file_relative_path = course.get("exercises_file")
+    if not exercises_file_relative_path:
+        logger.error(f"check-exercise - 'exercises_file' não definido para o curso '{course_id}'.")
+        return None, (
+            {"success": False, "output": "", "details": "Arquivo de exercícios não definido para este curso."},
+            500,
+        )
+
+    exercise_details_to_check = _get_course_index(course).get_exercise(exercise_id_str)
+
+    if not exercise_details_to_check:
+        logger.warning(
+            f"check-exercise - Exercício '{exercise_id_str}' não encontrado no curso '{course_id}' ou nível incompatível."
+        )  # No Linter: Adicionar espaço antes do #
+        return None, (
+            {
+                "success": False,
+                "output": "",
+                "details": f"Exercício '{exercise_id_str}' não encontrado no curso '{course_id}'.",
+            },
+            404,
+        )
+
+    return exercise_details_to_check, None
+
+
+def _check_exercise_payload(data, exercise):
+    """Verifica uma submissão e registra a tentativa do aluno.
+
+    Usada pela rota síncrona `/api/check-exercise` e pelas tarefas da fila
+    (`/api/jobs/check-exercise`); não depende do contexto da requisição.
+
+    Args:
+        data (dict): JSON da requisição (course_id, exercise_id, code e user_id opcional).
+        exercise (dict): Exercício retornado por `_resolve_exercise_submission`.
+
+    Returns:
+        dict: Resposta da verificação (success, output, details, stats, new_achievements, cached).
+    """
+    course_id = data["course_id"]
+    exercise_id_str = str(data["exercise_id"])
+    user_code = data["code"]
+    user_id = data.get("user_id", "default")
+    limits = resolve_limits(exercise, course_mgr.get_course_by_id(course_id))
+
+    verdict = None
+    verdict_key = None
+    if RESULT_CACHE_ENABLED and is_cacheable_exercise(exercise):
+        verdict_key = result_key(exercise, user_code, limits)
+        verdict = result_cache.get(verdict_key)
+
+    cached = verdict is not None
+    if cached:
+        logger.info(f"check-exercise - Veredito reaproveitado do cache para '{exercise_id_str}'.")
+    else:
+        verdict, cacheable = _evaluate_submission(exercise, user_code, limits)
+        if verdict_key is not None and cacheable:
+            result_cache.put(verdict_key, verdict)
+
+    success = verdict["success"]
+    api_output_response = verdict["output"]
+    details = verdict["details"]
+
+    # Registrar tentativa do exercício (sucesso ou falha)
+    try:
+        exercise_progress = progress_mgr.mark_exercise_attempt(user_id, course_id, exercise_id_str, success=success)
+
+        # Adicionar estatísticas de tentativas na resposta
+        exercise_stats = exercise_progress.get("exercises", {}).get(exercise_id_str, {})
+        attempts_count = exercise_stats.get("attempts", 1)
+        successful_attempts = exercise_stats.get("successful_attempts", 0)
+        failed_attempts = exercise_stats.get("failed_attempts", 0)
+
+        logger.info(
+            f"Exercício '{exercise_id_str}' - Tentativa registrada. Total: {attempts_count}, Sucesso: {successful_attempts}, Falhas: {failed_attempts}"
+        )
+    except Exception as prog_error:
+        logger.error(f"Erro ao registrar tentativa do exercício: {prog_error}", exc_info=True)
+        attempts_count = 1
+        successful_attempts = 1 if success else 0
+        failed_attempts = 0 if success else 1
+
+    logger.info(f"check-exercise - Verificação: success={success}")
+
+    # Verificar novas conquistas
+    new_achievements = achievement_mgr.check_new_achievements(user_id, progress_mgr)
+
+    # Preparar resposta com estatísticas
+    response_data = {
+        "success": success,
+        "output": api_output_response,
+        "details": details,
+        "stats": {
+            "attempts": attempts_count,
+            "successful_attempts": successful_attempts,
+            "failed_attempts": failed_attempts,
+            "first_try": attempts_count == 1 and success,
+        },
+        "new_achievements": new_achievements,
+        "cached": cached,
+    }
+
+    return response_data
+
 
 # --- Rotas de Apresentação (HTML) ---
 
@@ -144,16 +626,25 @@ def course_roadmap_page(course_id):
     lessons_file = course.get("lessons_file")
     exercises_file = course.get("exercises_file")
 
+    files = [course_mgr.courses_file, _template_path("course_roadmap.html"), _template_path("base.html")]
+    files += [lesson_mgr.lessons_file_path(lessons_file)] if lessons_file else []
+    files += [exercise_mgr.exercises_file_path(exercises_file)] if exercises_file else []
+    etag, last_modified = _content_validators(files, request.path, PAGE_RENDER_VERSION)
+    not_modified = _not_modified(etag, last_modified)
+    if not_modified:
+        return not_modified
+
     lessons = lesson_mgr.load_lessons_from_file(lessons_file) if lessons_file else []
     exercises = exercise_mgr.load_exercises_from_file(exercises_file) if exercises_file else []
 
-    return render_template(
+    page = render_template(
         "course_roadmap.html",
         course=course,
         lessons=lessons,
         exercises=exercises,
         title=f"Roadmap - {course.get('name', 'Curso')}",
     )
+    return _with_validators(page, etag, last_modified)
 
 
 @app.route("/courses/<string:course_id>/lessons/<string:lesson_id_str>", methods=["GET"])
@@ -183,51 +674,21 @@ def lesson_detail_page(course_id, lesson_id_str):  # Renomeado para clareza
         logger.error(f"'lessons_file' não definido para o curso '{course_id}'.")
         abort(500, description="Configuração de lições ausente para este curso.")
 
-    all_lessons_for_course = lesson_mgr.load_lessons_from_file(lessons_file_relative_path)
-
-    current_lesson = None
-    current_lesson_index = -1
-    for i, lesson_item_loop in enumerate(all_lessons_for_course):
-        if isinstance(lesson_item_loop, dict) and str(lesson_item_loop.get("id")) == lesson_id_str:
-            current_lesson = lesson_item_loop
-            current_lesson_index = i
-            break
+    course_index = _get_course_index(current_course)
+    current_lesson = course_index.get_lesson(lesson_id_str)
 
     if not current_lesson:
         logger.warning(f"Lição com ID '{lesson_id_str}' não encontrada no curso '{course_id}'.")
         abort(404)
 
-    course_level_from_course_json = current_course.get("level")
-    expected_exercise_level = course_level_from_course_json.lower() if course_level_from_course_json else None
-
-    exercises_for_lesson = []
-    exercises_file_relative_path = current_course.get("exercises_file")
-    if exercises_file_relative_path:
-        all_exercises_for_course = exercise_mgr.load_exercises_from_file(exercises_file_relative_path)
-        lesson_actual_id = current_lesson.get("id")  # ID da lição atual
-        if lesson_actual_id and all_exercises_for_course:
-            for ex_item in all_exercises_for_course:
-                # Log para depuração
-                logger.debug(
-                    f"Verificando exercício: ID='{ex_item.get('id')}', "
-                    f"LessonID_Ex='{ex_item.get('lesson_id')}', LessonID_Atual='{lesson_actual_id}', "
-                    f"Level_Ex='{ex_item.get('level', '').lower()}', Level_Esperado='{expected_exercise_level}'"
-                )
-
-                # Verifica se o exercício pertence à lição atual E ao nível esperado do curso
-                if (
-                    isinstance(ex_item, dict)
-                    and str(ex_item.get("lesson_id")) == str(lesson_actual_id)
-                    and (not expected_exercise_level or ex_item.get("level", "").lower() == expected_exercise_level)
-                ):
-                    exercises_for_lesson.append(ex_item)
-        logger.debug(f"Encontrados {len(exercises_for_lesson)} exercícios para a lição '{lesson_actual_id}'.")
+    # Exercícios da lição já filtrados pelo nível do curso no índice
+    exercises_for_lesson = course_index.get_exercises_for_lesson(current_lesson.get("id"))
+    if current_course.get("exercises_file"):
+        logger.debug(f"Encontrados {len(exercises_for_lesson)} exercícios para a lição '{current_lesson.get('id')}'.")
     else:
         logger.warning(f"Nenhum 'exercises_file' definido para o curso '{course_id}'.")
 
-    next_lesson_obj = None
-    if current_lesson_index != -1 and current_lesson_index < len(all_lessons_for_course) - 1:
-        next_lesson_obj = all_lessons_for_course[current_lesson_index + 1]
+    next_lesson_obj = course_index.get_next_lesson(lesson_id_str)
 
     # Marcar lição como completa quando o usuário acessa
     try:
@@ -237,7 +698,17 @@ def lesson_detail_page(course_id, lesson_id_str):  # Renomeado para clareza
     except Exception as prog_error:
         logger.error(f"Erro ao marcar progresso da lição: {prog_error}", exc_info=True)
 
-    return render_template(
+    # O progresso acima é registrado mesmo quando o cliente já tem a página (304)
+    files = [course_mgr.courses_file, _template_path("lesson_detail.html"), _template_path("base.html")]
+    files.append(lesson_mgr.lessons_file_path(lessons_file_relative_path))
+    if current_course.get("exercises_file"):
+        files.append(exercise_mgr.exercises_file_path(current_course["exercises_file"]))
+    etag, last_modified = _content_validators(files, request.path, PAGE_RENDER_VERSION)
+    not_modified = _not_modified(etag, last_modified)
+    if not_modified:
+        return not_modified
+
+    page = render_template(
         "lesson_detail.html",  # Assumindo que o template se chama lesson_detail.html
         course=current_course,
         lesson=current_lesson,
@@ -245,6 +716,7 @@ def lesson_detail_page(course_id, lesson_id_str):  # Renomeado para clareza
         next_lesson=next_lesson_obj,
         title=current_lesson.get("title", "Lição"),
     )
+    return _with_validators(page, etag, last_modified)
 
 
 @app.route("/courses/<string:course_id>/exercise/<string:exercise_id_str>/editor", methods=["GET"])
@@ -274,20 +746,8 @@ def exercise_code_editor_page(course_id, exercise_id_str):  # Renomeado para cla
         logger.error(f"Editor: 'exercises_file' não definido para o curso '{course_id}'.")
         abort(500, description="Configuração de exercícios ausente para este curso.")
 
-    course_level_from_course_json = current_course.get("level")
-    expected_exercise_level = course_level_from_course_json.lower() if course_level_from_course_json else None
-
-    all_exercises_for_course = exercise_mgr.load_exercises_from_file(exercises_file_relative_path)
-    current_exercise = None
-    for ex_item in all_exercises_for_course:
-        if isinstance(ex_item, dict) and str(ex_item.get("id")) == exercise_id_str:
-            if not expected_exercise_level or ex_item.get("level", "").lower() == expected_exercise_level:
-                current_exercise = ex_item
-                break
-            else:
-                logger.warning(
-                    f"Editor: Exercício '{exercise_id_str}' encontrado, mas seu nível '{ex_item.get('level')}' não corresponde ao nível esperado do curso '{expected_exercise_level}'."
-                )
+    course_index = _get_course_index(current_course)
+    current_exercise = course_index.get_exercise(exercise_id_str)
 
     if not current_exercise:
         logger.warning(
@@ -295,46 +755,13 @@ def exercise_code_editor_page(course_id, exercise_id_str):  # Renomeado para cla
         )
         abort(404)
 
-    # Encontrar a lição do exercício
+    # Lição do exercício e navegação: próximo exercício da mesma lição ou, na falta dele, próxima lição
     lesson_id = current_exercise.get("lesson_id")
-    current_lesson = None
-    if lesson_id:
-        lessons_file = current_course.get("lessons_file")
-        if lessons_file:
-            all_lessons = lesson_mgr.load_lessons_from_file(lessons_file)
-            for lesson in all_lessons:
-                if str(lesson.get("id")) == str(lesson_id):
-                    current_lesson = lesson
-                    break
-
-    # Encontrar próximo exercício ou próxima lição
-    next_exercise = None
+    current_lesson = course_index.get_lesson(lesson_id) if lesson_id else None
+    next_exercise = course_index.get_next_exercise(exercise_id_str)
     next_lesson = None
-    current_exercise_index = -1
-
-    for i, ex in enumerate(all_exercises_for_course):
-        if str(ex.get("id")) == exercise_id_str:
-            current_exercise_index = i
-            break
-
-    # Próximo exercício da mesma lição
-    if current_exercise_index != -1 and current_exercise_index < len(all_exercises_for_course) - 1:
-        for i in range(current_exercise_index + 1, len(all_exercises_for_course)):
-            next_ex = all_exercises_for_course[i]
-            if str(next_ex.get("lesson_id")) == str(lesson_id):
-                next_exercise = next_ex
-                break
-
-    # Se não há próximo exercício, buscar próxima lição
     if not next_exercise and current_lesson:
-        lessons_file = current_course.get("lessons_file")
-        if lessons_file:
-            all_lessons = lesson_mgr.load_lessons_from_file(lessons_file)
-            for i, lesson in enumerate(all_lessons):
-                if str(lesson.get("id")) == str(lesson_id):
-                    if i < len(all_lessons) - 1:
-                        next_lesson = all_lessons[i + 1]
-                    break
+        next_lesson = course_index.get_next_lesson(lesson_id)
 
     return render_template(
         "exercise_editor.html",
@@ -368,13 +795,18 @@ def api_get_all_courses():
     """API endpoint para obter todos os cursos disponíveis.
 
     Returns:
-        JSON: Lista de todos os cursos com suas informações básicas.
+        JSON: Lista de todos os cursos com suas informações básicas, com ETag e Last-Modified
+        (304 Not Modified se a requisição já tiver a versão atual).
     """
     logger.info("GET /api/courses - Obtendo lista de todos os cursos.")
     try:
+        etag, last_modified = _content_validators([course_mgr.courses_file], request.path)
+        not_modified = _not_modified(etag, last_modified)
+        if not_modified:
+            return not_modified
         all_courses = course_mgr.get_courses()
         logger.info(f"GET /api/courses - Sucesso: {len(all_courses)} cursos retornados.")
-        return jsonify(all_courses)
+        return _with_validators(jsonify(all_courses), etag, last_modified)
     except Exception as e:
         logger.error(f"Erro ao obter lista de cursos: {e}", exc_info=True)
         return jsonify({"error": "Erro interno do servidor"}), 500
@@ -395,6 +827,7 @@ def api_get_lessons_for_course(course_id):
                 `{"error": "Curso não encontrado"}`
             Em caso de arquivo de lições não definido (500 Internal Server Error):
                 `{"error": "Arquivo de lições não definido para este curso"}`
+            Com `If-None-Match` igual à ETag atual (304 Not Modified): corpo vazio.
 
     """
     logger.info(f"API GET /courses/{course_id}/lessons - Solicitando lições para o curso ID: {course_id}")
@@ -408,8 +841,15 @@ def api_get_lessons_for_course(course_id):
         logger.error(f"API GET /courses/{course_id}/lessons - 'lessons_file' não definido para este curso.")
         return jsonify({"error": "Arquivo de lições não definido para este curso"}), 500
 
+    etag, last_modified = _content_validators(
+        [lesson_mgr.lessons_file_path(lessons_file_relative_path)], request.path
+    )
+    not_modified = _not_modified(etag, last_modified)
+    if not_modified:
+        return not_modified
+
     lessons = lesson_mgr.load_lessons_from_file(lessons_file_relative_path)
-    return jsonify(lessons)
+    return _with_validators(jsonify(lessons), etag, last_modified)
 
 
 @app.route("/api/courses/<string:course_id>/exercises", methods=["GET"])
@@ -427,6 +867,7 @@ def api_get_exercises_for_course(course_id):
                 `{"error": "Curso não encontrado"}`
             Em caso de arquivo de exercícios não definido (500 Internal Server Error):
                 `{"error": "Arquivo de exercícios não definido para este curso"}`
+            Com `If-None-Match` igual à ETag atual (304 Not Modified): corpo vazio.
 
     """
     logger.info(f"API GET /courses/{course_id}/exercises - Solicitando exercícios para o curso ID: {course_id}")
@@ -440,8 +881,15 @@ def api_get_exercises_for_course(course_id):
         logger.error(f"API GET /courses/{course_id}/exercises - 'exercises_file' não definido para o curso.")
         return jsonify({"error": "Arquivo de exercícios não definido para este curso"}), 500
 
+    etag, last_modified = _content_validators(
+        [exercise_mgr.exercises_file_path(exercises_file_relative_path)], request.path
+    )
+    not_modified = _not_modified(etag, last_modified)
+    if not_modified:
+        return not_modified
+
     exercises = exercise_mgr.load_exercises_from_file(exercises_file_relative_path)
-    return jsonify(exercises)
+    return _with_validators(jsonify(exercises), etag, last_modified)
 
 
 @app.route("/api/execute-code", methods=["POST"])
@@ -472,24 +920,65 @@ def api_execute_code():
         logger.warning("POST /api/execute-code - Payload inválido ou 'code' ausente.")
         return jsonify({"success": False, "output": "", "details": "Payload inválido ou campo 'code' ausente."}), 400
 
-    user_code = data["code"]
     try:
-        exec_result = code_executor.execute_code(user_code)
-        success = exec_result["returncode"] == 0
-        output = exec_result["stdout"]
-        details = exec_result["stderr"]
-        if not success and not details and exec_result.get("error_type") == "SyntaxError":
-            details = "Erro de sintaxe no código."
-        elif not success and not details:
-            details = "Erro durante a execução do código."
-
-        logger.info(f"POST /api/execute-code - Execução: success={success}")
-        return jsonify({"success": success, "output": output, "details": details})
+        return jsonify(_execute_code_payload(data["code"]))
     except Exception as e:
         logger.error(f"POST /api/execute-code - Erro inesperado: {e}", exc_info=True)
         return jsonify({"success": False, "output": "", "details": f"Erro interno do servidor: {str(e)}"}), 500
 
 
+@app.route("/api/execute-code/stream", methods=["POST"])
+def api_execute_code_stream():
+    """API endpoint para executar código transmitindo a saída à medida que é produzida.
+
+    Mesmo payload de `/api/execute-code`. A resposta é um stream Server-Sent Events
+    (leia com `fetch` + `ReadableStream`, pois o EventSource não envia POST):
+
+        event: output
+        data: {"stream": "stdout" | "stderr", "text": "str"}
+
+        event: result
+        data: {"success": bool, "details": "str", "truncated": bool}
+
+    A saída capturada é limitada a STREAM_MAX_OUTPUT_BYTES bytes; ao atingir o
+    limite, um marcador de truncamento é enviado e o restante é descartado.
+    Se o cliente desconectar, o processo trabalhador do sandbox é encerrado.
+    Disponível apenas com CODE_SANDBOX=pool: no modo "inline" não há como
+    interromper a execução, e a rota responde 501 (use `/api/execute-code`).
+
+    Returns:
+        Response: Stream `text/event-stream`, 400 se o payload for inválido ou
+        501 no modo "inline".
+    """
+    data = request.get_json(silent=True)
+    if not data or "code" not in data:
+        logger.warning("POST /api/execute-code/stream - Payload inválido ou 'code' ausente.")
+        return jsonify({"success": False, "output": "", "details": "Payload inválido ou campo 'code' ausente."}), 400
+    if CODE_SANDBOX == "inline":
+        logger.warning("POST /api/execute-code/stream - Streaming indisponível com CODE_SANDBOX=inline.")
+        details = "Execução em streaming requer CODE_SANDBOX=pool; use /api/execute-code."
+        return jsonify({"success": False, "output": "", "details": details}), 501
+
+    events = stream_isolated(data["code"], max_output_bytes=STREAM_MAX_OUTPUT_BYTES)
+
+    def stream():
+        try:
+            for event in events:
+                if event[0] == "output":
+                    yield _sse_event("output", {"stream": event[1], "text": event[2]})
+                    continue
+                result = event[1]
+                success = result["returncode"] == 0
+                details = "" if success else (result.get("error_type") or "Erro durante a execução do código.")
+                logger.info(f"POST /api/execute-code/stream - Execução: success={success}")
+                yield _sse_event("result", {"success": success, "details": details, "truncated": result["truncated"]})
+        finally:
+            events.close()
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return Response(stream(), mimetype="text/event-stream", headers=headers)
+
+
 @app.route("/api/check-exercise", methods=["POST"])
 def api_check_exercise():
     """API endpoint para verificar a solução de um exercício submetida pelo usuário.
@@ -499,6 +988,10 @@ def api_check_exercise():
     exercício, executa-o também. A saída do código do usuário é disponibilizada
     para o `test_code` através de uma variável global `output` no escopo do teste.
 
+    Com RESULT_CACHE=1, submissões idênticas (mesmo exercício, mesmo conteúdo e
+    mesmo código normalizado) reaproveitam o veredito anterior sem executar o
+    código; a tentativa é registrada no progresso normalmente.
+
     JSON de Requisição:
         {
             "course_id": "str",
@@ -535,150 +1028,278 @@ def api_check_exercise():
             }
         ), 400
 
-    course_id = data["course_id"]
-    exercise_id_str = str(data["exercise_id"])
-    user_code = data["code"]
-
-    course = course_mgr.get_course_by_id(course_id)
-    if not course:
-        logger.warning(f"POST /api/check-exercise - Curso '{course_id}' não encontrado.")
-        return jsonify({"success": False, "output": "", "details": f"Curso '{course_id}' não encontrado."}), 404
+    exercise_details_to_check, error = _resolve_exercise_submission(data)
+    if error:
+        return jsonify(error[0]), error[1]
 
-    exercises_file_relative_path = course.get("exercises_file")
-    if not exercises_file_relative_path:
-        logger.error(f"POST /api/check-exercise - 'exercises_file' não definido para o curso '{course_id}'.")
+    try:
+        return jsonify(_check_exercise_payload(data, exercise_details_to_check))
+    except Exception as e:
+        logger.error(f"POST /api/check-exercise - Erro inesperado: {e}", exc_info=True)
         return jsonify(
-            {"success": False, "output": "", "details": "Arquivo de exercícios não definido para este curso."}
+            {"success": False, "output": "", "details": f"Erro interno do servidor ao verificar: {str(e)}"}
         ), 500
 
-    course_level_from_course_json = course.get("level")
-    expected_exercise_level = course_level_from_course_json.lower() if course_level_from_course_json else None
 
-    exercises = exercise_mgr.load_exercises_from_file(exercises_file_relative_path)
-    exercise_details_to_check = None
-    for ex_item in exercises:
-        if isinstance(ex_item, dict) and str(ex_item.get("id")) == exercise_id_str:
-            if not expected_exercise_level or ex_item.get("level", "").lower() == expected_exercise_level:
-                exercise_details_to_check = ex_item
-                break
+@app.route("/api/jobs/execute-code", methods=["POST"])
+def api_submit_execute_code_job():
+    """API endpoint para executar código em segundo plano.
 
-    if not exercise_details_to_check:
-        logger.warning(
-            f"POST /api/check-exercise - Exercício '{exercise_id_str}' não encontrado no curso '{course_id}' ou nível incompatível."
-        )  # No Linter: Adicionar espaço antes do #
+    Mesmo payload de `/api/execute-code`; a resposta traz o ID da tarefa, e o
+    resultado (no formato de `/api/execute-code`) é obtido em `poll_url` ou
+    recebido via Server-Sent Events em `events_url`.
+
+    JSON de Resposta:
+        Tarefa aceita (202 Accepted):
+            `{"job_id": "str", "status": "queued", "poll_url": "str", "events_url": "str"}`
+        Payload inválido (400 Bad Request):
+            `{"success": false, "output": "", "details": "Payload inválido ou campo 'code' ausente."}`
+        Fila cheia (429 Too Many Requests, com cabeçalho Retry-After):
+            `{"success": false, "output": "", "details": "Fila de execução cheia..."}`
+    """
+    data = request.get_json(silent=True)
+    if not data or "code" not in data:
+        logger.warning("POST /api/jobs/execute-code - Payload inválido ou 'code' ausente.")
+        return jsonify({"success": False, "output": "", "details": "Payload inválido ou campo 'code' ausente."}), 400
+    return _submit_job("execute-code", _execute_code_payload, data["code"])
+
+
+@app.route("/api/jobs/check-exercise", methods=["POST"])
+def api_submit_check_exercise_job():
+    """API endpoint para verificar um exercício em segundo plano.
+
+    Mesmo payload de `/api/check-exercise`. Curso e exercício são validados na
+    submissão (400/404 imediatos); o resultado da tarefa tem o formato de
+    `/api/check-exercise` e a tentativa é registrada quando a tarefa executa.
+
+    JSON de Resposta:
+        Tarefa aceita (202 Accepted):
+            `{"job_id": "str", "status": "queued", "poll_url": "str", "events_url": "str"}`
+        Fila cheia (429 Too Many Requests, com cabeçalho Retry-After).
+    """
+    data = request.get_json(silent=True)
+    if not data or not all(k in data for k in ["course_id", "exercise_id", "code"]):
+        logger.warning("POST /api/jobs/check-exercise - Payload inválido ou campos ausentes.")
         return jsonify(
             {
                 "success": False,
                 "output": "",
-                "details": f"Exercício '{exercise_id_str}' não encontrado no curso '{course_id}'.",
+                "details": "Payload inválido. 'course_id', 'exercise_id', e 'code' são obrigatórios.",
             }
-        ), 404
+        ), 400
 
-    test_code = exercise_details_to_check.get("test_code", "")
-    # full_code_to_execute = user_code.rstrip() + "\n\n" + test_code # Lógica antiga
+    exercise, error = _resolve_exercise_submission(data)
+    if error:
+        return jsonify(error[0]), error[1]
+    return _submit_job("check-exercise", _check_exercise_payload, data, exercise)
+
+
+def _submit_job(kind, func, *args):
+    """Enfileira uma tarefa e monta a resposta 202 (ou 429 com Retry-After se a fila estiver cheia)."""
+    response, _job = _enqueue_job(kind, func, *args)
+    return response
 
+
+def _enqueue_job(kind, func, *args):
+    """Como `_submit_job`, mas devolve também a tarefa criada (None se a fila estiver cheia)."""
     try:
-        # 1. Executar o código do usuário e capturar sua saída
-        user_exec_result = code_executor.execute_code(user_code)
-        user_stdout = user_exec_result["stdout"]
-        user_stderr = user_exec_result["stderr"]
-        user_success = user_exec_result["returncode"] == 0
-
-        # Inicializa 'output' com a saída do código do usuário.
-        # Será sobrescrito pela saída do test_code se este for executado.
-        api_output_response = user_stdout
-        details = user_stderr  # Detalhes podem vir do erro do usuário ou do teste
-        success = False  # Assume que falha até que o test_code passe ou não haja test_code
-
-        if not user_success:
-            # Se o código do usuário já falhou (ex: SyntaxError), não precisamos rodar o test_code
-            details = user_stderr if user_stderr else "Erro de sintaxe ou execução no seu código."
-            logger.info(f"POST /api/check-exercise - Código do usuário falhou. Details: {details}")
-        elif not test_code:
-            # Se não há test_code, o sucesso depende apenas da execução do user_code
-            success = user_success
-            # 'api_output_response' já é user_stdout
-            details = (
-                "Código executado (sem testes automáticos)."
-                if success
-                else (details or "Erro na execução do código do usuário.")
-            )
-        else:
-            # 2. Preparar e executar o test_code com a saída do user_code disponível
-            test_globals = {"output": user_stdout}  # Disponibiliza a saída do user_code para o test_code
-            test_exec_result = code_executor.execute_code(test_code, execution_globals=test_globals)
-            success = test_exec_result["returncode"] == 0
-
-            # O 'output' da API deve combinar o stdout do user_code e do test_code
-            # Se o test_code produziu output (ex: "SUCCESS"), anexe-o.
-            # Se o user_code produziu output, ele já está em api_output_response.
-            if test_exec_result["stdout"]:
-                api_output_response = (api_output_response or "") + test_exec_result["stdout"]
-
-            # Os 'details' devem incluir o tipo de erro se houver
-            details_from_test_code = test_exec_result["stderr"]
-            error_type_from_test = test_exec_result.get("error_type")
-
-            if error_type_from_test:
-                details = f"{error_type_from_test}: {details_from_test_code}"
-            else:
-                details = (
-                    details_from_test_code
-                    if details_from_test_code
-                    else ("Teste falhou sem stderr específico." if not success else "Teste passou.")
-                )
-            # Se o user_code teve stderr, mas o test_code passou, podemos querer limpar os detalhes ou priorizar os do teste.
+        job = job_queue.submit(kind, func, *args)
+    except JobQueueFull as e:
+        logger.warning(f"POST /api/jobs/{kind} - Fila cheia; Retry-After={e.retry_after}s.")
+        response = (
+            jsonify({"success": False, "output": "", "details": str(e)}),
+            429,
+            {"Retry-After": str(e.retry_after)},
+        )
+        return response, None
 
-        if not test_code and success:
-            details = "Código executado com sucesso (nenhum teste automático para este exercício)."
-        elif not test_code and not success:
-            details = f"Erro ao executar o código: {details if details else 'Erro desconhecido'}"
+    poll_url = url_for("api_get_job", job_id=job.id)
+    logger.info(f"POST /api/jobs/{kind} - Tarefa '{job.id}' enfileirada.")
+    return (jsonify(_job_links(job)), 202, {"Location": poll_url}), job
 
-        # Registrar tentativa do exercício (sucesso ou falha)
-        try:
-            user_id = data.get("user_id", "default")
-            exercise_progress = progress_mgr.mark_exercise_attempt(user_id, course_id, exercise_id_str, success=success)
 
-            # Adicionar estatísticas de tentativas na resposta
-            exercise_stats = exercise_progress.get("exercises", {}).get(exercise_id_str, {})
-            attempts_count = exercise_stats.get("attempts", 1)
-            successful_attempts = exercise_stats.get("successful_attempts", 0)
-            failed_attempts = exercise_stats.get("failed_attempts", 0)
+def _job_links(job):
+    """Estado da tarefa com as URLs de consulta (`poll_url`, `events_url`)."""
+    return dict(
+        job.to_dict(),
+        poll_url=url_for("api_get_job", job_id=job.id),
+        events_url=url_for("api_get_job_events", job_id=job.id),
+    )
 
-            logger.info(
-                f"Exercício '{exercise_id_str}' - Tentativa registrada. Total: {attempts_count}, Sucesso: {successful_attempts}, Falhas: {failed_attempts}"
-            )
-        except Exception as prog_error:
-            logger.error(f"Erro ao registrar tentativa do exercício: {prog_error}", exc_info=True)
-            attempts_count = 1
-            successful_attempts = 1 if success else 0
-            failed_attempts = 0 if success else 1
 
-        logger.info(f"POST /api/check-exercise - Verificação: success={success}")
+@app.route("/api/jobs/<string:job_id>", methods=["GET"])
+def api_get_job(job_id):
+    """API endpoint para consultar o estado de uma tarefa (polling).
 
-        # Verificar novas conquistas
-        new_achievements = achievement_mgr.check_new_achievements(user_id, progress_mgr)
+    Parâmetros de Query:
+        wait (float, opcional): Segundos a aguardar o término antes de responder
+            (long-polling, máximo JOB_MAX_POLL_WAIT).
 
-        # Preparar resposta com estatísticas
-        response_data = {
-            "success": success,
-            "output": api_output_response,
-            "details": details,
-            "stats": {
-                "attempts": attempts_count,
-                "successful_attempts": successful_attempts,
-                "failed_attempts": failed_attempts,
-                "first_try": attempts_count == 1 and success,
-            },
-            "new_achievements": new_achievements,
+    JSON de Resposta:
+        Tarefa encontrada (200 OK):
+            `{"job_id": "str", "kind": "str", "status": "queued|running|done|failed", "result": {...}}`
+            (`result` presente apenas quando a tarefa terminou)
+        Tarefa desconhecida ou expirada (404 Not Found):
+            `{"error": "Tarefa não encontrada"}`
+    """
+    job = job_queue.get(job_id)
+    if not job:
+        return jsonify({"error": "Tarefa não encontrada"}), 404
+
+    wait = min(request.args.get("wait", 0, type=float), JOB_MAX_POLL_WAIT)
+    if wait > 0:
+        job.wait(wait)
+    return jsonify(job.to_dict())
+
+
+@app.route("/api/jobs/<string:job_id>/events", methods=["GET"])
+def api_get_job_events(job_id):
+    """API endpoint que transmite o andamento de uma tarefa via Server-Sent Events.
+
+    Envia um evento `status` imediatamente e um evento `result` (com o mesmo
+    JSON de GET /api/jobs/<job_id>) quando a tarefa termina, encerrando o stream.
+    Enquanto espera, envia comentários de keep-alive.
+
+    Returns:
+        Response: Stream `text/event-stream`, ou 404 se a tarefa não existir.
+    """
+    job = job_queue.get(job_id)
+    if not job:
+        return jsonify({"error": "Tarefa não encontrada"}), 404
+
+    def stream():
+        yield _sse_event("status", {"job_id": job.id, "status": job.status})
+        while not job.wait(JOB_EVENTS_HEARTBEAT):
+            yield ": keep-alive\n\n"
+        yield _sse_event("result", job.to_dict())
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return Response(stream(), mimetype="text/event-stream", headers=headers)
+
+
+@app.route("/api/cache/stats", methods=["GET"])
+def api_get_cache_stats():
+    """API endpoint com as estatísticas dos caches em memória do processo.
+
+    JSON de Resposta (200 OK):
+        `{"content": {...}, "compiled_code": {...}, "rendered": {...}, "highlight": {...},
+        "compression": {...}, "results": {..., "enabled": bool}, "jobs": {...}}`
+
+    Returns:
+        Response: Uma resposta JSON com acertos, faltas e taxa de acerto de cada cache.
+    """
+    result_stats = result_cache.get_stats()
+    result_stats["enabled"] = RESULT_CACHE_ENABLED
+    return jsonify(
+        {
+            "content": content_cache.get_stats(),
+            "compiled_code": code_cache.get_stats(),
+            "rendered": ContentRendererFactory.get_cache_stats(),
+            "highlight": get_highlight_cache_stats(),
+            "compression": compression_cache.get_stats(),
+            "results": result_stats,
+            "jobs": job_queue.get_stats(),
         }
+    )
 
-        return jsonify(response_data)
-    except Exception as e:
-        logger.error(f"POST /api/check-exercise - Erro inesperado: {e}", exc_info=True)
-        return jsonify(
-            {"success": False, "output": "", "details": f"Erro interno do servidor ao verificar: {str(e)}"}
-        ), 500
+
+def _check_admin_token():
+    """Valida o token administrativo da requisição (cabeçalho `X-Admin-Token` ou `Authorization: Bearer`).
+
+    Returns:
+        tuple | None: Resposta de erro (403) se o token for inválido ou ADMIN_TOKEN não estiver
+        configurado; None se a requisição estiver autorizada.
+    """
+    if not ADMIN_TOKEN:
+        return jsonify({"error": "Endpoints administrativos desativados (ADMIN_TOKEN não configurado)."}), 403
+    provided = request.headers.get("X-Admin-Token", "")
+    authorization = request.headers.get("Authorization", "")
+    if not provided and authorization.startswith("Bearer "):
+        provided = authorization[len("Bearer ") :]
+    if not hmac.compare_digest(provided.encode("utf-8"), ADMIN_TOKEN.encode("utf-8")):
+        logger.warning(f"{request.method} {request.path} - Token administrativo inválido.")
+        return jsonify({"error": "Token administrativo inválido."}), 403
+    return None
+
+
+@app.route("/api/admin/validate-exercises", methods=["POST"])
+def api_admin_validate_exercises():
+    """API endpoint administrativo que valida o `solution_code` de todos os exercícios contra o `test_code`.
+
+    Requer o cabeçalho `X-Admin-Token` (ou `Authorization: Bearer <token>`) igual a ADMIN_TOKEN.
+    A validação roda na fila de tarefas (/api/jobs/*); o relatório é o resultado da tarefa.
+    Apenas uma validação roda por vez. Nenhum progresso é registrado.
+
+    JSON de Requisição (opcional):
+        {
+            "course_ids": ["str", ...],  (restringe a validação a estes cursos)
+            "workers": int,              (processos trabalhadores; padrão e máximo: número de CPUs)
+            "timeout": float             (limite de tempo por exercício, em segundos)
+        }
+
+    JSON de Resposta:
+        Tarefa aceita (202 Accepted):
+            `{"job_id": "str", "status": "queued", "poll_url": "str", "events_url": "str"}`;
+            o resultado da tarefa é `{"total": int, "passed": int, "failed": int, "skipped": int,
+            "duration_ms": float, "workers": int, "results": [{"course_id", "exercise_id", "status",
+            "duration_ms", "details"}, ...]}`
+        Parâmetros inválidos (400 Bad Request):
+            `{"error": "str"}`
+        Não autorizado (403 Forbidden):
+            `{"error": "Token administrativo inválido."}`
+        Validação já em andamento (409 Conflict):
+            `{"error": "str", "job_id": "str", "status": "queued|running", "poll_url": "str", "events_url": "str"}`
+        Fila cheia (429 Too Many Requests, com cabeçalho Retry-After).
+    """
+    global _catalog_validation
+
+    denied = _check_admin_token()
+    if denied:
+        return denied
+
+    data = request.get_json(silent=True) or {}
+    course_ids = data.get("course_ids")
+    workers = data.get("workers")
+    timeout = data.get("timeout", VALIDATION_TIMEOUT)
+    if course_ids is not None and not (
+        isinstance(course_ids, list) and all(isinstance(course_id, str) for course_id in course_ids)
+    ):
+        error = "'course_ids' deve ser uma lista de IDs de curso."
+    elif workers is not None and not (_is_number(workers, integer=True) and workers >= 1):
+        error = "'workers' deve ser um inteiro positivo."
+    elif not (_is_number(timeout) and 0 < timeout < float("inf")):
+        error = "'timeout' deve ser um número positivo."
+    else:
+        error = None
+    if error:
+        logger.warning(f"POST /api/admin/validate-exercises - {error}")
+        return jsonify({"error": error}), 400
+
+    max_workers = os.cpu_count() or 1
+    workers = min(workers or max_workers, max_workers)
+    with _catalog_validation_lock:
+        running = _catalog_validation
+        if running is not None and not running.finished:
+            logger.warning(f"POST /api/admin/validate-exercises - Validação '{running.id}' já em andamento.")
+            return jsonify(dict(_job_links(running), error="Uma validação do catálogo já está em andamento.")), 409
+        response, job = _enqueue_job("validate-exercises", _validate_catalog_job, course_ids, workers, float(timeout))
+        if job is not None:
+            _catalog_validation = job
+    return response
+
+
+def _is_number(value, integer: bool = False) -> bool:
+    """Indica se um valor do JSON é um número (inteiro, se `integer`), excluindo booleanos."""
+    return isinstance(value, int if integer else (int, float)) and not isinstance(value, bool)
+
+
+def _validate_catalog_job(course_ids, workers, timeout):
+    """Valida o catálogo (tarefa da fila de `/api/admin/validate-exercises`)."""
+    report = validate_catalog(course_mgr.data_dir, course_ids=course_ids, workers=workers, timeout=timeout)
+    logger.info(
+        f"Validação do catálogo - {report['passed']}/{report['total']} aprovados em {report['duration_ms']:.0f} ms"
+    )
+    return report
 
 
 # --- Rotas de API de Progresso ---
@@ -1125,16 +1746,7 @@ def submit_exercise_solution_legacy(course_id, exercise_id_str):
             {"success": False, "output": "", "details": "Arquivo de exercícios não definido para este curso."}
         ), 500
 
-    course_level_from_course_json = course.get("level")
-    expected_exercise_level = course_level_from_course_json.lower() if course_level_from_course_json else None
-
-    exercises = exercise_mgr.load_exercises_from_file(exercises_file_relative_path)
-    exercise_details_to_check = None
-    for ex_item in exercises:
-        if isinstance(ex_item, dict) and str(ex_item.get("id")) == exercise_id_str:
-            if not expected_exercise_level or ex_item.get("level", "").lower() == expected_exercise_level:
-                exercise_details_to_check = ex_item
-                break
+    exercise_details_to_check = _get_course_index(course).get_exercise(exercise_id_str)
 
     if not exercise_details_to_check:
         return jsonify(
@@ -1144,7 +1756,7 @@ def submit_exercise_solution_legacy(course_id, exercise_id_str):
     test_code = exercise_details_to_check.get("test_code", "")
     full_code_to_execute = user_code.rstrip() + "\n\n" + test_code
     try:
-        exec_result = code_executor.execute_code(full_code_to_execute)
+        exec_result = _run_user_code(full_code_to_execute)
         success = exec_result["returncode"] == 0
         output = exec_result["stdout"]
         details = exec_result["stderr"]
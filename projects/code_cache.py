@@ -0,0 +1,189 @@
+"""
+Módulo de cache de código compilado para o conteúdo dos exercícios.
+
+O `test_code` (e o `solution_code`) de cada exercício é conteúdo estático
+de `exercises.json`, mas era analisado e compilado por `exec` a cada
+verificação. Este módulo compila esses trechos uma única vez, quando o
+arquivo de exercícios é carregado, e guarda os objetos de código por
+(ID do exercício, campo, hash do conteúdo). Erros de compilação no conteúdo
+são registrados no carregamento, e não na submissão de um aluno.
+
+Os trabalhadores do `sandbox_pool` recebem a mesma chave junto com o código
+e mantêm sua própria memória de objetos compilados (objetos de código não
+atravessam o pipe via pickle).
+"""
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Campos de exercício pré-compilados no carregamento
+COMPILED_FIELDS = ("test_code", "solution_code")
+
+DEFAULT_MAX_ENTRIES = 2048
+
+CodeKey = Tuple[str, str, str]
+
+
+def code_key(exercise_id, field: str, source: str) -> CodeKey:
+    """
+    Monta a chave de cache de um trecho de código de exercício.
+
+    Args:
+        exercise_id: ID do exercício.
+        field (str): Campo de origem ('test_code' ou 'solution_code').
+        source (str): Código-fonte.
+
+    Returns:
+        tuple: (ID do exercício, campo, SHA-256 do código).
+    """
+    return (str(exercise_id), field, hashlib.sha256(source.encode("utf-8")).hexdigest())
+
+
+def code_filename(key: CodeKey) -> str:
+    """Nome de arquivo exibido em tracebacks do código compilado."""
+    return f"<exercicio {key[0]} {key[1]}>"
+
+
+class CompiledCodeCache:
+    """
+    Cache LRU de objetos de código compilados a partir do conteúdo dos exercícios.
+
+    Attributes:
+        max_entries (int): Número máximo de objetos de código mantidos.
+        compile_errors (dict): Erros de compilação encontrados, por (ID do exercício, campo).
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Inicializa o cache.
+
+        Args:
+            max_entries (int): Número máximo de objetos de código mantidos.
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[CodeKey, object]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.compile_errors: Dict[Tuple[str, str], str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compile(self, key: CodeKey, source: str):
+        """
+        Retorna o objeto de código da chave, compilando-o se necessário.
+
+        Args:
+            key (tuple): Chave gerada por `code_key`.
+            source (str): Código-fonte correspondente à chave.
+
+        Returns:
+            code: Objeto de código pronto para `exec`.
+
+        Raises:
+            SyntaxError: Se o código não compilar.
+        """
+        with self._lock:
+            code = self._entries.get(key)
+            if code is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return code
+            self.misses += 1
+
+        code = compile(source, code_filename(key), "exec")
+        with self._lock:
+            self._entries[key] = code
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return code
+
+    def precompile_exercises(self, exercises, source_name: str = "") -> List[Dict]:
+        """
+        Compila os campos de código de todos os exercícios de um arquivo.
+
+        Args:
+            exercises (list): Exercícios decodificados de `exercises.json`.
+            source_name (str): Nome do arquivo de origem, usado nas mensagens de log.
+
+        Returns:
+            list: Erros encontrados, cada um como {"exercise_id", "field", "error"}.
+        """
+        errors = []
+        compiled = 0
+        if not isinstance(exercises, list):
+            return errors
+        for exercise in exercises:
+            if not isinstance(exercise, dict):
+                continue
+            exercise_id = str(exercise.get("id"))
+            for field in COMPILED_FIELDS:
+                source = exercise.get(field)
+                if not isinstance(source, str) or not source.strip():
+                    continue
+                try:
+                    self.get_or_compile(code_key(exercise_id, field, source), source)
+                    self.compile_errors.pop((exercise_id, field), None)
+                    compiled += 1
+                except (SyntaxError, ValueError) as e:
+                    message = f"{type(e).__name__}: {e}"
+                    self.compile_errors[(exercise_id, field)] = message
+                    errors.append({"exercise_id": exercise_id, "field": field, "error": message})
+                    logger.error(f"Erro de compilação no '{field}' do exercício '{exercise_id}' ({source_name}): {message}")
+        logger.debug(f"CompiledCodeCache: {compiled} trechos pré-compilados de {source_name or 'exercícios'}")
+        return errors
+
+    def clear(self):
+        """Esvazia o cache, os erros registrados e os contadores."""
+        with self._lock:
+            self._entries.clear()
+            self.compile_errors.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict:
+        """
+        Retorna estatísticas de uso do cache.
+
+        Returns:
+            dict: Acertos, faltas, entradas e número de erros de compilação.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "compile_errors": len(self.compile_errors),
+            }
+
+
+class CodeMemo:
+    """
+    Memória simples de objetos de código por chave, usada dentro dos trabalhadores do sandbox.
+
+    Quando cheia, é esvaziada por completo (os trabalhadores são reciclados
+    periodicamente, então não há necessidade de LRU).
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: Dict[CodeKey, object] = {}
+
+    def compile(self, key: Optional[CodeKey], source: str):
+        """Retorna o objeto de código da chave (compilando no primeiro uso); sem chave, devolve a fonte."""
+        if key is None:
+            return source
+        code = self._entries.get(key)
+        if code is None:
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+            code = compile(source, code_filename(key), "exec")
+            self._entries[key] = code
+        return code
+
+
+# Instância compartilhada pelo processo (preenchida pelo ExerciseManager)
+code_cache = CompiledCodeCache()
@@ -13,11 +13,101 @@ interativo de programação ou sistemas de avaliação automática de código.
 import sys
 import io
 import logging
+import threading
+import time
 from contextlib import redirect_stdout, redirect_stderr
 
 logger = logging.getLogger(__name__)
 
-def execute_code(code_string, execution_globals=None):
+# Limite padrão de bytes capturados (stdout + stderr) por execução em modo streaming
+DEFAULT_MAX_OUTPUT_BYTES = 256 * 1024
+# Tamanho a partir do qual a saída acumulada é repassada ao cliente, e intervalo máximo de repasse (s)
+STREAM_FLUSH_BYTES = 4096
+STREAM_FLUSH_INTERVAL = 0.05
+
+
+def truncation_marker(max_bytes):
+    """Texto anexado à saída quando o limite de bytes capturados é atingido."""
+    return f"\n[... saída truncada: limite de {max_bytes} bytes atingido ...]\n"
+
+
+class _OutputBudget:
+    """Orçamento de bytes compartilhado entre stdout e stderr de uma execução."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.remaining = max_bytes
+        self.truncated = False
+        self.lock = threading.Lock()
+
+
+class _StreamingOutput(io.TextIOBase):
+    """
+    Arquivo de texto que captura a saída até o limite do orçamento e a repassa
+    em blocos para `on_output(stream, texto)`.
+
+    Escritas pequenas (ex.: `print` em laço) são agrupadas até STREAM_FLUSH_BYTES;
+    o restante é repassado periodicamente por `flush()` (ver `execute_code_streaming`).
+    Após o limite, a escrita é descartada e o marcador de truncamento é emitido uma única vez.
+    """
+
+    def __init__(self, name, budget, on_output=None):
+        self.name = name
+        self.budget = budget
+        self.on_output = on_output
+        self._captured = io.StringIO()
+        self._pending = []
+        self._pending_bytes = 0
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        if not isinstance(text, str):
+            raise TypeError(f"write() argument must be str, not {type(text).__name__}")
+        budget = self.budget
+        with budget.lock:
+            if budget.truncated:
+                return len(text)
+            data = text.encode("utf-8", "replace")
+            if len(data) > budget.remaining:
+                kept = data[:budget.remaining].decode("utf-8", "ignore")
+                budget.remaining = 0
+                budget.truncated = True
+                self._emit(kept + truncation_marker(budget.max_bytes))
+                self._flush_pending()
+            else:
+                budget.remaining -= len(data)
+                self._emit(text)
+        return len(text)
+
+    def _emit(self, text):
+        if not text:
+            return
+        self._captured.write(text)
+        if self.on_output is None:
+            return
+        self._pending.append(text)
+        self._pending_bytes += len(text)
+        if self._pending_bytes >= STREAM_FLUSH_BYTES:
+            self._flush_pending()
+
+    def _flush_pending(self):
+        if self._pending and self.on_output is not None:
+            chunk = "".join(self._pending)
+            self._pending = []
+            self._pending_bytes = 0
+            self.on_output(self.name, chunk)
+
+    def flush(self):
+        with self.budget.lock:
+            self._flush_pending()
+
+    def getvalue(self):
+        return self._captured.getvalue()
+
+
+def execute_code(code_string, execution_globals=None, max_output_bytes=None):
     """
     Executa uma string de código Python em um ambiente controlado e captura sua saída.
 
@@ -28,10 +118,14 @@ def execute_code(code_string, execution_globals=None):
     se não for fornecido de outra forma.
 
     Args:
-        code_string (str): O código Python a ser executado.
+        code_string (str | code): O código Python a ser executado, ou um objeto de
+                                  código já compilado (ver `code_cache`).
         execution_globals (dict, optional): Um dicionário para usar como o escopo global
                                             para a execução. Defaults to None, que cria
                                             um novo dicionário vazio.
+        max_output_bytes (int, optional): Limite de bytes capturados (stdout + stderr).
+                                          Ao atingi-lo, a saída é truncada com o marcador
+                                          de `truncation_marker`. Defaults to None (sem limite).
 
     Returns:
         dict: Um dicionário contendo os resultados da execução:
@@ -48,8 +142,13 @@ def execute_code(code_string, execution_globals=None):
     execution_globals.setdefault('__name__', '__executor__')
 
     try:
-        stdout_buffer = io.StringIO()
-        stderr_buffer = io.StringIO()
+        if max_output_bytes:
+            budget = _OutputBudget(max_output_bytes)
+            stdout_buffer = _StreamingOutput("stdout", budget)
+            stderr_buffer = _StreamingOutput("stderr", budget)
+        else:
+            stdout_buffer = io.StringIO()
+            stderr_buffer = io.StringIO()
         with redirect_stdout(stdout_buffer), redirect_stderr(stderr_buffer):
             exec(code_string, execution_globals)
         stdout = stdout_buffer.getvalue()
@@ -59,6 +158,89 @@ def execute_code(code_string, execution_globals=None):
         error_type_name = type(e).__name__
         return {"returncode": 1, "stdout": "", "stderr": f"{error_type_name}: {str(e)}", "error_type": error_type_name}
 
+def execute_with_test(user_code, test_code=None, max_output_bytes=None):
+    """
+    Executa o código do usuário e, em seguida, o código de teste, como uma única unidade.
+
+    A saída (stdout) do código do usuário é disponibilizada ao código de teste
+    na variável global `output`. O teste só é executado se o código do usuário
+    terminar sem erro. Com o `sandbox_pool`, a unidade inteira roda em um único
+    trabalhador, em uma única ida e volta pelo pipe.
+
+    Args:
+        user_code (str): O código Python submetido pelo usuário.
+        test_code (str | code, optional): O código de teste do exercício (fonte ou
+                                          objeto de código já compilado). Defaults to None.
+        max_output_bytes (int, optional): Limite de bytes capturados do código do usuário
+                                          (ver `execute_code`). Defaults to None.
+
+    Returns:
+        dict: Um dicionário com os resultados de cada etapa, no formato de `execute_code`:
+            - "user" (dict): Resultado da execução do código do usuário.
+            - "test" (dict | None): Resultado da execução do teste, ou None se o
+                                    teste não foi executado.
+    """
+    user_result = execute_code(user_code, max_output_bytes=max_output_bytes)
+    test_result = None
+    if user_result["returncode"] == 0 and test_code:
+        test_result = execute_code(test_code, {"output": user_result["stdout"]})
+    return {"user": user_result, "test": test_result}
+
+def execute_code_streaming(code_string, on_output, execution_globals=None, max_output_bytes=DEFAULT_MAX_OUTPUT_BYTES):
+    """
+    Executa código Python repassando a saída em blocos à medida que é produzida.
+
+    Diferente de `execute_code`, a saída não é acumulada sem limite: stdout e
+    stderr compartilham um orçamento de `max_output_bytes` bytes (UTF-8). Ao
+    atingi-lo, o marcador de truncamento é emitido e o restante da saída é
+    descartado (o código continua executando até terminar ou esgotar o tempo).
+
+    Args:
+        code_string (str | code): O código Python a ser executado.
+        on_output (Callable[[str, str], None]): Recebe (nome do fluxo, texto), com
+                                                 nome "stdout" ou "stderr".
+        execution_globals (dict, optional): Escopo global para a execução.
+        max_output_bytes (int): Limite de bytes capturados por execução.
+
+    Returns:
+        dict: Mesmo formato de `execute_code`, com a saída capturada até o limite
+              (também em caso de exceção) e a chave adicional "truncated" (bool).
+    """
+    if execution_globals is None:
+        execution_globals = {}
+    execution_globals.setdefault('__name__', '__executor__')
+
+    budget = _OutputBudget(max_output_bytes)
+    stdout_stream = _StreamingOutput("stdout", budget, on_output)
+    stderr_stream = _StreamingOutput("stderr", budget, on_output)
+    result = {"returncode": 0, "stdout": "", "stderr": "", "error_type": None}
+
+    # Repassa a saída pendente a cada STREAM_FLUSH_INTERVAL, mesmo que o código fique em silêncio
+    finished = threading.Event()
+
+    def periodic_flush():
+        while not finished.wait(STREAM_FLUSH_INTERVAL):
+            stdout_stream.flush()
+            stderr_stream.flush()
+
+    threading.Thread(target=periodic_flush, name="code-stream-flush", daemon=True).start()
+    try:
+        with redirect_stdout(stdout_stream), redirect_stderr(stderr_stream):
+            exec(code_string, execution_globals)
+    except Exception as e:
+        error_type_name = type(e).__name__
+        stderr_stream.write(f"{error_type_name}: {str(e)}")
+        result["returncode"] = 1
+        result["error_type"] = error_type_name
+    finally:
+        finished.set()
+        stdout_stream.flush()
+        stderr_stream.flush()
+    result["stdout"] = stdout_stream.getvalue()
+    result["stderr"] = stderr_stream.getvalue()
+    result["truncated"] = budget.truncated
+    return result
+
 def execute_test(test_code, namespace=None):
     """
     Executa um bloco de código de teste Python em um ambiente controlado.
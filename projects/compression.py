@@ -0,0 +1,296 @@
+"""
+Módulo de compressão das respostas HTTP (gzip e, quando disponível, brotli).
+
+- Respostas dinâmicas de texto (JSON, HTML) acima de `DEFAULT_MIN_BYTES` são
+  comprimidas conforme o `Accept-Encoding` do cliente.
+- Respostas com ETag (APIs de conteúdo e páginas, ver `app._content_validators`)
+  são comprimidas uma única vez por (ETag, codificação), com nível máximo, e
+  servidas do cache nas requisições seguintes. A variante comprimida recebe uma
+  ETag própria (`"<etag>-br"`), como exige uma ETag forte.
+- Arquivos estáticos (`static/css/*.css`, `static/js/*.js`) são pré-comprimidos
+  em tempo de build (`precompress_static`, arquivos `.gz`/`.br` ao lado do
+  original) ou, na falta deles, comprimidos no primeiro acesso e mantidos em cache.
+
+O brotli é opcional (`pip install brotli`); sem ele, apenas gzip é negociado.
+
+Uso pela linha de comando (pré-compressão dos estáticos):
+    python -m projects.compression [--static-dir DIR]
+"""
+
+import gzip
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # Dependência opcional
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = Path(__file__).resolve().parent / "static"
+# Arquivos estáticos pré-comprimidos
+STATIC_PATTERNS = ("css/*.css", "js/*.js")
+# Respostas menores que isto não compensam a compressão
+DEFAULT_MIN_BYTES = 1024
+# Limite padrão do cache de respostas comprimidas
+DEFAULT_CACHE_BYTES = 16 * 1024 * 1024
+COMPRESSIBLE_MIMETYPES = frozenset(
+    {"application/json", "text/html", "text/css", "text/javascript", "application/javascript", "text/plain"}
+)
+# Extensão dos arquivos pré-comprimidos por codificação
+FILE_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+# Níveis de compressão: rápidos para respostas únicas, máximos para as que ficam em cache
+_FAST_LEVELS = {"br": 4, "gzip": 6}
+_BEST_LEVELS = {"br": 11, "gzip": 9}
+
+
+def supported_encodings() -> List[str]:
+    """Codificações disponíveis, em ordem de preferência."""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def negotiate(accept_encodings) -> Optional[str]:
+    """
+    Escolhe a codificação da resposta.
+
+    Args:
+        accept_encodings: `request.accept_encodings` do Werkzeug.
+
+    Returns:
+        str | None: "br", "gzip" ou None se o cliente não aceitar nenhuma.
+    """
+    return accept_encodings.best_match(supported_encodings())
+
+
+def compress(data: bytes, encoding: str, best: bool = False) -> bytes:
+    """
+    Comprime os dados.
+
+    Args:
+        data (bytes): Corpo da resposta.
+        encoding (str): "br" ou "gzip".
+        best (bool): Usa o nível máximo (para resultados que ficam em cache).
+
+    Returns:
+        bytes: Dados comprimidos.
+    """
+    level = (_BEST_LEVELS if best else _FAST_LEVELS)[encoding]
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def variant_etag(etag: str, encoding: str) -> str:
+    """ETag da variante comprimida de uma representação."""
+    return f"{etag}-{encoding}"
+
+
+def etag_variants(etag: str) -> List[str]:
+    """ETag da representação original e de todas as suas variantes comprimidas."""
+    return [etag] + [variant_etag(etag, encoding) for encoding in supported_encodings()]
+
+
+class CompressionCache:
+    """
+    Cache LRU de corpos comprimidos, limitado pela soma dos tamanhos em bytes.
+
+    Attributes:
+        max_bytes (int): Limite da soma dos tamanhos armazenados.
+        hits (int): Compressões evitadas.
+        misses (int): Compressões executadas.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        """
+        Inicializa o cache.
+
+        Args:
+            max_bytes (int): Limite da soma dos tamanhos armazenados.
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_or_compress(self, key: Tuple, encoding: str, load) -> bytes:
+        """
+        Retorna o corpo comprimido da chave, comprimindo-o no primeiro acesso.
+
+        Args:
+            key (tuple): Identifica a representação (ex.: ETag ou assinatura do arquivo).
+            encoding (str): "br" ou "gzip".
+            load (Callable[[], bytes]): Produz o corpo original (só chamado em caso de falta).
+
+        Returns:
+            bytes: Corpo comprimido.
+        """
+        key = key + (encoding,)
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+            self.misses += 1
+
+        data = compress(load(), encoding, best=True)
+        if len(data) <= self.max_bytes:
+            with self._lock:
+                if key not in self._entries:
+                    self._entries[key] = data
+                    self.total_bytes += len(data)
+                while self.total_bytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.total_bytes -= len(evicted)
+                    self.evictions += 1
+        return data
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna acertos, faltas, taxa de acerto, remoções, entradas e bytes ocupados."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "encodings": supported_encodings(),
+            }
+
+
+def compress_response(response, accept_encodings, cache: CompressionCache, min_bytes: int = DEFAULT_MIN_BYTES):
+    """
+    Comprime uma resposta dinâmica, se o tipo, o tamanho e o cliente permitirem.
+
+    Respostas em streaming (SSE), de arquivo, já codificadas ou diferentes de
+    200 são devolvidas sem alteração.
+
+    Args:
+        response: Resposta do Flask.
+        accept_encodings: `request.accept_encodings` do Werkzeug.
+        cache (CompressionCache): Cache das respostas com ETag.
+        min_bytes (int): Tamanho mínimo do corpo para comprimir.
+
+    Returns:
+        Resposta (a mesma instância, possivelmente com o corpo substituído).
+    """
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    response.vary.add("Accept-Encoding")
+    if (
+        response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+    encoding = negotiate(accept_encodings)
+    if encoding is None or (response.content_length or 0) < min_bytes:
+        return response
+
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        data = cache.get_or_compress(("etag", etag), encoding, response.get_data)
+        response.set_etag(variant_etag(etag, encoding))
+    else:
+        data = compress(response.get_data(), encoding)
+    response.set_data(data)
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def static_variant(file_path: Path, encoding: str, cache: CompressionCache) -> Optional[bytes]:
+    """
+    Retorna o conteúdo comprimido de um arquivo estático.
+
+    Usa o arquivo pré-comprimido (`.br`/`.gz`) se ele for mais novo que o
+    original; caso contrário, comprime o original uma vez por versão do arquivo.
+
+    Args:
+        file_path (Path): Arquivo estático original.
+        encoding (str): "br" ou "gzip".
+        cache (CompressionCache): Cache das compressões feitas em tempo de execução.
+
+    Returns:
+        bytes | None: Conteúdo comprimido, ou None se o arquivo não existir.
+    """
+    try:
+        stat = file_path.stat()
+    except OSError:
+        return None
+    precompressed = file_path.with_name(file_path.name + FILE_SUFFIXES[encoding])
+    try:
+        if precompressed.stat().st_mtime_ns >= stat.st_mtime_ns:
+            return precompressed.read_bytes()
+    except OSError:
+        pass
+    key = ("file", str(file_path), stat.st_mtime_ns, stat.st_size)
+    return cache.get_or_compress(key, encoding, file_path.read_bytes)
+
+
+def is_precompressible(relative_path: str) -> bool:
+    """Indica se um caminho relativo de `static/` está entre os `STATIC_PATTERNS`."""
+    return any(Path(relative_path).match(pattern) for pattern in STATIC_PATTERNS)
+
+
+def precompress_static(static_dir: Path = STATIC_DIR) -> Dict[str, int]:
+    """
+    Gera as variantes `.gz`/`.br` dos arquivos estáticos desatualizadas.
+
+    Args:
+        static_dir (Path): Diretório `static/`.
+
+    Returns:
+        dict: Número de arquivos comprimidos (`written`) e já atualizados (`skipped`).
+    """
+    report = {"written": 0, "skipped": 0}
+    for pattern in STATIC_PATTERNS:
+        for source in sorted(Path(static_dir).glob(pattern)):
+            data = None
+            for encoding in supported_encodings():
+                target = source.with_name(source.name + FILE_SUFFIXES[encoding])
+                if target.exists() and target.stat().st_mtime_ns >= source.stat().st_mtime_ns:
+                    report["skipped"] += 1
+                    continue
+                data = data if data is not None else source.read_bytes()
+                target.write_bytes(compress(data, encoding, best=True))
+                report["written"] += 1
+    logger.info(
+        f"Estáticos pré-comprimidos em '{static_dir}': {report['written']} gerados, {report['skipped']} atualizados"
+    )
+    return report
+
+
+def main():
+    """
+    Função principal para pré-comprimir os arquivos estáticos via linha de comando.
+
+    Uso:
+        python -m projects.compression [--static-dir DIR]
+    """
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="Gera variantes .gz/.br de static/css/*.css e static/js/*.js.")
+    parser.add_argument("--static-dir", default=str(STATIC_DIR), help="Diretório static (padrão: projects/static)")
+    args = parser.parse_args()
+
+    report = precompress_static(Path(args.static_dir))
+    encodings = ", ".join(supported_encodings())
+    print(f"{report['written']} variantes geradas, {report['skipped']} já atualizadas ({encodings})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+Módulo de pré-renderização do conteúdo das lições.
+
+O template `lesson_detail.html` passa `content`, `examples` e `summary` de
+cada lição pelo filtro `markdown`. Este módulo renderiza, em tempo de build,
+todos esses textos de `data/*/lessons.json` para um bundle versionado
+(`content_bundle.json`), indexado pelo hash do texto de origem. Na
+inicialização, a aplicação carrega o bundle (`load_bundle`) e o filtro
+serve o HTML pronto, renderizando ao vivo apenas textos ausentes do bundle.
+
+A reconstrução é incremental: textos cujo hash já está no bundle são
+reaproveitados, e apenas os novos ou alterados são renderizados, em paralelo
+entre os núcleos. Uma versão diferente do Markdown ou das extensões invalida
+o bundle inteiro.
+
+Uso pela linha de comando:
+    python -m projects.content_build [--data-dir DIR] [--output ARQUIVO] [--workers N] [--full]
+"""
+
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+import markdown
+
+try:
+    from .content_renderer import ContentRendererFactory, content_digest, install_highlight_cache
+    from .durable_io import atomic_write_text
+except ImportError:  # Execução direta do módulo
+    from content_renderer import ContentRendererFactory, content_digest, install_highlight_cache
+    from durable_io import atomic_write_text
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+BUNDLE_FILENAME = "content_bundle.json"
+BUNDLE_FORMAT = 1
+FORMAT_TYPE = "markdown"
+
+# Campos das lições que o template renderiza com o filtro `markdown`
+LESSON_FIELDS = ("content", "examples", "summary")
+
+
+def bundle_version() -> Dict:
+    """
+    Identifica a configuração que gerou o HTML; bundles de outra versão são descartados.
+
+    Returns:
+        dict: Formato do bundle, versão do Markdown e extensões do renderizador.
+    """
+    renderer = ContentRendererFactory.get_renderer(FORMAT_TYPE)
+    return {
+        "format": BUNDLE_FORMAT,
+        "markdown": markdown.__version__,
+        "renderer": list(renderer.cache_token()),
+    }
+
+
+def collect_sources(data_dir: Path = DATA_DIR) -> Dict[str, str]:
+    """
+    Reúne os textos renderizados pelo template de todas as lições.
+
+    Args:
+        data_dir (Path): Diretório de dados.
+
+    Returns:
+        dict: Texto de origem indexado pelo seu `content_digest`.
+    """
+    sources = {}
+    for lessons_file in sorted(Path(data_dir).glob("*/lessons.json")):
+        try:
+            with open(lessons_file, encoding="utf-8") as f:
+                lessons = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Erro ao ler '{lessons_file}': {e}")
+            continue
+        for lesson in lessons:
+            if not isinstance(lesson, dict):
+                continue
+            for field in LESSON_FIELDS:
+                text = lesson.get(field)
+                if isinstance(text, str) and text:  # `examples` em lista é montado pelo template
+                    sources[content_digest(text)] = text
+    return sources
+
+
+def read_bundle(bundle_path: Path) -> Optional[Dict]:
+    """
+    Lê um bundle compatível com a versão atual.
+
+    Args:
+        bundle_path (Path): Arquivo do bundle.
+
+    Returns:
+        dict | None: Conteúdo do bundle, ou None se ausente, ilegível ou de outra versão.
+    """
+    try:
+        with open(bundle_path, encoding="utf-8") as f:
+            bundle = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Bundle de conteúdo ilegível em '{bundle_path}': {e}")
+        return None
+    if not isinstance(bundle, dict) or bundle.get("version") != bundle_version():
+        logger.info(f"Bundle de conteúdo em '{bundle_path}' é de outra versão; ignorado.")
+        return None
+    return bundle
+
+
+def _render(text: str) -> str:
+    """Renderiza um texto no processo trabalhador."""
+    return ContentRendererFactory.get_renderer(FORMAT_TYPE).render(text)
+
+
+def build_bundle(
+    data_dir: Path = DATA_DIR,
+    bundle_path: Optional[Path] = None,
+    workers: Optional[int] = None,
+    full: bool = False,
+) -> Dict:
+    """
+    Pré-renderiza o conteúdo das lições e grava o bundle.
+
+    Args:
+        data_dir (Path): Diretório de dados.
+        bundle_path (Path, optional): Arquivo do bundle. Padrão: `data_dir/content_bundle.json`.
+        workers (int, optional): Processos de renderização (padrão: número de CPUs).
+        full (bool): Ignora o bundle existente e renderiza tudo novamente.
+
+    Returns:
+        dict: Totais da reconstrução (entries, rendered, reused, removed) e duração em ms.
+    """
+    started = time.perf_counter()
+    data_dir = Path(data_dir)
+    bundle_path = Path(bundle_path) if bundle_path else data_dir / BUNDLE_FILENAME
+
+    sources = collect_sources(data_dir)
+    previous = {} if full else (read_bundle(bundle_path) or {}).get("entries", {})
+    entries = {digest: previous[digest] for digest in sources if digest in previous}
+    pending = [digest for digest in sources if digest not in entries]
+
+    if pending:
+        workers = max(1, min(workers or os.cpu_count() or 1, len(pending)))
+        texts = [sources[digest] for digest in pending]
+        if workers == 1:
+            rendered = [_render(text) for text in texts]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=install_highlight_cache) as executor:
+                rendered = list(executor.map(_render, texts, chunksize=max(1, len(texts) // (workers * 4))))
+        entries.update(zip(pending, rendered))
+
+    bundle = {"version": bundle_version(), "entries": entries}
+    atomic_write_text(bundle_path, json.dumps(bundle, ensure_ascii=False, sort_keys=True), fsync=False)
+
+    report = {
+        "entries": len(entries),
+        "rendered": len(pending),
+        "reused": len(entries) - len(pending),
+        "removed": len(set(previous) - set(entries)),
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+    logger.info(
+        f"Bundle de conteúdo gravado em '{bundle_path}': {report['entries']} entradas, "
+        f"{report['rendered']} renderizadas, {report['reused']} reaproveitadas, {report['removed']} removidas "
+        f"em {report['duration_ms']:.0f} ms"
+    )
+    return report
+
+
+def load_bundle(bundle_path: Path) -> int:
+    """
+    Carrega o bundle para o cache de renderização (ver `ContentRendererFactory.load_prerendered`).
+
+    Args:
+        bundle_path (Path): Arquivo do bundle.
+
+    Returns:
+        int: Número de entradas carregadas (0 se o bundle estiver ausente ou desatualizado).
+    """
+    bundle = read_bundle(bundle_path)
+    if bundle is None:
+        return 0
+    entries = bundle.get("entries") or {}
+    ContentRendererFactory.load_prerendered(FORMAT_TYPE, entries)
+    logger.info(f"Bundle de conteúdo carregado de '{bundle_path}': {len(entries)} textos pré-renderizados.")
+    return len(entries)
+
+
+def main():
+    """
+    Função principal para gerar o bundle via linha de comando.
+
+    Uso:
+        python -m projects.content_build [--data-dir DIR] [--output ARQUIVO] [--workers N] [--full]
+    """
+    import argparse
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="Pré-renderiza o Markdown das lições em um bundle de HTML.")
+    parser.add_argument("--data-dir", default=str(DATA_DIR), help="Diretório de dados (padrão: projects/data)")
+    parser.add_argument("--output", default=None, help=f"Arquivo do bundle (padrão: <data-dir>/{BUNDLE_FILENAME})")
+    parser.add_argument("--workers", type=int, default=None, help="Processos de renderização (padrão: número de CPUs)")
+    parser.add_argument("--full", action="store_true", help="Ignora o bundle existente e renderiza tudo")
+    args = parser.parse_args()
+
+    install_highlight_cache()
+    report = build_bundle(Path(args.data_dir), Path(args.output) if args.output else None, args.workers, args.full)
+    print(
+        f"{report['entries']} textos: {report['rendered']} renderizados, {report['reused']} reaproveitados, "
+        f"{report['removed']} removidos em {report['duration_ms'] / 1000:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Módulo de cache em memória para conteúdo estático (lições e exercícios).
+
+Os arquivos `lessons.json` e `exercises.json` só mudam entre deploys, mas
+eram relidos e decodificados a cada requisição. Este módulo mantém os dados
+já decodificados por arquivo, invalidando a entrada quando o par
+(mtime, tamanho) do arquivo muda.
+
+A memória é limitada por número de entradas e pelo tamanho total (em bytes)
+dos arquivos em cache, com remoção LRU (menos recentemente usado).
+"""
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Limites padrão do cache compartilhado pelo processo
+DEFAULT_MAX_ENTRIES = 64
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024  # 32 MB de JSON em disco
+
+
+class _CacheEntry:
+    """Entrada do cache: dados decodificados e assinatura do arquivo de origem."""
+
+    __slots__ = ("signature", "data", "size")
+
+    def __init__(self, signature: Tuple[int, int], data: Any, size: int):
+        self.signature = signature
+        self.data = data
+        self.size = size
+
+
+class ContentCache:
+    """
+    Cache LRU de arquivos JSON decodificados, invalidado por (mtime, tamanho).
+
+    Os objetos retornados são compartilhados entre requisições e devem ser
+    tratados como somente leitura pelos chamadores.
+
+    Attributes:
+        max_entries (int): Número máximo de arquivos mantidos em cache.
+        max_bytes (int): Soma máxima do tamanho (em disco) dos arquivos em cache.
+        hits (int): Número de leituras atendidas pelo cache.
+        misses (int): Número de leituras que precisaram decodificar o arquivo.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Inicializa o cache.
+
+        Args:
+            max_entries (int): Número máximo de arquivos em cache.
+            max_bytes (int): Tamanho total máximo (bytes em disco) dos arquivos em cache.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def file_signature(file_path: Path) -> Optional[Tuple[int, int]]:
+        """
+        Retorna a assinatura (mtime_ns, tamanho) de um arquivo.
+
+        Args:
+            file_path (Path): Caminho do arquivo.
+
+        Returns:
+            tuple | None: (mtime_ns, tamanho) ou None se o arquivo não existir.
+        """
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def load_json(
+        self,
+        file_path: Path,
+        loader: Optional[Callable[[Path], Any]] = None,
+        on_load: Optional[Callable[[Path, Any], None]] = None,
+    ) -> Any:
+        """
+        Retorna o conteúdo decodificado de um arquivo JSON, usando o cache quando válido.
+
+        Args:
+            file_path (Path): Caminho absoluto do arquivo.
+            loader (Callable, optional): Função que lê e decodifica o arquivo.
+                Padrão: `json.load` com encoding UTF-8.
+            on_load (Callable, optional): Chamado com (caminho, dados) sempre que o
+                arquivo é decodificado do disco (uma vez por versão do arquivo), para
+                pré-processamento como a compilação do código dos exercícios.
+
+        Returns:
+            Any: Os dados decodificados.
+
+        Raises:
+            OSError: Se o arquivo não puder ser lido.
+            json.JSONDecodeError: Se o conteúdo não for JSON válido.
+        """
+        key = str(file_path)
+        signature = self.file_signature(file_path)
+        if signature is None:
+            self.invalidate(file_path)
+            raise FileNotFoundError(key)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.signature == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.data
+            self.misses += 1
+
+        # A decodificação ocorre fora do lock para não serializar leituras de arquivos diferentes
+        data = (loader or _default_loader)(file_path)
+        if on_load is not None:
+            try:
+                on_load(file_path, data)
+            except Exception as e:
+                logger.error(f"ContentCache: erro no pós-processamento de '{key}': {e}", exc_info=True)
+        self._store(key, _CacheEntry(signature, data, signature[1]))
+        logger.debug(f"ContentCache: '{key}' carregado do disco ({signature[1]} bytes).")
+        return data
+
+    def _store(self, key: str, entry: _CacheEntry):
+        """Insere uma entrada e aplica os limites de memória (LRU)."""
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._total_bytes -= old.size
+
+            if entry.size > self.max_bytes:
+                logger.warning(f"ContentCache: '{key}' ({entry.size} bytes) excede o limite do cache. Não armazenado.")
+                return
+
+            self._entries[key] = entry
+            self._total_bytes += entry.size
+            while len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes:
+                evicted_key, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= evicted.size
+                self.evictions += 1
+                logger.debug(f"ContentCache: '{evicted_key}' removido do cache (LRU).")
+
+    def invalidate(self, file_path: Path):
+        """Remove um arquivo do cache, se presente."""
+        with self._lock:
+            entry = self._entries.pop(str(file_path), None)
+            if entry is not None:
+                self._total_bytes -= entry.size
+
+    def clear(self):
+        """Esvazia o cache e zera os contadores."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas de uso do cache.
+
+        Returns:
+            dict: Contadores de acertos/faltas, remoções, entradas e bytes em cache.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+
+def _default_loader(file_path: Path) -> Any:
+    """Lê e decodifica um arquivo JSON em UTF-8."""
+    with open(file_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# Instância compartilhada pelo processo (usada por LessonManager e ExerciseManager)
+content_cache = ContentCache()
@@ -6,16 +6,36 @@ seguindo os princípios SOLID:
 - Single Responsibility: Cada renderer tem uma responsabilidade específica
 - Open/Closed: Fácil extensão para novos formatos sem modificar código existente
 - Dependency Inversion: Depende de abstrações, não de implementações concretas
+
+O HTML renderizado é guardado em um cache LRU limitado por bytes (`RenderCache`),
+indexado por (formato, configuração do renderizador, hash do conteúdo): o texto
+das lições é estático e não precisa ser renderizado a cada visualização. O cache
+também consulta o HTML pré-renderizado em tempo de build (ver `content_build`).
+
+Abaixo dele, cada bloco de código destacado pelo `codehilite` durante uma
+renderização do `MarkdownRenderer` passa por um cache de realce compartilhado
+entre lições (`cached_highlight`): trechos repetidos entre cursos (imports,
+boilerplate) são processados pelo Pygments uma única vez. O cache é instalado
+explicitamente por `install_highlight_cache()` (chamado pela aplicação).
 """
 
+import hashlib
 import logging
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, Optional
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
 
 import markdown
+from markdown.extensions import codehilite
 
 logger = logging.getLogger(__name__)
 
+# Limite padrão do cache de HTML renderizado (soma dos tamanhos em UTF-8)
+DEFAULT_RENDER_CACHE_BYTES = 32 * 1024 * 1024
+# Limite padrão do cache de blocos de código realçados pelo Pygments
+DEFAULT_HIGHLIGHT_CACHE_BYTES = 8 * 1024 * 1024
+
 
 class ContentRenderer(ABC):
     """Interface abstrata para renderizadores de conteúdo."""
@@ -25,9 +45,21 @@ class ContentRenderer(ABC):
         """Renderiza o conteúdo para HTML."""
         pass
 
+    def cache_token(self) -> Tuple:
+        """Configuração que altera o HTML gerado; faz parte da chave do cache de renderização."""
+        return ()
+
 
 class MarkdownRenderer(ContentRenderer):
-    """Renderizador de Markdown para HTML."""
+    """
+    Renderizador de Markdown para HTML.
+
+    `markdown.markdown()` cria um objeto `Markdown` e instancia todas as
+    extensões a cada chamada. O renderizador mantém uma instância por thread,
+    criada no primeiro uso e reiniciada com `reset()` após cada conversão; a
+    instância registrada na factory pode ser compartilhada por servidores
+    com várias threads.
+    """
 
     def __init__(self, extensions: Optional[list] = None):
         """
@@ -37,6 +69,19 @@ class MarkdownRenderer(ContentRenderer):
             extensions: Lista de extensões do Markdown a serem habilitadas
         """
         self.extensions = extensions or ["codehilite", "fenced_code", "tables", "toc"]
+        self._local = threading.local()
+
+    def _get_markdown(self) -> markdown.Markdown:
+        """Retorna a instância de `Markdown` da thread atual, criando-a no primeiro uso."""
+        md = getattr(self._local, "md", None)
+        if md is None:
+            md = markdown.Markdown(extensions=self.extensions)
+            self._local.md = md
+        return md
+
+    def cache_token(self) -> Tuple:
+        """Extensões habilitadas (ver `ContentRenderer.cache_token`)."""
+        return tuple(self.extensions)
 
     def render(self, content: str) -> str:
         """
@@ -55,8 +100,15 @@ class MarkdownRenderer(ContentRenderer):
             return ""
 
         try:
-            return markdown.markdown(content, extensions=self.extensions)
+            md = self._get_markdown()
+            _highlight_scope.active = True
+            try:
+                return md.convert(content)
+            finally:
+                _highlight_scope.active = False
+                md.reset()
         except Exception as e:
+            self._local.md = None  # Não reaproveita uma instância em estado desconhecido
             logger.error(f"Erro ao renderizar Markdown: {e}")
             # Fallback: retorna o conteúdo original com escape HTML básico
             return content.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
@@ -83,10 +135,210 @@ class PlainTextRenderer(ContentRenderer):
         return escaped.replace("\n", "<br>")
 
 
+def content_digest(content: str) -> str:
+    """Hash (SHA-256) do conteúdo de origem, usado nas chaves de cache e no bundle pré-renderizado."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class RenderCache:
+    """
+    Cache LRU de HTML renderizado, limitado pela soma dos tamanhos em bytes.
+
+    Entradas pré-renderizadas (`load_prerendered`) ficam fora do LRU: não são
+    removidas nem contam para `max_bytes`.
+
+    Attributes:
+        max_bytes: Limite da soma dos tamanhos (UTF-8) do HTML armazenado
+        hits: Renderizações atendidas pelo LRU
+        prerendered_hits: Renderizações atendidas pelo HTML pré-renderizado
+        misses: Renderizações efetivamente executadas
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_RENDER_CACHE_BYTES):
+        """
+        Inicializa o cache.
+
+        Args:
+            max_bytes: Limite da soma dos tamanhos do HTML armazenado
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple, Tuple[str, int]]" = OrderedDict()
+        self._prerendered: Dict[Tuple, str] = {}
+        self._lock = threading.Lock()
+        self.total_bytes = 0
+        self.hits = 0
+        self.prerendered_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(format_type: str, renderer: ContentRenderer, content: str) -> Tuple:
+        """
+        Monta a chave de cache de um conteúdo.
+
+        Args:
+            format_type: Tipo do formato
+            renderer: Renderizador usado
+            content: Conteúdo de origem
+
+        Returns:
+            Tupla (formato, configuração do renderizador, SHA-256 do conteúdo)
+        """
+        return (format_type, renderer.cache_token(), content_digest(content))
+
+    def get(self, key: Tuple) -> Optional[str]:
+        """Retorna o HTML da chave, ou None (contabilizando acerto ou falta)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            html = self._prerendered.get(key)
+            if html is not None:
+                self.prerendered_hits += 1
+                return html
+            self.misses += 1
+            return None
+
+    def load_prerendered(self, format_type: str, renderer: ContentRenderer, entries: Dict[str, str]) -> None:
+        """
+        Substitui o HTML pré-renderizado de um formato.
+
+        Args:
+            format_type: Tipo do formato
+            renderer: Renderizador que gerou o HTML
+            entries: HTML indexado pelo `content_digest` do conteúdo de origem
+        """
+        token = renderer.cache_token()
+        prerendered = {key: html for key, html in self._prerendered.items() if key[0] != format_type}
+        prerendered.update(((format_type, token, digest), html) for digest, html in entries.items())
+        with self._lock:
+            self._prerendered = prerendered
+
+    def put(self, key: Tuple, html: str) -> None:
+        """Armazena o HTML da chave, removendo os menos usados até caber no limite."""
+        size = len(html.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.total_bytes -= previous[1]
+            self._entries[key] = (html, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Esvazia o LRU e zera os contadores (o HTML pré-renderizado é mantido)."""
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+            self.hits = 0
+            self.prerendered_hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retorna acertos, faltas, taxa de acerto, remoções, entradas e bytes ocupados."""
+        with self._lock:
+            served = self.hits + self.prerendered_hits
+            total = served + self.misses
+            return {
+                "hits": self.hits,
+                "prerendered_hits": self.prerendered_hits,
+                "misses": self.misses,
+                "hit_rate": round(served / total, 4) if total else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "prerendered_entries": len(self._prerendered),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_highlight_cache = RenderCache(DEFAULT_HIGHLIGHT_CACHE_BYTES)
+_pygments_highlight = getattr(codehilite, "highlight", None)
+# Marca as conversões do `MarkdownRenderer`; fora delas, `cached_highlight` não usa o cache
+_highlight_scope = threading.local()
+
+
+def _options_token(options: Dict[str, Any]) -> str:
+    """Representação estável das opções de um lexer ou formatter do Pygments."""
+    return repr(sorted(options.items()))
+
+
+def cached_highlight(code: str, lexer, formatter, outfile=None):
+    """
+    Substituto de `pygments.highlight` usado pelo `codehilite`, com cache por bloco.
+
+    Só usa o cache dentro de `MarkdownRenderer.render`, cujas extensões este
+    módulo configura; outros usuários do Markdown chamam o Pygments diretamente.
+    A chave é (lexer e suas opções, formatter e suas opções, hash do código), de
+    modo que linguagem, estilo, `hl_lines` e numeração de linhas são respeitados.
+
+    Args:
+        code: Código-fonte do bloco
+        lexer: Lexer do Pygments escolhido pelo `codehilite`
+        formatter: Formatter do Pygments escolhido pelo `codehilite`
+        outfile: Arquivo de saída (quando informado, o cache não é usado)
+
+    Returns:
+        HTML realçado
+    """
+    if outfile is not None or not getattr(_highlight_scope, "active", False):
+        return _pygments_highlight(code, lexer, formatter, outfile)
+    key = (
+        type(lexer).__name__,
+        _options_token(lexer.options),
+        type(formatter).__name__,
+        _options_token(formatter.options),
+        content_digest(code),
+    )
+    html = _highlight_cache.get(key)
+    if html is None:
+        html = _pygments_highlight(code, lexer, formatter)
+        if isinstance(html, str):  # Formatters com `encoding` retornam bytes
+            _highlight_cache.put(key, html)
+    return html
+
+
+def install_highlight_cache() -> bool:
+    """
+    Faz o `codehilite` realçar os blocos por meio de `cached_highlight`.
+
+    `fenced_code` e `codehilite` instanciam `CodeHilite` diretamente, sem ponto de
+    extensão; a chamada ao Pygments em `CodeHilite.hilite` é o único ponto comum aos
+    dois. Desfeito por `uninstall_highlight_cache()`.
+
+    Returns:
+        True se o cache foi instalado agora (False se já estava ou sem Pygments)
+    """
+    if not codehilite.pygments or _pygments_highlight is None or codehilite.highlight is cached_highlight:
+        return False
+    codehilite.highlight = cached_highlight
+    return True
+
+
+def uninstall_highlight_cache() -> None:
+    """Restaura a chamada direta ao Pygments no `codehilite`."""
+    if codehilite.highlight is cached_highlight:
+        codehilite.highlight = _pygments_highlight
+
+
+def get_highlight_cache_stats() -> Dict[str, Any]:
+    """Retorna as estatísticas do cache de blocos de código realçados."""
+    return _highlight_cache.get_stats()
+
+
 class ContentRendererFactory:
     """Factory para criar renderizadores de conteúdo."""
 
     _renderers: Dict[str, ContentRenderer] = {}
+    _cache = RenderCache()
 
     @classmethod
     def register_renderer(cls, format_type: str, renderer: ContentRenderer) -> None:
@@ -98,6 +350,7 @@ class ContentRendererFactory:
             renderer: Instância do renderizador
         """
         cls._renderers[format_type] = renderer
+        cls._cache.clear()  # O HTML em cache pode ter sido gerado pelo renderizador anterior
 
     @classmethod
     def get_renderer(cls, format_type: str) -> ContentRenderer:
@@ -122,6 +375,55 @@ class ContentRendererFactory:
         """Retorna lista de formatos suportados."""
         return list(cls._renderers.keys())
 
+    @classmethod
+    def render_cached(cls, content: str, format_type: str) -> str:
+        """
+        Renderiza o conteúdo, reaproveitando o HTML já gerado para o mesmo texto.
+
+        Args:
+            content: Conteúdo a ser renderizado
+            format_type: Tipo do formato
+
+        Returns:
+            HTML renderizado
+
+        Raises:
+            ValueError: Se o tipo não for suportado
+        """
+        renderer = cls.get_renderer(format_type)
+        if not content:
+            return renderer.render(content)
+        key = cls._cache.make_key(format_type, renderer, content)
+        html = cls._cache.get(key)
+        if html is None:
+            html = renderer.render(content)
+            cls._cache.put(key, html)
+        return html
+
+    @classmethod
+    def load_prerendered(cls, format_type: str, entries: Dict[str, str]) -> None:
+        """
+        Disponibiliza HTML pré-renderizado para o renderizador atual do formato.
+
+        Args:
+            format_type: Tipo do formato
+            entries: HTML indexado pelo `content_digest` do conteúdo de origem
+
+        Raises:
+            ValueError: Se o tipo não for suportado
+        """
+        cls._cache.load_prerendered(format_type, cls.get_renderer(format_type), entries)
+
+    @classmethod
+    def get_cache_stats(cls) -> Dict[str, Any]:
+        """Retorna as estatísticas do cache de renderização."""
+        return cls._cache.get_stats()
+
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Esvazia o cache de renderização."""
+        cls._cache.clear()
+
 
 # Registrar renderizadores padrão
 ContentRendererFactory.register_renderer("markdown", MarkdownRenderer())
@@ -140,8 +442,7 @@ def render_content(content: str, format_type: str = "markdown") -> str:
         HTML renderizado
     """
     try:
-        renderer = ContentRendererFactory.get_renderer(format_type)
-        return renderer.render(content)
+        return ContentRendererFactory.render_cached(content, format_type)
     except ValueError as e:
         logger.warning(f"Formato não suportado, usando fallback: {e}")
         # Fallback para texto simples
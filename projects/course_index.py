@@ -0,0 +1,180 @@
+"""
+Módulo de índices de consulta por curso.
+
+As rotas de lição, editor e verificação de exercícios procuravam lições e
+exercícios com varreduras lineares (`str(ex.get("id")) == exercise_id_str`),
+repetidas para achar o índice, o próximo exercício e a lição dona. Este módulo
+pré-calcula, uma vez por carga de conteúdo, os mapeamentos necessários para que
+todas essas consultas sejam O(1).
+
+Um índice é reconstruído somente quando as listas de lições/exercícios
+retornadas pelos managers mudam (o `content_cache` devolve o mesmo objeto
+enquanto o arquivo não for alterado) ou quando o nível do curso muda.
+"""
+
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_level(level) -> Optional[str]:
+    """Normaliza o nível para comparação (minúsculas), ou None se ausente."""
+    return level.lower() if isinstance(level, str) and level else None
+
+
+class CourseIndex:
+    """
+    Índice imutável de lições e exercícios de um curso.
+
+    Attributes:
+        course_id (str): ID do curso indexado.
+        expected_level (str | None): Nível do curso em minúsculas, usado para filtrar exercícios.
+        lessons (list): Lista de lições na ordem do arquivo.
+    """
+
+    def __init__(self, course: dict, lessons: list, exercises: list):
+        """
+        Constrói o índice a partir dos dados já carregados.
+
+        Args:
+            course (dict): Dados do curso (de `courses.json`).
+            lessons (list): Lições do curso, na ordem de exibição.
+            exercises (list): Exercícios do curso, na ordem do arquivo.
+        """
+        self.course_id = str(course.get("id"))
+        self.expected_level = _normalize_level(course.get("level"))
+        self.lessons = lessons
+
+        self._lessons_by_id: Dict[str, dict] = {}
+        self._lesson_positions: Dict[str, int] = {}
+        for position, lesson in enumerate(lessons):
+            if not isinstance(lesson, dict):
+                continue
+            lesson_id = str(lesson.get("id"))
+            # Em IDs duplicados prevalece o primeiro, como na busca linear original
+            if lesson_id not in self._lessons_by_id:
+                self._lessons_by_id[lesson_id] = lesson
+                self._lesson_positions[lesson_id] = position
+
+        self._exercises_by_id: Dict[str, dict] = {}
+        self._exercises_by_lesson: Dict[str, List[dict]] = {}
+        self._exercise_positions: Dict[str, Tuple[str, int]] = {}
+        for exercise in exercises:
+            if not isinstance(exercise, dict) or not self._matches_level(exercise):
+                continue
+            exercise_id = str(exercise.get("id"))
+            if exercise_id in self._exercises_by_id:
+                continue
+            lesson_id = str(exercise.get("lesson_id"))
+            lesson_exercises = self._exercises_by_lesson.setdefault(lesson_id, [])
+            self._exercises_by_id[exercise_id] = exercise
+            self._exercise_positions[exercise_id] = (lesson_id, len(lesson_exercises))
+            lesson_exercises.append(exercise)
+
+        logger.debug(
+            f"CourseIndex construído para '{self.course_id}': {len(self._lessons_by_id)} lições, "
+            f"{len(self._exercises_by_id)} exercícios (nível '{self.expected_level}')."
+        )
+
+    def _matches_level(self, exercise: dict) -> bool:
+        """Verifica se o exercício pertence ao nível esperado do curso."""
+        if not self.expected_level:
+            return True
+        return _normalize_level(exercise.get("level")) == self.expected_level
+
+    def get_lesson(self, lesson_id) -> Optional[dict]:
+        """Retorna a lição pelo ID, ou None."""
+        return self._lessons_by_id.get(str(lesson_id))
+
+    def get_exercise(self, exercise_id) -> Optional[dict]:
+        """Retorna o exercício pelo ID (apenas do nível do curso), ou None."""
+        return self._exercises_by_id.get(str(exercise_id))
+
+    def get_exercises_for_lesson(self, lesson_id) -> List[dict]:
+        """Retorna os exercícios de uma lição, filtrados pelo nível do curso e na ordem do arquivo."""
+        return self._exercises_by_lesson.get(str(lesson_id), [])
+
+    def get_lesson_for_exercise(self, exercise_id) -> Optional[dict]:
+        """Retorna a lição à qual o exercício pertence, ou None."""
+        exercise = self.get_exercise(exercise_id)
+        if exercise is None:
+            return None
+        return self.get_lesson(exercise.get("lesson_id"))
+
+    def _lesson_at_offset(self, lesson_id, offset: int) -> Optional[dict]:
+        position = self._lesson_positions.get(str(lesson_id))
+        if position is None:
+            return None
+        target = position + offset
+        if 0 <= target < len(self.lessons):
+            return self.lessons[target]
+        return None
+
+    def get_next_lesson(self, lesson_id) -> Optional[dict]:
+        """Retorna a lição seguinte na ordem do curso, ou None."""
+        return self._lesson_at_offset(lesson_id, 1)
+
+    def get_previous_lesson(self, lesson_id) -> Optional[dict]:
+        """Retorna a lição anterior na ordem do curso, ou None."""
+        return self._lesson_at_offset(lesson_id, -1)
+
+    def _exercise_at_offset(self, exercise_id, offset: int) -> Optional[dict]:
+        position = self._exercise_positions.get(str(exercise_id))
+        if position is None:
+            return None
+        lesson_id, index = position
+        lesson_exercises = self._exercises_by_lesson[lesson_id]
+        target = index + offset
+        if 0 <= target < len(lesson_exercises):
+            return lesson_exercises[target]
+        return None
+
+    def get_next_exercise(self, exercise_id) -> Optional[dict]:
+        """Retorna o próximo exercício da mesma lição, ou None."""
+        return self._exercise_at_offset(exercise_id, 1)
+
+    def get_previous_exercise(self, exercise_id) -> Optional[dict]:
+        """Retorna o exercício anterior da mesma lição, ou None."""
+        return self._exercise_at_offset(exercise_id, -1)
+
+
+# Índices por ID de curso: (lições, exercícios, nível, índice)
+_index_registry: Dict[str, Tuple[list, list, Optional[str], CourseIndex]] = {}
+_registry_lock = threading.Lock()
+
+
+def get_course_index(course: dict, lessons: list, exercises: list) -> CourseIndex:
+    """
+    Retorna o índice do curso, reconstruindo-o somente se o conteúdo mudou.
+
+    O conteúdo é considerado inalterado quando as listas recebidas são os
+    mesmos objetos usados na última construção (identidade, não igualdade),
+    o que vale enquanto o `content_cache` não recarregar os arquivos.
+
+    Args:
+        course (dict): Dados do curso.
+        lessons (list): Lições carregadas pelo LessonManager.
+        exercises (list): Exercícios carregados pelo ExerciseManager.
+
+    Returns:
+        CourseIndex: Índice pronto para consultas O(1).
+    """
+    course_id = str(course.get("id"))
+    level = _normalize_level(course.get("level"))
+
+    cached = _index_registry.get(course_id)
+    if cached is not None and cached[0] is lessons and cached[1] is exercises and cached[2] == level:
+        return cached[3]
+
+    index = CourseIndex(course, lessons, exercises)
+    with _registry_lock:
+        _index_registry[course_id] = (lessons, exercises, level, index)
+    return index
+
+
+def clear_course_indexes():
+    """Descarta todos os índices construídos."""
+    with _registry_lock:
+        _index_registry.clear()
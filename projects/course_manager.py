@@ -8,13 +8,39 @@ Os dados dos cursos são armazenados em formato JSON.
 """
 import json
 import logging
+import threading
 from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
 import uuid # Para gerar IDs únicos para novos cursos
 
+try:
+    from .durable_io import atomic_write_text
+except ImportError:
+    # Fallback para execução direta (python projects/course_manager.py)
+    from durable_io import atomic_write_text
+
 # Configuração de logging movida para app.py ou um módulo de configuração central.
 # Se este módulo for executado diretamente, o logging básico pode ser configurado no if __name__ == '__main__':
 logger = logging.getLogger(__name__)
 
+
+class _CourseSnapshot(NamedTuple):
+    """Visão imutável dos cursos: lista na ordem do arquivo e índice id -> curso."""
+    courses: list
+    by_id: Mapping[str, dict]
+
+
+def _build_snapshot(courses) -> _CourseSnapshot:
+    """Constrói um snapshot a partir de uma lista de cursos (em IDs duplicados prevalece o primeiro)."""
+    courses = list(courses)
+    by_id = {}
+    for course in courses:
+        if isinstance(course, dict):
+            by_id.setdefault(str(course.get('id')), course)
+    return _CourseSnapshot(courses, MappingProxyType(by_id))
+
+
 class CourseManager:
     """
     Gerencia o carregamento, salvamento e manipulação de dados de cursos.
@@ -28,6 +54,12 @@ class CourseManager:
         data_dir (Path): O caminho completo para o diretório 'data' dentro de 'projects'.
         courses_file (Path): O caminho completo para o arquivo 'courses.json'.
         courses (list): Uma lista de dicionários, onde cada dicionário representa um curso.
+
+    Leituras usam um snapshot imutável (lista + índice id -> curso) publicado
+    por atribuição atômica. Escritores (`add_course`, `update_course`,
+    `delete_course`) são serializados por um lock, montam um novo snapshot
+    (copy-on-write) e o trocam de uma só vez; leitores nunca bloqueiam nem
+    percorrem a lista.
     """
     # data_dir_path_str é relativo ao diretório do script (projects/)
     def __init__(self, data_dir_path_str="data"):
@@ -43,11 +75,23 @@ class CourseManager:
         self.data_dir = self.base_dir / data_dir_path_str
         # courses_file é projects/data/courses.json
         self.courses_file = self.data_dir / 'courses.json'
-        
+        self._write_lock = threading.Lock()  # Serializa apenas os escritores
+        self._snapshot = _build_snapshot([])
+
         self._ensure_data_files_exist()
         self.courses = self._load_courses()
         logger.info(f"CourseManager inicializado. Dados carregados de: {self.courses_file}")
 
+    @property
+    def courses(self) -> list:
+        """Lista de cursos do snapshot atual (não deve ser modificada in-place)."""
+        return self._snapshot.courses
+
+    @courses.setter
+    def courses(self, new_courses):
+        """Substitui todos os cursos, publicando um novo snapshot atomicamente."""
+        self._snapshot = _build_snapshot(new_courses)
+
     def _ensure_data_files_exist(self):
         """
         Garante que o diretório de dados e o arquivo JSON principal de cursos existam.
@@ -99,11 +143,12 @@ class CourseManager:
         """
         Salva a lista atual de cursos (atributo `self.courses`) no arquivo JSON principal.
 
-        Os dados são serializados para JSON com indentação para melhor legibilidade.
+        Os dados são serializados para JSON com indentação para melhor legibilidade
+        e gravados de forma atômica (arquivo temporário + fsync + rename).
         """
         try:
-            with open(self.courses_file, 'w', encoding='utf-8') as f:
-                json.dump(self.courses, f, indent=4, ensure_ascii=False)
+            # Escrita atômica: uma queda no meio da gravação preserva o arquivo anterior
+            atomic_write_text(self.courses_file, json.dumps(self.courses, indent=4, ensure_ascii=False), fsync_dir=True)
             logger.info(f"Cursos salvos em {self.courses_file}")
         except IOError as e:
             logger.error(f"Erro de I/O ao salvar cursos em '{self.courses_file}': {e}", exc_info=True)
@@ -124,6 +169,8 @@ class CourseManager:
         """
         Retorna um curso específico pelo seu ID.
 
+        A consulta é O(1) no índice do snapshot atual e não adquire lock.
+
         Args:
             course_id (str): O ID do curso a ser procurado.
         Returns:
@@ -133,18 +180,10 @@ class CourseManager:
             logger.warning("get_course_by_id: Tentativa de buscar curso com ID nulo ou vazio.")
             return None
         
-        logger.debug(f"Buscando curso com ID '{course_id}'. Total de cursos: {len(self.courses)}")
-        if self.courses and isinstance(self.courses, list) and len(self.courses) > 0 and isinstance(self.courses[0], dict):
-            logger.debug(f"Primeiro curso na lista: {self.courses[0].get('id')}")
-        else:
-            logger.debug("Lista de cursos está vazia ou não é uma lista de dicionários.")
-            
-        for course in self.courses:
-            if str(course.get('id')) == str(course_id): # Garante comparação de strings
-                logger.debug(f"Curso encontrado: ID '{course.get('id')}'")
-                return course
-        logger.warning(f"Curso com ID '{course_id}' não encontrado.")
-        return None
+        course = self._snapshot.by_id.get(str(course_id)) # Garante comparação de strings
+        if course is None:
+            logger.warning(f"Curso com ID '{course_id}' não encontrado.")
+        return course
 
     def add_course(self, new_course_data):
         """
@@ -176,7 +215,7 @@ class CourseManager:
             course_id = str(course_id) 
             new_course_data['id'] = course_id
 
-        if self.get_course_by_id(course_id):
+        if course_id in self._snapshot.by_id:
             logger.error(f"Falha ao adicionar curso: ID '{course_id}' já existe.")
             return None
 
@@ -197,8 +236,12 @@ class CourseManager:
             logger.error(f"Erro ao criar diretório/arquivos para o novo curso '{course_id}': {e}", exc_info=True)
             return None
 
-        self.courses.append(new_course_data)
-        self._save_courses()
+        with self._write_lock:
+            if course_id in self._snapshot.by_id: # Outro escritor pode ter adicionado o mesmo ID
+                logger.error(f"Falha ao adicionar curso: ID '{course_id}' já existe.")
+                return None
+            self.courses = self.courses + [new_course_data]
+            self._save_courses()
         logger.info(f"Curso '{new_course_data.get('name', 'Sem Nome')}' adicionado com ID '{course_id}'.")
         return new_course_data
 
@@ -221,36 +264,34 @@ class CourseManager:
             return None
 
         course_id_str = str(course_id)
-        course_to_update = None
-        course_index = -1
-
-        for i, course in enumerate(self.courses):
-            if str(course.get('id')) == course_id_str:
-                course_to_update = course
-                course_index = i
-                break
-        
-        if course_to_update:
-            if 'id' in updated_data and str(updated_data['id']) != course_id_str:
-                logger.warning(f"Tentativa de alterar ID do curso '{course_id_str}' para '{updated_data['id']}'. IDs não podem ser alterados. Chave 'id' ignorada.")
-                updated_data.pop('id', None) 
-            
-            original_lessons_file = course_to_update.get('lessons_file')
-            original_exercises_file = course_to_update.get('exercises_file')
 
-            course_to_update.update(updated_data)
-            self.courses[course_index] = course_to_update # Garante que a referência na lista seja atualizada
+        with self._write_lock:
+            current_courses = self.courses
+            course_index = next(
+                (i for i, course in enumerate(current_courses) if str(course.get('id')) == course_id_str), -1
+            )
+
+            if course_index != -1:
+                if 'id' in updated_data and str(updated_data['id']) != course_id_str:
+                    logger.warning(f"Tentativa de alterar ID do curso '{course_id_str}' para '{updated_data['id']}'. IDs não podem ser alterados. Chave 'id' ignorada.")
+                    updated_data.pop('id', None)
+
+                course_to_update = current_courses[course_index]
+                # Copy-on-write: leitores do snapshot anterior nunca veem um curso parcialmente atualizado
+                updated_course = {**course_to_update, **updated_data}
+
+                # Se os caminhos dos arquivos não foram fornecidos na atualização, mantenha os originais
+                for file_key in ('lessons_file', 'exercises_file'):
+                    if file_key not in updated_data and course_to_update.get(file_key):
+                        updated_course[file_key] = course_to_update[file_key]
+
+                new_courses = list(current_courses)
+                new_courses[course_index] = updated_course
+                self.courses = new_courses
+                self._save_courses()
+                logger.info(f"Curso '{course_id_str}' atualizado com sucesso.")
+                return updated_course
 
-            # Se os caminhos dos arquivos não foram fornecidos na atualização, mantenha os originais
-            if 'lessons_file' not in updated_data and original_lessons_file:
-                 self.courses[course_index]['lessons_file'] = original_lessons_file
-            if 'exercises_file' not in updated_data and original_exercises_file:
-                  self.courses[course_index]['exercises_file'] = original_exercises_file
-
-            self._save_courses()
-            logger.info(f"Curso '{course_id_str}' atualizado com sucesso.")
-            return self.courses[course_index]
-        
         logger.warning(f"Falha ao atualizar curso: ID '{course_id_str}' não encontrado.")
         return None
 
@@ -272,13 +313,14 @@ class CourseManager:
         
         course_id_str = str(course_id)
         
-        course_to_delete = self.get_course_by_id(course_id_str) 
-        if not course_to_delete:
-            logger.warning(f"Falha ao deletar curso: ID '{course_id_str}' não encontrado.")
-            return False
+        with self._write_lock:
+            course_to_delete = self._snapshot.by_id.get(course_id_str)
+            if not course_to_delete:
+                logger.warning(f"Falha ao deletar curso: ID '{course_id_str}' não encontrado.")
+                return False
 
-        self.courses = [c for c in self.courses if str(c.get('id')) != course_id_str]
-        self._save_courses()
+            self.courses = [c for c in self.courses if str(c.get('id')) != course_id_str]
+            self._save_courses()
         
         # Opcional: deletar o diretório de dados do curso
         # course_dir_to_delete = self.data_dir / course_id_str
@@ -11,6 +11,12 @@ import shutil
 from pathlib import Path
 from typing import Dict
 
+try:
+    from .durable_io import atomic_write_text
+except ImportError:
+    # Fallback para execução direta (python projects/data_migration.py)
+    from durable_io import atomic_write_text
+
 logger = logging.getLogger(__name__)
 
 
@@ -116,9 +122,8 @@ def migrate_file(file_path: str, create_backup: bool = True) -> bool:
         # Migrar dados
         migrated_data = migrate_user_progress(original_data)
 
-        # Salvar dados migrados
-        with open(file_path_obj, "w", encoding="utf-8") as f:
-            json.dump(migrated_data, f, indent=4, ensure_ascii=False)
+        # Salvar dados migrados (escrita atômica: o original só é substituído após o fsync)
+        atomic_write_text(file_path_obj, json.dumps(migrated_data, indent=4, ensure_ascii=False), fsync_dir=True)
 
         logger.info(f"Arquivo '{file_path}' migrado com sucesso.")
         return True
@@ -134,29 +139,119 @@ def migrate_file(file_path: str, create_backup: bool = True) -> bool:
         return False
 
 
+def migrate_to_sqlite(json_path: str, db_path: str) -> bool:
+    """
+    Importa um arquivo user_progress.json para o backend SQLite.
+
+    O arquivo JSON original não é alterado. Os dados passam por
+    `migrate_user_progress` antes da gravação.
+
+    Args:
+        json_path (str): Caminho do arquivo user_progress.json.
+        db_path (str): Caminho do banco SQLite de destino (criado se não existir).
+
+    Returns:
+        bool: True se a importação foi bem-sucedida, False caso contrário.
+    """
+    try:
+        from .progress_storage import SqliteProgressStorage
+    except ImportError:
+        # Fallback para execução direta (python projects/data_migration.py)
+        from progress_storage import SqliteProgressStorage
+
+    if not Path(json_path).exists():
+        logger.error(f"Arquivo '{json_path}' não encontrado.")
+        return False
+
+    storage = None
+    try:
+        storage = SqliteProgressStorage(Path(db_path))
+        imported = storage.import_json(Path(json_path))
+        logger.info(f"{imported} usuários importados de '{json_path}' para '{db_path}'.")
+        return True
+    except json.JSONDecodeError as e:
+        logger.error(f"Erro ao decodificar JSON de '{json_path}': {e}", exc_info=True)
+        return False
+    except Exception as e:
+        logger.error(f"Erro inesperado ao importar '{json_path}' para SQLite: {e}", exc_info=True)
+        return False
+    finally:
+        if storage is not None:
+            storage.close()
+
+
+def migrate_to_sharded(json_path: str, progress_dir: str) -> bool:
+    """
+    Converte um arquivo user_progress.json para o layout de um arquivo por usuário.
+
+    O arquivo JSON original não é alterado. Os dados passam por
+    `migrate_user_progress` antes da gravação.
+
+    Args:
+        json_path (str): Caminho do arquivo user_progress.json.
+        progress_dir (str): Diretório de destino dos shards (ex.: data/progress).
+
+    Returns:
+        bool: True se a conversão foi bem-sucedida, False caso contrário.
+    """
+    try:
+        from .progress_storage import ShardedProgressStorage
+    except ImportError:
+        # Fallback para execução direta (python projects/data_migration.py)
+        from progress_storage import ShardedProgressStorage
+
+    if not Path(json_path).exists():
+        logger.error(f"Arquivo '{json_path}' não encontrado.")
+        return False
+
+    try:
+        storage = ShardedProgressStorage(Path(progress_dir))
+        imported = storage.import_json(Path(json_path))
+        logger.info(f"{imported} usuários convertidos de '{json_path}' para '{progress_dir}'.")
+        return True
+    except json.JSONDecodeError as e:
+        logger.error(f"Erro ao decodificar JSON de '{json_path}': {e}", exc_info=True)
+        return False
+    except Exception as e:
+        logger.error(f"Erro inesperado ao converter '{json_path}' para shards: {e}", exc_info=True)
+        return False
+
+
 def main():
     """
     Função principal para executar migração via linha de comando.
 
-    Migra o arquivo user_progress.json padrão no diretório data/.
+    Migra o arquivo user_progress.json padrão no diretório data/. Com
+    `--to-sqlite DB`, importa o arquivo para o banco SQLite indicado; com
+    `--to-sharded DIR`, converte-o para um arquivo por usuário em DIR.
+
+    Uso:
+        python -m projects.data_migration [arquivo] [--to-sqlite DB | --to-sharded DIR]
     """
+    import argparse
     import sys
 
     # Configurar logging
     logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 
-    # Determinar caminho do arquivo
-    if len(sys.argv) > 1:
-        file_path = sys.argv[1]
-    else:
-        # Usar caminho padrão
-        base_dir = Path(__file__).resolve().parent
-        file_path = base_dir / "data" / "user_progress.json"
+    base_dir = Path(__file__).resolve().parent
+    parser = argparse.ArgumentParser(description="Migração de dados de progresso do usuário.")
+    parser.add_argument("file_path", nargs="?", default=str(base_dir / "data" / "user_progress.json"))
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--to-sqlite", dest="sqlite_path", help="Importa o progresso para este banco SQLite")
+    target.add_argument("--to-sharded", dest="sharded_dir", help="Converte o progresso para um arquivo por usuário")
+    args = parser.parse_args()
 
+    file_path = args.file_path
     logger.info(f"Iniciando migração de: {file_path}")
 
     # Executar migração
-    success = migrate_file(str(file_path))
+    if args.sqlite_path:
+        success = migrate_to_sqlite(str(file_path), args.sqlite_path)
+    elif args.sharded_dir:
+        success = migrate_to_sharded(str(file_path), args.sharded_dir)
+    else:
+        success = migrate_file(str(file_path))
 
     if success:
         logger.info("Migração concluída com sucesso!")
@@ -0,0 +1,176 @@
+"""
+Módulo de escrita durável de arquivos.
+
+Gravar com `open(path, "w")` trunca o arquivo antes de escrever: uma queda
+no meio da escrita deixa o arquivo vazio ou pela metade. As funções deste
+módulo gravam em um arquivo temporário no mesmo diretório, forçam os dados
+para o disco (`fsync`) e só então substituem o destino com `os.replace`,
+que é atômico: leitores veem o conteúdo antigo ou o novo, nunca uma mistura.
+
+`GroupCommitWriter` amortiza o custo do `fsync` entre escritores
+concorrentes do mesmo arquivo: enquanto uma gravação está em andamento, as
+solicitações que chegam são atendidas juntas pela gravação seguinte.
+"""
+
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+def fsync_directory(directory: Path):
+    """
+    Força para o disco as entradas de um diretório (ex.: após um rename).
+
+    Ignorado em plataformas que não permitem abrir diretórios (Windows).
+
+    Args:
+        directory (Path): Diretório a sincronizar.
+    """
+    try:
+        fd = os.open(str(directory), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError as e:
+        logger.debug(f"fsync do diretório '{directory}' não suportado: {e}")
+    finally:
+        os.close(fd)
+
+
+def atomic_write_bytes(path: Union[str, Path], data: bytes, fsync: bool = True, fsync_dir: bool = False):
+    """
+    Substitui o conteúdo de um arquivo de forma atômica.
+
+    Args:
+        path (str | Path): Arquivo de destino.
+        data (bytes): Conteúdo completo do arquivo.
+        fsync (bool): Se True, força os dados do arquivo temporário para o disco antes do rename.
+        fsync_dir (bool): Se True, também sincroniza o diretório após o rename,
+            tornando a própria substituição durável.
+
+    Raises:
+        OSError: Se a escrita ou a substituição falhar (o destino permanece intacto).
+    """
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    if fsync_dir:
+        fsync_directory(path.parent)
+
+
+def atomic_write_text(
+    path: Union[str, Path], text: str, encoding: str = "utf-8", fsync: bool = True, fsync_dir: bool = False
+):
+    """
+    Substitui o conteúdo de um arquivo de texto de forma atômica.
+
+    Args:
+        path (str | Path): Arquivo de destino.
+        text (str): Conteúdo completo do arquivo.
+        encoding (str): Codificação do texto.
+        fsync (bool): Veja `atomic_write_bytes`.
+        fsync_dir (bool): Veja `atomic_write_bytes`.
+
+    Raises:
+        OSError: Se a escrita ou a substituição falhar.
+    """
+    atomic_write_bytes(path, text.encode(encoding), fsync=fsync, fsync_dir=fsync_dir)
+
+
+class GroupCommitWriter:
+    """
+    Grava um arquivo de forma atômica agrupando solicitações concorrentes (group commit).
+
+    O conteúdo é produzido por `render`, chamado no momento da gravação, de
+    modo que cada gravação reflete o estado mais recente. `commit()` só
+    retorna depois que uma gravação iniciada após a chamada terminar. Uma
+    thread por vez (a "líder") grava; as que chegam enquanto isso esperam e
+    são atendidas juntas pela próxima gravação, com um único `fsync`.
+
+    Attributes:
+        path (Path): Arquivo de destino.
+        requests (int): Número de chamadas a `commit()`.
+        commits (int): Número de gravações efetivamente realizadas.
+    """
+
+    def __init__(
+        self, path: Union[str, Path], render: Callable[[], bytes], fsync: bool = True, fsync_dir: bool = True
+    ):
+        """
+        Inicializa o escritor.
+
+        Args:
+            path (str | Path): Arquivo de destino.
+            render (Callable[[], bytes]): Produz o conteúdo completo do arquivo.
+            fsync (bool): Se True, força os dados para o disco a cada gravação.
+            fsync_dir (bool): Se True, sincroniza o diretório após cada substituição.
+        """
+        self.path = Path(path)
+        self.render = render
+        self.fsync = fsync
+        self.fsync_dir = fsync_dir
+        self._cond = threading.Condition()
+        self._requested = 0  # Última solicitação recebida
+        self._committed = 0  # Última solicitação coberta por uma gravação concluída
+        self._failed = 0  # Última solicitação coberta por uma gravação que falhou
+        self._error: Optional[BaseException] = None
+        self._writing = False
+        self.requests = 0
+        self.commits = 0
+
+    def commit(self):
+        """
+        Grava o estado atual e espera até que esteja no disco.
+
+        Raises:
+            OSError: Se a gravação que cobria esta solicitação falhar.
+        """
+        with self._cond:
+            self._requested += 1
+            ticket = self._requested
+            self.requests += 1
+
+            while self._committed < ticket:
+                if self._failed >= ticket:
+                    raise self._error
+                if self._writing:
+                    self._cond.wait()
+                    continue
+
+                # Esta thread lidera a próxima gravação, cobrindo todas as solicitações até aqui
+                self._writing = True
+                covered = self._requested
+                self._cond.release()
+                error = None
+                try:
+                    atomic_write_bytes(self.path, self.render(), fsync=self.fsync, fsync_dir=self.fsync_dir)
+                except BaseException as e:
+                    error = e
+                finally:
+                    self._cond.acquire()
+                    self._writing = False
+                    if error is None:
+                        self._committed = max(self._committed, covered)
+                        self.commits += 1
+                    else:
+                        self._failed = max(self._failed, covered)
+                        self._error = error
+                    self._cond.notify_all()
@@ -0,0 +1,64 @@
+"""
+Módulo de limites de recursos por exercício.
+
+Os exercícios vão de um `print("Olá, Mundo!")` a exemplos de machine learning,
+mas eram todos executados com os mesmos limites do sandbox. Um exercício pode
+declarar em `exercises.json` o campo opcional `limits`, e um curso pode
+declarar `default_limits` em `courses.json`:
+
+    "limits": {"timeout_ms": 2000, "max_memory_mb": 128, "max_output_bytes": 65536}
+
+Os limites do exercício prevalecem sobre os do curso, que prevalecem sobre
+os padrões do sandbox (variáveis SANDBOX_*). Valores ausentes ou inválidos
+são ignorados (com aviso no log).
+"""
+
+import logging
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Campos aceitos em `limits` / `default_limits`
+LIMIT_FIELDS = ("timeout_ms", "max_memory_mb", "max_output_bytes")
+
+
+def _clean_limits(raw, source: str) -> Dict[str, int]:
+    """Mantém apenas os campos conhecidos com valores inteiros positivos."""
+    if not raw:
+        return {}
+    if not isinstance(raw, dict):
+        logger.warning(f"Limites inválidos em {source}: esperado um objeto, recebido {type(raw).__name__}")
+        return {}
+    limits = {}
+    for field, value in raw.items():
+        if field not in LIMIT_FIELDS:
+            logger.warning(f"Campo de limite desconhecido '{field}' em {source}")
+        elif isinstance(value, bool) or not isinstance(value, int) or value <= 0:
+            logger.warning(f"Valor inválido para '{field}' em {source}: {value!r}")
+        else:
+            limits[field] = value
+    return limits
+
+
+def resolve_limits(exercise: Dict, course: Optional[Dict] = None) -> Dict[str, int]:
+    """
+    Combina os limites padrão do curso com os limites do exercício.
+
+    Args:
+        exercise (dict): Dados do exercício (campo opcional `limits`).
+        course (dict, optional): Dados do curso (campo opcional `default_limits`).
+
+    Returns:
+        dict: Limites efetivos; apenas os campos declarados (timeout_ms, max_memory_mb, max_output_bytes).
+    """
+    limits = {}
+    if course:
+        limits.update(_clean_limits(course.get("default_limits"), f"curso '{course.get('id')}'"))
+    limits.update(_clean_limits(exercise.get("limits"), f"exercício '{exercise.get('id')}'"))
+    return limits
+
+
+def timeout_seconds(limits: Dict[str, int]) -> Optional[float]:
+    """Retorna o limite de tempo real em segundos, ou None para usar o padrão do sandbox."""
+    timeout_ms = limits.get("timeout_ms")
+    return timeout_ms / 1000 if timeout_ms else None
@@ -9,6 +9,10 @@ Também fornece uma função utilitária para buscar um exercício por ID dentro
 import json
 import logging
 from pathlib import Path
+from typing import Dict, Tuple
+
+from .code_cache import code_cache
+from .content_cache import content_cache
 
 # Import CourseManager para obter o caminho do arquivo de exercícios
 # Isso cria uma dependência, mas alinha com a lógica de app.py
@@ -19,6 +23,11 @@ logger = logging.getLogger(__name__)
 # DATA_DIR apontará para Curso-Interartivo-Python/projects/data/
 DATA_DIR = Path(__file__).resolve().parent / 'data'
 
+def _precompile_exercise_code(file_path: Path, exercises_data):
+    """Compila o test_code/solution_code dos exercícios assim que o arquivo é carregado."""
+    code_cache.precompile_exercises(exercises_data, source_name=str(file_path))
+
+
 class ExerciseManager:
     """
     Gerencia o carregamento de dados de exercícios a partir de arquivos JSON.
@@ -35,12 +44,27 @@ class ExerciseManager:
         """
         pass # Nenhuma ação de carregamento na inicialização
 
+    def exercises_file_path(self, exercises_file_path_relative: str) -> Path:
+        """
+        Retorna o caminho absoluto de um arquivo de exercícios, relativo à pasta 'data' do projeto.
+
+        Args:
+            exercises_file_path_relative (str): O caminho relativo, ex.: "nome_do_curso/exercises.json".
+
+        Returns:
+            Path: O caminho combinado com o `DATA_DIR` do módulo.
+        """
+        return DATA_DIR / exercises_file_path_relative
+
     def load_exercises_from_file(self, exercises_file_path_relative: str) -> list:
         """
         Carrega exercícios de um arquivo JSON específico, relativo à pasta 'data' do projeto.
 
         O caminho fornecido é combinado com o `DATA_DIR` do módulo para formar
         o caminho absoluto para o arquivo de exercícios.
+        O conteúdo decodificado fica no `content_cache` do processo e só é relido
+        quando o arquivo muda; a lista retornada é compartilhada e não deve ser modificada.
+        A cada (re)leitura, o código dos exercícios é pré-compilado no `code_cache`.
 
         Args:
             exercises_file_path_relative (str): O caminho relativo para o arquivo JSON
@@ -58,30 +82,56 @@ class ExerciseManager:
             return []
 
         # Constrói o caminho completo para o arquivo de exercícios
-        full_file_path = DATA_DIR / exercises_file_path_relative
+        full_file_path = self.exercises_file_path(exercises_file_path_relative)
         
         logger.debug(f"Tentando carregar exercícios de: {full_file_path}")
         
-        if full_file_path.exists() and full_file_path.is_file():
-            try:
-                with open(full_file_path, 'r', encoding='utf-8') as f:
-                    exercises_data = json.load(f)
-                    if not isinstance(exercises_data, list):
-                        logger.error(f"Formato inválido em {full_file_path}. Esperava uma lista, obteve {type(exercises_data)}. Retornando lista vazia.")
-                        return []
-                    logger.info(f"Sucesso ao carregar {len(exercises_data)} exercícios de {full_file_path}")
-                    return exercises_data
-            except json.JSONDecodeError as e:
-                logger.error(f"Erro de decodificação JSON ao carregar exercícios de {full_file_path}: {e}", exc_info=True)
-            except IOError as e: # Captura erros de I/O mais genéricos
-                logger.error(f"Erro de I/O ao carregar exercícios de {full_file_path}: {e}", exc_info=True)
-            except Exception as e: # Captura qualquer outra exceção inesperada
-                logger.error(f"Erro inesperado ao carregar exercícios de {full_file_path}: {e}", exc_info=True)
-        else:
+        try:
+            # Leitura via cache compartilhado: o JSON só é decodificado novamente se (mtime, tamanho) mudar
+            exercises_data = content_cache.load_json(full_file_path, on_load=_precompile_exercise_code)
+            if not isinstance(exercises_data, list):
+                logger.error(f"Formato inválido em {full_file_path}. Esperava uma lista, obteve {type(exercises_data)}. Retornando lista vazia.")
+                return []
+            logger.debug(f"{len(exercises_data)} exercícios disponíveis de {full_file_path}")
+            return exercises_data
+        except FileNotFoundError:
             logger.warning(f"Arquivo de exercícios não encontrado ou não é um arquivo: {full_file_path}")
-            
+        except json.JSONDecodeError as e:
+            logger.error(f"Erro de decodificação JSON ao carregar exercícios de {full_file_path}: {e}", exc_info=True)
+        except IOError as e: # Captura erros de I/O mais genéricos
+            logger.error(f"Erro de I/O ao carregar exercícios de {full_file_path}: {e}", exc_info=True)
+        except Exception as e: # Captura qualquer outra exceção inesperada
+            logger.error(f"Erro inesperado ao carregar exercícios de {full_file_path}: {e}", exc_info=True)
+
         return [] # Retorna lista vazia se o arquivo não existe ou em caso de erro
 
+# Índices id -> exercício por arquivo: (lista indexada, índice). Reconstruídos quando o cache recarrega o arquivo.
+_exercise_id_indexes: Dict[str, Tuple[list, Dict[str, dict]]] = {}
+
+
+def _get_exercise_id_index(exercises_file_relative_path: str, exercises: list) -> Dict[str, dict]:
+    """
+    Retorna o índice id -> exercício de um arquivo, reaproveitando-o enquanto a lista não mudar.
+
+    Args:
+        exercises_file_relative_path (str): Caminho relativo do arquivo (chave do índice).
+        exercises (list): Exercícios carregados do arquivo.
+
+    Returns:
+        dict: Mapeamento do ID (string) para o exercício; em IDs duplicados prevalece o primeiro.
+    """
+    cached = _exercise_id_indexes.get(exercises_file_relative_path)
+    if cached is not None and cached[0] is exercises:
+        return cached[1]
+
+    index: Dict[str, dict] = {}
+    for exercise in exercises:
+        if isinstance(exercise, dict):
+            index.setdefault(str(exercise.get("id")), exercise)
+    _exercise_id_indexes[exercises_file_relative_path] = (exercises, index)
+    return index
+
+
 # Função para ser importada pelos testes e outras partes da aplicação
 def get_exercise_by_id(exercise_id: str, course_id: str) -> dict | None:
     """
@@ -117,11 +167,11 @@ def get_exercise_by_id(exercise_id: str, course_id: str) -> dict | None:
         logger.warning(f"Nenhum exercício carregado para o curso '{course_id}' a partir de '{exercises_file_relative_path}'.")
         return None
 
-    for exercise in all_exercises_for_course:
-        if isinstance(exercise, dict) and str(exercise.get("id")) == str(exercise_id):
-            logger.debug(f"Exercício ID '{exercise_id}' encontrado no curso '{course_id}'.")
-            return exercise
-            
+    exercise = _get_exercise_id_index(exercises_file_relative_path, all_exercises_for_course).get(str(exercise_id))
+    if exercise is not None:
+        logger.debug(f"Exercício ID '{exercise_id}' encontrado no curso '{course_id}'.")
+        return exercise
+
     logger.warning(f"Exercício com ID '{exercise_id}' não encontrado no arquivo '{exercises_file_relative_path}' para o curso '{course_id}'.")
     return None
 
@@ -0,0 +1,230 @@
+"""
+Módulo de validação em lote do catálogo de exercícios.
+
+Verifica se o `solution_code` de cada exercício passa no seu `test_code`,
+com a mesma semântica de `/api/check-exercise` (a saída da solução fica
+disponível ao teste na variável `output`), mas sem registrar progresso.
+As execuções são distribuídas por um `SandboxPool` dedicado, com um
+trabalhador por CPU, e cada exercício tem limite de tempo próprio (os
+`limits` declarados no exercício ou no curso prevalecem, ver `execution_limits`).
+
+Uso pela linha de comando (código de saída 1 se algum exercício falhar):
+    python -m projects.exercise_validator [--course ID ...] [--workers N] [--json]
+"""
+
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    from .execution_limits import resolve_limits, timeout_seconds
+    from .sandbox_pool import SandboxPool
+except ImportError:  # Execução direta do módulo
+    from execution_limits import resolve_limits, timeout_seconds
+    from sandbox_pool import SandboxPool
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+DEFAULT_TIMEOUT = 10.0
+
+# Situação de cada exercício no relatório
+PASSED = "passed"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+
+def collect_exercises(
+    data_dir: Path = DATA_DIR, course_ids: Optional[Iterable[str]] = None
+) -> List[Tuple[str, Dict, Dict[str, int]]]:
+    """
+    Reúne os exercícios de todos os arquivos `data/*/exercises.json`.
+
+    O ID do curso vem de `courses.json` (campo `exercises_file`); arquivos não
+    referenciados por nenhum curso usam o nome do diretório.
+
+    Args:
+        data_dir (Path): Diretório de dados.
+        course_ids (Iterable[str], optional): Restringe a validação a estes cursos.
+
+    Returns:
+        list: Triplas (ID do curso, exercício, limites efetivos de `execution_limits.resolve_limits`).
+    """
+    data_dir = Path(data_dir)
+    course_by_file = {}
+    try:
+        with open(data_dir / "courses.json", encoding="utf-8") as f:
+            for course in json.load(f):
+                if course.get("exercises_file"):
+                    course_by_file[(data_dir / course["exercises_file"]).resolve()] = course
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning(f"Não foi possível ler courses.json em '{data_dir}': {e}")
+
+    wanted = set(course_ids) if course_ids else None
+    exercises = []
+    for exercises_file in sorted(data_dir.glob("*/exercises.json")):
+        course = course_by_file.get(exercises_file.resolve())
+        course_id = course.get("id") if course else exercises_file.parent.name
+        if wanted is not None and course_id not in wanted:
+            continue
+        try:
+            with open(exercises_file, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.error(f"Erro ao ler '{exercises_file}': {e}")
+            continue
+        exercises.extend(
+            (course_id, exercise, resolve_limits(exercise, course)) for exercise in data if isinstance(exercise, dict)
+        )
+    return exercises
+
+
+def _describe_failure(results: Dict) -> str:
+    """Resume em uma linha por que a solução não passou no teste."""
+    user, test = results["user"], results["test"]
+    if user["returncode"] != 0:
+        return f"solution_code falhou: {user['stderr'].strip()}"
+    return f"test_code falhou: {test['stderr'].strip() or 'sem mensagem'}"
+
+
+def validate_exercise(
+    pool: SandboxPool,
+    course_id: str,
+    exercise: Dict,
+    timeout: float = DEFAULT_TIMEOUT,
+    limits: Optional[Dict[str, int]] = None,
+) -> Dict:
+    """
+    Executa a solução de um exercício contra o seu teste.
+
+    Args:
+        pool (SandboxPool): Pool usado para a execução.
+        course_id (str): ID do curso do exercício.
+        exercise (dict): Dados do exercício.
+        timeout (float): Limite de tempo real da execução (se o exercício não declarar `timeout_ms`).
+        limits (dict, optional): Limites do exercício (ver `execution_limits.resolve_limits`).
+
+    Returns:
+        dict: {"course_id", "exercise_id", "status", "duration_ms", "details"}.
+    """
+    report = {"course_id": course_id, "exercise_id": str(exercise.get("id")), "status": SKIPPED, "duration_ms": 0.0}
+    solution_code = exercise.get("solution_code")
+    test_code = exercise.get("test_code")
+    if not solution_code or not test_code:
+        report["details"] = "Sem solution_code ou test_code."
+        return report
+
+    started = time.perf_counter()
+    limits = limits or {}
+    results = pool.execute_with_test(
+        solution_code,
+        test_code,
+        timeout=timeout_seconds(limits) or timeout,
+        memory_limit_mb=limits.get("max_memory_mb"),
+        max_output_bytes=limits.get("max_output_bytes"),
+    )
+    report["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+
+    if results["test"] is not None and results["test"]["returncode"] == 0:
+        report["status"] = PASSED
+        report["details"] = ""
+    else:
+        report["status"] = FAILED
+        report["details"] = _describe_failure(results)
+    return report
+
+
+def validate_catalog(
+    data_dir: Path = DATA_DIR,
+    course_ids: Optional[Iterable[str]] = None,
+    workers: Optional[int] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> Dict:
+    """
+    Valida todos os exercícios do catálogo em paralelo.
+
+    Args:
+        data_dir (Path): Diretório de dados.
+        course_ids (Iterable[str], optional): Restringe a validação a estes cursos.
+        workers (int, optional): Número de processos trabalhadores (padrão: número de CPUs).
+        timeout (float): Limite de tempo real por exercício.
+
+    Returns:
+        dict: Totais (total, passed, failed, skipped), duração total em ms e a
+        lista `results` no formato de `validate_exercise`, na ordem do catálogo.
+    """
+    exercises = collect_exercises(data_dir, course_ids)
+    workers = max(1, workers or os.cpu_count() or 1)
+    started = time.perf_counter()
+
+    # Sem limite de CPU por execução: o limite de tempo real já cobre laços infinitos
+    pool = SandboxPool(size=workers, timeout=timeout, cpu_time_limit=None)
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="validator") as executor:
+            results = list(
+                executor.map(lambda item: validate_exercise(pool, item[0], item[1], timeout, item[2]), exercises)
+            )
+    finally:
+        pool.close()
+
+    summary = {status: sum(1 for r in results if r["status"] == status) for status in (PASSED, FAILED, SKIPPED)}
+    report = dict(
+        total=len(results),
+        duration_ms=round((time.perf_counter() - started) * 1000, 1),
+        workers=workers,
+        results=results,
+        **summary,
+    )
+    logger.info(
+        f"Validação concluída: {summary[PASSED]} aprovados, {summary[FAILED]} reprovados, "
+        f"{summary[SKIPPED]} ignorados em {report['duration_ms']:.0f} ms ({workers} trabalhadores)"
+    )
+    return report
+
+
+def main():
+    """
+    Função principal para validar o catálogo via linha de comando.
+
+    Uso:
+        python -m projects.exercise_validator [--data-dir DIR] [--course ID ...] [--workers N]
+            [--timeout S] [--json]
+    """
+    import argparse
+    import sys
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
+    parser = argparse.ArgumentParser(description="Valida solution_code contra test_code de todos os exercícios.")
+    parser.add_argument("--data-dir", default=str(DATA_DIR), help="Diretório de dados (padrão: projects/data)")
+    parser.add_argument("--course", dest="course_ids", action="append", help="Valida apenas este curso (repetível)")
+    parser.add_argument("--workers", type=int, default=None, help="Processos trabalhadores (padrão: número de CPUs)")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Limite de tempo por exercício (s)")
+    parser.add_argument("--json", action="store_true", help="Imprime o relatório completo em JSON")
+    args = parser.parse_args()
+
+    report = validate_catalog(Path(args.data_dir), args.course_ids, args.workers, args.timeout)
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        for result in report["results"]:
+            exercise = f"{result['course_id']}/{result['exercise_id']}"
+            line = f"{result['status'].upper():8} {exercise} ({result['duration_ms']} ms)"
+            if result["status"] != PASSED:
+                line += f" - {result['details']}"
+            print(line)
+        print(
+            f"\n{report['passed']} aprovados, {report['failed']} reprovados, {report['skipped']} ignorados "
+            f"de {report['total']} em {report['duration_ms'] / 1000:.1f}s"
+        )
+
+    sys.exit(1 if report["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Módulo de fila de tarefas para execução de código em segundo plano.
+
+`/api/execute-code` e `/api/check-exercise` prendem a thread da requisição
+durante toda a execução do código do aluno; sob carga, as threads do
+servidor se acumulam sem limite. Com esta fila, a requisição apenas
+registra a tarefa e recebe um ID; um número fixo de threads trabalhadoras
+consome a fila e alimenta o executor (`sandbox_pool`), e o resultado é
+consultado por polling ou recebido via Server-Sent Events.
+
+A fila é limitada: quando cheia, `submit` levanta `JobQueueFull` com uma
+estimativa de espera, que a API devolve como 429 + Retry-After.
+Resultados concluídos ficam disponíveis por `result_ttl` segundos.
+"""
+
+import logging
+import math
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PENDING = 64
+DEFAULT_RESULT_TTL = 300.0
+
+# Estados de uma tarefa
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobQueueFull(Exception):
+    """A fila atingiu o limite de tarefas pendentes."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Fila de execução cheia. Tente novamente em {retry_after}s.")
+        self.retry_after = retry_after
+
+
+class Job:
+    """
+    Tarefa submetida à fila.
+
+    Attributes:
+        id (str): Identificador da tarefa.
+        kind (str): Tipo da tarefa (ex.: 'execute-code'), apenas informativo.
+        status (str): 'queued', 'running', 'done' ou 'failed'.
+        result (Any): Resultado da função (ou payload de erro, se 'failed').
+    """
+
+    def __init__(self, kind: str, func: Callable[..., Any], args: tuple):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.func = func
+        self.args = args
+        self.status = QUEUED
+        self.result: Any = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._done = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        """Indica se a tarefa terminou (com sucesso ou falha)."""
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Espera o término da tarefa.
+
+        Args:
+            timeout (float, optional): Tempo máximo de espera, em segundos.
+
+        Returns:
+            bool: True se a tarefa terminou.
+        """
+        return self._done.wait(timeout)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Representação JSON da tarefa (o resultado só é incluído após o término)."""
+        data = {"job_id": self.id, "kind": self.kind, "status": self.status}
+        if self.finished:
+            data["result"] = self.result
+        return data
+
+
+class JobQueue:
+    """
+    Fila limitada de tarefas consumida por um número fixo de threads trabalhadoras.
+
+    Attributes:
+        workers (int): Número de threads trabalhadoras.
+        max_pending (int): Número máximo de tarefas aguardando execução.
+        result_ttl (float): Tempo (s) em que tarefas concluídas permanecem consultáveis.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        result_ttl: float = DEFAULT_RESULT_TTL,
+        error_result: Optional[Callable[[BaseException], Any]] = None,
+    ):
+        """
+        Inicializa a fila e inicia as threads trabalhadoras.
+
+        Args:
+            workers (int, optional): Número de threads (padrão: min(4, CPUs)).
+            max_pending (int): Limite de tarefas na fila.
+            result_ttl (float): Tempo de retenção dos resultados, em segundos.
+            error_result (Callable, optional): Converte uma exceção da tarefa no resultado
+                exposto ao cliente (padrão: {"error": "<mensagem>"}).
+        """
+        self.workers = max(1, workers or min(4, os.cpu_count() or 1))
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self._error_result = error_result or (lambda e: {"error": str(e)})
+        self._queue: "queue.Queue[Optional[Job]]" = queue.Queue(maxsize=max_pending)
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._avg_duration = 1.0  # Média móvel da duração das tarefas (estimativa do Retry-After)
+        self._closed = False
+        self.stats = {"submitted": 0, "rejected": 0, "completed": 0, "failed": 0}
+        self._threads = [
+            threading.Thread(target=self._worker_loop, name=f"job-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, kind: str, func: Callable[..., Any], *args) -> Job:
+        """
+        Enfileira uma tarefa.
+
+        Args:
+            kind (str): Tipo da tarefa.
+            func (Callable): Função executada pela thread trabalhadora.
+            *args: Argumentos da função.
+
+        Returns:
+            Job: Tarefa criada.
+
+        Raises:
+            JobQueueFull: Se a fila estiver cheia (ou encerrada).
+        """
+        job = Job(kind, func, args)
+        with self._lock:
+            self._purge_expired()
+            if self._closed:
+                raise JobQueueFull(self._retry_after())
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                self.stats["rejected"] += 1
+                raise JobQueueFull(self._retry_after()) from None
+            self._jobs[job.id] = job
+            self.stats["submitted"] += 1
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Retorna uma tarefa pelo ID.
+
+        Args:
+            job_id (str): ID retornado por `submit`.
+
+        Returns:
+            Job | None: A tarefa, ou None se desconhecida ou expirada.
+        """
+        with self._lock:
+            self._purge_expired()
+            return self._jobs.get(job_id)
+
+    def pending(self) -> int:
+        """Número aproximado de tarefas aguardando execução."""
+        return self._queue.qsize()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas da fila.
+
+        Returns:
+            dict: Contadores de tarefas, pendentes, tarefas retidas e duração média.
+        """
+        with self._lock:
+            return dict(
+                self.stats,
+                pending=self._queue.qsize(),
+                tracked=len(self._jobs),
+                workers=self.workers,
+                max_pending=self.max_pending,
+                avg_duration=round(self._avg_duration, 4),
+            )
+
+    def close(self, timeout: float = 5.0):
+        """
+        Encerra as threads trabalhadoras após as tarefas já enfileiradas.
+
+        Args:
+            timeout (float): Tempo máximo de espera por thread.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _retry_after(self) -> int:
+        """Estima em quantos segundos a fila terá espaço (chamar com o lock)."""
+        backlog = self._queue.qsize() + self.workers
+        return max(1, math.ceil(backlog * self._avg_duration / self.workers))
+
+    def _purge_expired(self):
+        """Remove tarefas concluídas há mais de `result_ttl` segundos (chamar com o lock)."""
+        deadline = time.time() - self.result_ttl
+        expired = [job_id for job_id, job in self._jobs.items() if job.finished_at and job.finished_at < deadline]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def _worker_loop(self):
+        """Laço das threads trabalhadoras: executa tarefas até receber o sentinela."""
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            job.status = RUNNING
+            started = time.monotonic()
+            try:
+                job.result = job.func(*job.args)
+                job.status = DONE
+            except Exception as e:
+                logger.error(f"Tarefa '{job.id}' ({job.kind}) falhou: {e}", exc_info=True)
+                job.result = self._error_result(e)
+                job.status = FAILED
+            duration = time.monotonic() - started
+            with self._lock:
+                self._avg_duration = 0.8 * self._avg_duration + 0.2 * duration
+                self.stats["completed" if job.status == DONE else "failed"] += 1
+            job.finished_at = time.time()
+            job._done.set()
+            # Libera as referências aos argumentos (código do aluno) assim que possível
+            job.func = None
+            job.args = ()
@@ -9,6 +9,8 @@ import json
 import logging
 from pathlib import Path
 
+from .content_cache import content_cache
+
 logger = logging.getLogger(__name__)
 # Assume que este manager está em Curso-Interartivo-Python/projects/
 # DATA_DIR apontará para Curso-Interartivo-Python/projects/data/
@@ -30,12 +32,26 @@ class LessonManager:
         """
         pass # Nenhuma ação de carregamento na inicialização
 
+    def lessons_file_path(self, lessons_file_path_relative: str) -> Path:
+        """
+        Retorna o caminho absoluto de um arquivo de lições, relativo à pasta 'data' do projeto.
+
+        Args:
+            lessons_file_path_relative (str): O caminho relativo, ex.: "nome_do_curso/lessons.json".
+
+        Returns:
+            Path: O caminho combinado com o `DATA_DIR` do módulo.
+        """
+        return DATA_DIR / lessons_file_path_relative
+
     def load_lessons_from_file(self, lessons_file_path_relative: str) -> list:
         """
         Carrega lições de um arquivo JSON específico, relativo à pasta 'data' do projeto.
 
         O caminho fornecido é combinado com o `DATA_DIR` do módulo para formar
         o caminho absoluto para o arquivo de lições.
+        O conteúdo decodificado fica no `content_cache` do processo e só é relido
+        quando o arquivo muda; a lista retornada é compartilhada e não deve ser modificada.
 
         Args:
             lessons_file_path_relative (str): O caminho relativo para o arquivo JSON
@@ -54,28 +70,27 @@ class LessonManager:
 
         # Constrói o caminho completo para o arquivo de lições
         # lessons_file_path_relative é algo como "basic/lessons.json"
-        full_file_path = DATA_DIR / lessons_file_path_relative
+        full_file_path = self.lessons_file_path(lessons_file_path_relative)
         
         logger.debug(f"Tentando carregar lições de: {full_file_path}")
         
-        if full_file_path.exists() and full_file_path.is_file():
-            try:
-                with open(full_file_path, 'r', encoding='utf-8') as f:
-                    lessons_data = json.load(f)
-                    if not isinstance(lessons_data, list):
-                        logger.error(f"Formato inválido em {full_file_path}. Esperava uma lista, obteve {type(lessons_data)}. Retornando lista vazia.")
-                        return []
-                    logger.info(f"Sucesso ao carregar {len(lessons_data)} lições de {full_file_path}")
-                    return lessons_data
-            except json.JSONDecodeError as e:
-                logger.error(f"Erro de decodificação JSON ao carregar lições de {full_file_path}: {e}", exc_info=True)
-            except IOError as e: # Captura erros de I/O mais genéricos
-                logger.error(f"Erro de I/O ao carregar lições de {full_file_path}: {e}", exc_info=True)
-            except Exception as e: # Captura qualquer outra exceção inesperada
-                logger.error(f"Erro inesperado ao carregar lições de {full_file_path}: {e}", exc_info=True)
-        else:
+        try:
+            # Leitura via cache compartilhado: o JSON só é decodificado novamente se (mtime, tamanho) mudar
+            lessons_data = content_cache.load_json(full_file_path)
+            if not isinstance(lessons_data, list):
+                logger.error(f"Formato inválido em {full_file_path}. Esperava uma lista, obteve {type(lessons_data)}. Retornando lista vazia.")
+                return []
+            logger.debug(f"{len(lessons_data)} lições disponíveis de {full_file_path}")
+            return lessons_data
+        except FileNotFoundError:
             logger.warning(f"Arquivo de lições não encontrado ou não é um arquivo: {full_file_path}")
-            
+        except json.JSONDecodeError as e:
+            logger.error(f"Erro de decodificação JSON ao carregar lições de {full_file_path}: {e}", exc_info=True)
+        except IOError as e: # Captura erros de I/O mais genéricos
+            logger.error(f"Erro de I/O ao carregar lições de {full_file_path}: {e}", exc_info=True)
+        except Exception as e: # Captura qualquer outra exceção inesperada
+            logger.error(f"Erro inesperado ao carregar lições de {full_file_path}: {e}", exc_info=True)
+
         return [] # Retorna lista vazia se o arquivo não existe ou em caso de erro
 
     
@@ -5,16 +5,35 @@ Este módulo gerencia o progresso do usuário através dos cursos,
 lições e exercícios, incluindo estatísticas e histórico.
 """
 
-import copy
-import json
+import atexit
+import functools
 import logging
 import threading
+from collections.abc import MutableMapping
+from contextlib import ExitStack, contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+from .progress_storage import create_progress_storage
 
 logger = logging.getLogger(__name__)
 
+# Número padrão de locks na tabela de locks por usuário
+DEFAULT_LOCK_STRIPES = 64
+
+
+def _per_user_lock(method):
+    """Executa o método com o lock do usuário (primeiro argumento) adquirido."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        user_id = args[0] if args else kwargs.get("user_id", "default")
+        with self._user_lock(user_id):
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
 
 class ProgressManager:
     """
@@ -22,86 +41,174 @@ class ProgressManager:
 
     Armazena informações sobre lições completadas, exercícios resolvidos,
     tempo gasto e estatísticas gerais.
+
+    Com `write_behind=True`, cada alteração apenas marca o usuário como
+    "sujo"; uma thread em segundo plano grava as alterações acumuladas a cada
+    `flush_interval` segundos ou quando `flush_batch_size` alterações se
+    acumulam. Rajadas de atividade viram uma única gravação em disco, e
+    `close()` (registrado em `atexit`) garante a gravação final.
+
+    As sequências de leitura-modificação-escrita de um usuário são serializadas
+    por uma tabela de locks (lock striping): cada usuário é mapeado para um de
+    `lock_stripes` RLocks, de modo que requisições de usuários diferentes
+    prosseguem em paralelo enquanto as alterações de um mesmo usuário são atômicas.
     """
 
-    def __init__(self, data_dir_path_str="data"):
+    def __init__(
+        self,
+        data_dir_path_str="data",
+        storage=None,
+        storage_backend: str = "json",
+        write_behind: bool = False,
+        flush_interval: float = 1.0,
+        flush_batch_size: int = 100,
+        lock_stripes: int = DEFAULT_LOCK_STRIPES,
+    ):
         """
         Inicializa o ProgressManager.
 
         Args:
             data_dir_path_str (str): Caminho para o diretório de dados.
+            storage (ProgressStorage, optional): Backend de persistência (Dependency Injection).
+                Se omitido, é criado a partir de `storage_backend`.
+            storage_backend (str): Nome do backend padrão ('json', 'sqlite', 'journal' ou 'sharded').
+            write_behind (bool): Se True, agrupa as gravações em uma thread de segundo plano.
+            flush_interval (float): Intervalo máximo, em segundos, entre gravações no modo write-behind.
+            flush_batch_size (int): Número de alterações pendentes que antecipa a gravação.
+            lock_stripes (int): Número de locks na tabela de locks por usuário.
         """
-        self._lock = threading.Lock()  # Lock para thread-safety
         self.base_dir = Path(__file__).resolve().parent
         self.data_dir = self.base_dir / data_dir_path_str
         self.progress_file = self.data_dir / "user_progress.json"
 
-        self._ensure_progress_file_exists()
-        self.progress_data = self._load_progress()
-        logger.info(f"ProgressManager inicializado. Dados em: {self.progress_file}")
+        self.storage = storage or create_progress_storage(storage_backend, self.data_dir)
+        self.progress_data = self.storage.load()
+        self._user_locks = [threading.RLock() for _ in range(max(1, lock_stripes))]
+        self.storage.bind_user_locks(self._user_lock)
+
+        # Estado do modo write-behind
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.flush_batch_size = max(1, flush_batch_size)
+        self._dirty_lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # Serializa gravações (thread de fundo e flush() explícito)
+        self._dirty_users: Dict[str, List[str]] = {}  # Usuário -> eventos pendentes
+        self._dirty_all = False
+        self._pending_changes = 0
+        self._flush_requested = threading.Event()
+        self._closed = False
+        self._flush_thread = None
+        if write_behind:
+            self._flush_thread = threading.Thread(target=self._flush_loop, name="progress-flusher", daemon=True)
+            self._flush_thread.start()
+            atexit.register(self.close)
 
-    def _ensure_progress_file_exists(self):
-        """Garante que o arquivo de progresso existe."""
-        try:
-            if not self.progress_file.exists():
-                initial_data = {
-                    "users": {},
-                    "created_at": datetime.now().isoformat(),
-                    "last_updated": datetime.now().isoformat(),
-                }
-                with open(self.progress_file, "w", encoding="utf-8") as f:
-                    json.dump(initial_data, f, ensure_ascii=False, indent=4)
-                logger.info(f"Arquivo de progresso criado em: {self.progress_file}")
-        except OSError as e:
-            logger.error(f"Erro ao criar arquivo de progresso: {e}", exc_info=True)
-
-    def _load_progress(self) -> dict:
-        """Carrega dados de progresso do arquivo JSON."""
-        if not self.progress_file.exists():
-            return {"users": {}}
-
-        try:
-            with open(self.progress_file, encoding="utf-8") as f:
-                data = json.load(f)
-
-            # Validar estrutura básica dos dados
-            if not isinstance(data, dict):
-                logger.error("Dados de progresso não são um dicionário. Retornando dados vazios.")
-                return {"users": {}}
-
-            # Garantir que 'users' existe e é um dicionário
-            if "users" not in data:
-                logger.warning("Campo 'users' não encontrado nos dados de progresso. Inicializando vazio.")
-                data["users"] = {}
-            elif not isinstance(data["users"], dict):
-                logger.error("Campo 'users' não é um dicionário. Reinicializando.")
-                data["users"] = {}
-
-            return data
-        except json.JSONDecodeError:
-            logger.error(f"Erro ao decodificar JSON de '{self.progress_file}'", exc_info=True)
-            return {"users": {}}
-        except OSError as e:
-            logger.error(f"Erro de I/O ao ler '{self.progress_file}': {e}", exc_info=True)
-            return {"users": {}}
-
-    def _save_progress(self):
-        """Salva dados de progresso no arquivo JSON.
-
-        Thread-safe: usa lock e deep copy para evitar erros de concorrência.
-        """
-        try:
-            with self._lock:
-                self.progress_data["last_updated"] = datetime.now().isoformat()
-                # Fazer deep copy para evitar 'dictionary changed size during iteration'
-                data_to_save = copy.deepcopy(self.progress_data)
-
-            with open(self.progress_file, "w", encoding="utf-8") as f:
-                json.dump(data_to_save, f, indent=4, ensure_ascii=False)
-            logger.info(f"Progresso salvo em {self.progress_file}")
-        except OSError as e:
-            logger.error(f"Erro ao salvar progresso: {e}", exc_info=True)
+        logger.info(
+            f"ProgressManager inicializado. Backend: {type(self.storage).__name__}, "
+            f"write-behind: {write_behind}, dados em: {self.data_dir}"
+        )
+
+    def _user_lock(self, user_id: str) -> threading.RLock:
+        """Retorna o lock (da tabela de locks) responsável pelo usuário."""
+        return self._user_locks[hash(user_id) % len(self._user_locks)]
 
+    @contextmanager
+    def _holding_user_locks(self, user_ids: Optional[List[str]]):
+        """
+        Adquire os locks dos usuários informados (todos, se None).
+
+        Os locks são adquiridos sempre na ordem da tabela, evitando deadlock
+        entre gravações concorrentes.
+        """
+        if user_ids is None:
+            locks = self._user_locks
+        else:
+            stripes = sorted({hash(user_id) % len(self._user_locks) for user_id in user_ids})
+            locks = [self._user_locks[stripe] for stripe in stripes]
+        with ExitStack() as stack:
+            for lock in locks:
+                stack.enter_context(lock)
+            yield
+
+    def _save_progress(self, user_id: Optional[str] = None, event: Optional[str] = None):
+        """Persiste os dados de progresso através do backend configurado.
+
+        No modo write-behind apenas registra a alteração; a gravação ocorre em `flush()`.
+
+        Args:
+            user_id (str, optional): Usuário alterado. Backends incrementais gravam
+                apenas as linhas desse usuário; None grava todos.
+            event (str, optional): Tipo da alteração (ex.: 'lesson_completed'),
+                registrado pelo backend de diário.
+        """
+        self.progress_data["last_updated"] = datetime.now().isoformat()
+        if not self.write_behind or self._closed:
+            if user_id is None:
+                with self._holding_user_locks(None):
+                    self.storage.save(self.progress_data)
+            else:
+                self.storage.save(self.progress_data, [user_id], {user_id: [event]} if event else None)
+            return
+
+        with self._dirty_lock:
+            if user_id is None:
+                self._dirty_all = True
+            else:
+                user_events = self._dirty_users.setdefault(user_id, [])
+                if event:
+                    user_events.append(event)
+            self._pending_changes += 1
+            if self._pending_changes >= self.flush_batch_size:
+                self._flush_requested.set()
+
+    def flush(self):
+        """Grava imediatamente todas as alterações pendentes (modo write-behind)."""
+        with self._flush_lock:
+            with self._dirty_lock:
+                if not self._dirty_all and not self._dirty_users:
+                    return
+                user_ids = None if self._dirty_all else list(self._dirty_users)
+                events = self._dirty_users
+                pending = self._pending_changes
+                self._dirty_users = {}
+                self._dirty_all = False
+                self._pending_changes = 0
+
+            try:
+                # Nenhum usuário gravado pode estar no meio de uma alteração
+                with self._holding_user_locks(user_ids):
+                    self.storage.save(self.progress_data, user_ids, events)
+                logger.debug(f"Write-behind: {pending} alterações gravadas em uma operação")
+            except Exception as e:
+                logger.error(f"Erro ao gravar progresso pendente: {e}", exc_info=True)
+                # Devolve os usuários ao conjunto sujo para nova tentativa
+                with self._dirty_lock:
+                    if user_ids is None:
+                        self._dirty_all = True
+                    for user_id, user_events in events.items():
+                        self._dirty_users.setdefault(user_id, [])[:0] = user_events
+                    self._pending_changes += pending
+
+    def _flush_loop(self):
+        """Laço da thread de gravação: grava por intervalo ou ao atingir o tamanho do lote."""
+        while not self._closed:
+            self._flush_requested.wait(self.flush_interval)
+            self._flush_requested.clear()
+            self.flush()
+
+    def close(self):
+        """Grava alterações pendentes, encerra a thread de gravação e libera o backend."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._flush_thread is not None:
+            self._flush_requested.set()
+            self._flush_thread.join(timeout=max(self.flush_interval, 1.0) * 2)
+            atexit.unregister(self.close)
+        self.flush()
+        self.storage.close()
+
+    @_per_user_lock
     def get_user_progress(self, user_id: str = "default") -> dict:
         """
         Retorna o progresso de um usuário específico.
@@ -121,7 +228,7 @@ class ProgressManager:
             logger.warning("Campo 'users' faltando em progress_data. Inicializando.")
             self.progress_data["users"] = {}
 
-        if not isinstance(self.progress_data["users"], dict):
+        if not isinstance(self.progress_data["users"], MutableMapping):
             logger.warning("Campo 'users' não é um dicionário. Reinicializando.")
             self.progress_data["users"] = {}
 
@@ -134,7 +241,7 @@ class ProgressManager:
                 "achievement_stats": {"perfect_exercises_count": 0, "lessons_in_day": 0, "last_activity_date": None},
                 "created_at": datetime.now().isoformat(),
             }
-            self._save_progress()
+            self._save_progress(user_id, "user_created")
         else:
             # Validar e corrigir dados do usuário se necessário
             user_data = self.progress_data["users"][user_id]
@@ -154,7 +261,7 @@ class ProgressManager:
                     },
                     "created_at": datetime.now().isoformat(),
                 }
-                self._save_progress()
+                self._save_progress(user_id, "user_reset")
             else:
                 # Validar campos obrigatórios
                 if "achievements" not in user_data or not isinstance(user_data["achievements"], list):
@@ -185,6 +292,7 @@ class ProgressManager:
 
         return self.progress_data["users"][user_id]
 
+    @_per_user_lock
     def get_course_progress(self, user_id: str, course_id: str) -> dict:
         """
         Retorna o progresso de um curso específico.
@@ -206,10 +314,11 @@ class ProgressManager:
                 "last_accessed": datetime.now().isoformat(),
                 "completed": False,
             }
-            self._save_progress()
+            self._save_progress(user_id, "course_started")
 
         return user_progress["courses"][course_id]
 
+    @_per_user_lock
     def mark_lesson_complete(self, user_id: str, course_id: str, lesson_id: str) -> dict:
         """
         Marca uma lição como completa.
@@ -252,11 +361,12 @@ class ProgressManager:
             course_progress["lessons"][lesson_id]["completed_at"] = datetime.now().isoformat()
 
         course_progress["last_accessed"] = datetime.now().isoformat()
-        self._save_progress()
+        self._save_progress(user_id, "lesson_completed")
 
         logger.info(f"Lição '{lesson_id}' marcada como completa para usuário '{user_id}'")
         return course_progress
 
+    @_per_user_lock
     def mark_exercise_attempt(self, user_id: str, course_id: str, exercise_id: str, success: bool = False) -> dict:
         """
         Registra uma tentativa de exercício (sucesso ou falha).
@@ -311,7 +421,7 @@ class ProgressManager:
             exercise_data["failed_attempts"] = exercise_data.get("failed_attempts", 0) + 1
 
         course_progress["last_accessed"] = datetime.now().isoformat()
-        self._save_progress()
+        self._save_progress(user_id, "exercise_attempt")
 
         logger.info(
             f"Tentativa de exercício '{exercise_id}' registrada - Sucesso: {success}, Total tentativas: {exercise_data['attempts']}"
@@ -336,6 +446,7 @@ class ProgressManager:
         """
         return self.mark_exercise_attempt(user_id, course_id, exercise_id, success)
 
+    @_per_user_lock
     def _mark_exercise_complete_old(
         self, user_id: str, course_id: str, exercise_id: str, success: bool = True, attempts: int = 1
     ) -> dict:
@@ -365,7 +476,7 @@ class ProgressManager:
                 user_progress["total_exercises_completed"] = user_progress.get("total_exercises_completed", 0) + 1
 
         course_progress["last_accessed"] = datetime.now().isoformat()
-        self._save_progress()
+        self._save_progress(user_id, "exercise_attempt")
 
         logger.info(f"Exercício '{exercise_id}' atualizado para usuário '{user_id}'")
         return course_progress
@@ -438,6 +549,7 @@ class ProgressManager:
             "created_at": user_progress.get("created_at"),
         }
 
+    @_per_user_lock
     def unlock_achievement(self, user_id: str, achievement_id: str) -> bool:
         """
         Desbloqueia uma conquista para o usuário.
@@ -459,7 +571,7 @@ class ProgressManager:
 
         # Adiciona nova conquista
         achievements.append({"id": achievement_id, "unlocked_at": datetime.now().isoformat()})
-        self._save_progress()
+        self._save_progress(user_id, "achievement_unlocked")
         logger.info(f"Conquista '{achievement_id}' desbloqueada para usuário '{user_id}'")
         return True
 
@@ -0,0 +1,1252 @@
+"""
+Módulo de backends de armazenamento do progresso do usuário.
+
+Define a interface `ProgressStorage` usada pelo `ProgressManager` e suas
+implementações:
+- `JsonFileProgressStorage`: arquivo único `user_progress.json` (comportamento original)
+- `SqliteProgressStorage`: banco SQLite em modo WAL, com uma tabela por tipo de registro
+- `JournalProgressStorage`: snapshot JSON mais um diário (journal) somente-anexação,
+  compactado periodicamente em segundo plano
+- `ShardedProgressStorage`: um arquivo JSON por usuário, carregado sob demanda e mantido em LRU
+
+O `ProgressManager` continua operando sobre o mesmo dicionário em memória
+(`{"users": {...}, "created_at": ..., "last_updated": ...}`); o backend
+decide como persistir. Cada chamada de `save` informa quais usuários mudaram
+(e, opcionalmente, quais eventos ocorreram), permitindo que backends
+incrementais gravem apenas as linhas afetadas.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+try:
+    from .durable_io import GroupCommitWriter, atomic_write_text
+except ImportError:
+    # Fallback para importação fora do pacote (python projects/data_migration.py)
+    from durable_io import GroupCommitWriter, atomic_write_text
+
+logger = logging.getLogger(__name__)
+
+
+def empty_progress_data() -> dict:
+    """Retorna a estrutura inicial de dados de progresso."""
+    now = datetime.now().isoformat()
+    return {"users": {}, "created_at": now, "last_updated": now}
+
+
+def normalize_progress_data(data) -> dict:
+    """
+    Valida a estrutura básica dos dados de progresso carregados.
+
+    Args:
+        data: Dados decodificados do armazenamento.
+
+    Returns:
+        dict: Dados com a chave 'users' garantida como dicionário.
+    """
+    if not isinstance(data, dict):
+        logger.error("Dados de progresso não são um dicionário. Retornando dados vazios.")
+        return {"users": {}}
+
+    # Garantir que 'users' existe e é um dicionário
+    if "users" not in data:
+        logger.warning("Campo 'users' não encontrado nos dados de progresso. Inicializando vazio.")
+        data["users"] = {}
+    elif not isinstance(data["users"], dict):
+        logger.error("Campo 'users' não é um dicionário. Reinicializando.")
+        data["users"] = {}
+    return data
+
+
+class ProgressStorage(ABC):
+    """Interface abstrata para backends de persistência de progresso."""
+
+    @abstractmethod
+    def load(self) -> dict:
+        """
+        Carrega todos os dados de progresso.
+
+        Returns:
+            dict: Estrutura `{"users": {...}, ...}`. Nunca levanta exceção por dados corrompidos.
+        """
+        pass
+
+    @abstractmethod
+    def save(
+        self,
+        progress_data: dict,
+        user_ids: Optional[Iterable[str]] = None,
+        events: Optional[Dict[str, List[str]]] = None,
+    ) -> bool:
+        """
+        Persiste os dados de progresso.
+
+        Erros de gravação são registrados no log e não interrompem o chamador
+        (o estado em memória continua válido); quem precisa saber se os dados
+        chegaram ao disco, como as importações, consulta o valor de retorno.
+
+        Args:
+            progress_data (dict): Estrutura completa em memória.
+            user_ids (Iterable[str], optional): Usuários alterados desde a última gravação.
+                None indica que todos os usuários devem ser gravados.
+            events (dict, optional): Eventos ocorridos por usuário desde a última gravação
+                (ex.: `{"aluno": ["exercise_attempt"]}`). Backends podem ignorá-los.
+
+        Returns:
+            bool: True se todos os dados foram gravados.
+        """
+        pass
+
+    def bind_user_locks(self, user_lock: Callable[[str], threading.RLock]) -> None:
+        """
+        Recebe a função que devolve o lock de cada usuário (ver `ProgressManager._user_lock`).
+
+        Backends que gravam um usuário fora de `save` a usam para não serializar
+        um registro em alteração. A implementação padrão a ignora.
+        """
+        pass
+
+    def close(self) -> None:
+        """Libera recursos do backend (conexões, arquivos)."""
+        pass
+
+
+class JsonFileProgressStorage(ProgressStorage):
+    """
+    Backend de arquivo JSON único (`user_progress.json`).
+
+    O arquivo é sempre reescrito por inteiro, mas montado a partir de
+    fragmentos JSON já serializados por usuário: cada gravação serializa
+    apenas os usuários em `user_ids`, sem copiar a árvore de progresso. O
+    chamador (`ProgressManager`) garante, com os locks por usuário, que os
+    usuários informados não estão sendo alterados durante a serialização; o
+    lock interno protege apenas a troca de fragmentos (microssegundos).
+
+    A escrita é atômica (arquivo temporário + `fsync` + `os.replace`) e
+    gravações concorrentes compartilham um único `fsync` (`GroupCommitWriter`).
+    """
+
+    def __init__(self, progress_file: Path, fsync: bool = True):
+        """
+        Inicializa o backend e cria o arquivo se necessário.
+
+        Args:
+            progress_file (Path): Caminho do arquivo JSON de progresso.
+            fsync (bool): Se True, cada gravação só retorna após os dados estarem no disco.
+        """
+        self.progress_file = Path(progress_file)
+        self._lock = threading.Lock()  # Protege os fragmentos em memória
+        self._fragments: Dict[str, str] = {}  # Usuário -> '"id": {...}' já serializado
+        self._header: dict = {}  # Campos globais (created_at, last_updated, ...)
+        self._users_ref = None  # Dicionário 'users' ao qual os fragmentos correspondem
+        self._writer = GroupCommitWriter(self.progress_file, self._render, fsync=fsync, fsync_dir=fsync)
+        self._ensure_progress_file_exists()
+
+    def _ensure_progress_file_exists(self):
+        """Garante que o arquivo de progresso existe."""
+        try:
+            if not self.progress_file.exists():
+                atomic_write_text(self.progress_file, json.dumps(empty_progress_data(), ensure_ascii=False, indent=4))
+                logger.info(f"Arquivo de progresso criado em: {self.progress_file}")
+        except OSError as e:
+            logger.error(f"Erro ao criar arquivo de progresso: {e}", exc_info=True)
+
+    def load(self) -> dict:
+        """Carrega dados de progresso do arquivo JSON e prepara os fragmentos por usuário."""
+        if not self.progress_file.exists():
+            return {"users": {}}
+
+        try:
+            with open(self.progress_file, encoding="utf-8") as f:
+                data = json.load(f)
+            data = normalize_progress_data(data)
+        except json.JSONDecodeError:
+            logger.error(f"Erro ao decodificar JSON de '{self.progress_file}'", exc_info=True)
+            return {"users": {}}
+        except OSError as e:
+            logger.error(f"Erro de I/O ao ler '{self.progress_file}': {e}", exc_info=True)
+            return {"users": {}}
+
+        try:
+            self._replace_fragments(data)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Erro ao serializar progresso carregado: {e}", exc_info=True)
+        return data
+
+    @staticmethod
+    def _serialize_user(user_id: str, user_data) -> str:
+        """Serializa a entrada de um usuário (`"id": {...}`) com a indentação do arquivo."""
+        entry = f"{json.dumps(user_id, ensure_ascii=False)}: {json.dumps(user_data, ensure_ascii=False, indent=4)}"
+        return entry.replace("\n", "\n        ")
+
+    def _replace_fragments(self, progress_data: dict):
+        """Serializa todos os usuários e substitui os fragmentos em memória."""
+        users = progress_data.get("users", {})
+        fragments = {user_id: self._serialize_user(user_id, data) for user_id, data in list(users.items())}
+        header = {key: value for key, value in progress_data.items() if key != "users"}
+        with self._lock:
+            self._fragments = fragments
+            self._header = header
+            self._users_ref = users
+
+    def save(self, progress_data: dict, user_ids: Optional[Iterable[str]] = None, events=None) -> bool:
+        """Reserializa apenas os usuários alterados e reescreve o arquivo JSON.
+
+        Sem `user_ids` (ou se o dicionário de usuários foi substituído), todos
+        os usuários são serializados novamente.
+        """
+        users = progress_data.get("users", {})
+        try:
+            if user_ids is None or users is not self._users_ref:
+                self._replace_fragments(progress_data)
+            else:
+                changed = {
+                    user_id: self._serialize_user(user_id, users[user_id]) if user_id in users else None
+                    for user_id in user_ids
+                }
+                header = {key: value for key, value in progress_data.items() if key != "users"}
+                with self._lock:
+                    for user_id, fragment in changed.items():
+                        if fragment is None:
+                            self._fragments.pop(user_id, None)
+                        else:
+                            self._fragments[user_id] = fragment
+                    self._header = header
+            # Concorrentes que chegarem durante uma gravação são atendidos juntos pela seguinte
+            self._writer.commit()
+            logger.info(f"Progresso salvo em {self.progress_file}")
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Erro ao salvar progresso: {e}", exc_info=True)
+            return False
+
+    def _render(self) -> bytes:
+        """Monta o conteúdo do arquivo a partir dos fragmentos atuais (chamado pelo `GroupCommitWriter`)."""
+        with self._lock:
+            fragments = list(self._fragments.values())
+            header = self._header
+        return _assemble_progress_json(fragments, header).encode("utf-8")
+
+
+def _assemble_progress_json(user_fragments: List[str], header: dict) -> str:
+    """
+    Monta o conteúdo de `user_progress.json` a partir dos fragmentos por usuário.
+
+    O resultado é idêntico a `json.dumps(data, indent=4, ensure_ascii=False)`
+    com a chave 'users' em primeiro lugar.
+    """
+    if user_fragments:
+        users_block = "{\n" + ",\n".join("        " + fragment for fragment in user_fragments) + "\n    }"
+    else:
+        users_block = "{}"
+    parts = ['    "users": ' + users_block]
+    for key, value in header.items():
+        serialized = json.dumps(value, ensure_ascii=False, indent=4).replace("\n", "\n    ")
+        parts.append(f"    {json.dumps(key, ensure_ascii=False)}: {serialized}")
+    return "{\n" + ",\n".join(parts) + "\n}"
+
+
+# Colunas conhecidas de cada tabela; campos fora destas listas vão para a coluna JSON 'extra'
+_USER_FIELDS = ("total_lessons_completed", "total_exercises_completed", "achievement_stats", "created_at")
+_COURSE_FIELDS = ("started_at", "last_accessed", "completed")
+_LESSON_FIELDS = ("completed", "completed_at", "times_viewed")
+_EXERCISE_FIELDS = (
+    "completed",
+    "completed_at",
+    "attempts",
+    "successful_attempts",
+    "failed_attempts",
+    "first_attempt_success",
+    "last_attempt_at",
+)
+_BOOLEAN_FIELDS = {"completed", "first_attempt_success"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    total_lessons_completed INTEGER,
+    total_exercises_completed INTEGER,
+    achievement_stats TEXT,
+    created_at TEXT,
+    extra TEXT
+);
+CREATE TABLE IF NOT EXISTS course_progress (
+    user_id TEXT NOT NULL,
+    course_id TEXT NOT NULL,
+    started_at TEXT,
+    last_accessed TEXT,
+    completed INTEGER,
+    extra TEXT,
+    PRIMARY KEY (user_id, course_id)
+);
+CREATE TABLE IF NOT EXISTS lesson_completions (
+    user_id TEXT NOT NULL,
+    course_id TEXT NOT NULL,
+    lesson_id TEXT NOT NULL,
+    completed INTEGER,
+    completed_at TEXT,
+    times_viewed INTEGER,
+    extra TEXT,
+    PRIMARY KEY (user_id, course_id, lesson_id)
+);
+CREATE TABLE IF NOT EXISTS exercise_attempts (
+    user_id TEXT NOT NULL,
+    course_id TEXT NOT NULL,
+    exercise_id TEXT NOT NULL,
+    completed INTEGER,
+    completed_at TEXT,
+    attempts INTEGER,
+    successful_attempts INTEGER,
+    failed_attempts INTEGER,
+    first_attempt_success INTEGER,
+    last_attempt_at TEXT,
+    extra TEXT,
+    PRIMARY KEY (user_id, course_id, exercise_id)
+);
+CREATE TABLE IF NOT EXISTS achievements (
+    user_id TEXT NOT NULL,
+    achievement_id TEXT NOT NULL,
+    unlocked_at TEXT,
+    extra TEXT,
+    PRIMARY KEY (user_id, achievement_id)
+);
+"""
+
+# Tabela -> colunas de chave e de valor (na ordem do INSERT)
+_TABLES = {
+    "users": (("user_id",), _USER_FIELDS + ("extra",)),
+    "course_progress": (("user_id", "course_id"), _COURSE_FIELDS + ("extra",)),
+    "lesson_completions": (("user_id", "course_id", "lesson_id"), _LESSON_FIELDS + ("extra",)),
+    "exercise_attempts": (("user_id", "course_id", "exercise_id"), _EXERCISE_FIELDS + ("extra",)),
+    "achievements": (("user_id", "achievement_id"), ("unlocked_at", "extra")),
+}
+
+
+def _to_db(field: str, value):
+    """Converte um valor do dicionário de progresso para uma coluna SQLite."""
+    if value is None:
+        return None
+    if field in _BOOLEAN_FIELDS:
+        return 1 if value else 0
+    if field == "achievement_stats":
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _from_db(field: str, value):
+    """Converte uma coluna SQLite de volta para o valor do dicionário de progresso."""
+    if value is None:
+        return None
+    if field in _BOOLEAN_FIELDS:
+        return bool(value)
+    if field == "achievement_stats":
+        return json.loads(value)
+    return value
+
+
+def _extra(record: dict, known_fields: Iterable[str]) -> Optional[str]:
+    """Serializa campos não mapeados em colunas (preserva dados desconhecidos)."""
+    known = set(known_fields)
+    extra = {k: v for k, v in record.items() if k not in known}
+    return json.dumps(extra, ensure_ascii=False, sort_keys=True) if extra else None
+
+
+def _row(record: dict, fields: Tuple[str, ...], nested_keys: Iterable[str] = ()) -> tuple:
+    """Monta os valores de colunas (incluindo 'extra') de um registro."""
+    values = tuple(_to_db(field, record.get(field)) for field in fields)
+    return values + (_extra(record, tuple(fields) + tuple(nested_keys)),)
+
+
+class SqliteProgressStorage(ProgressStorage):
+    """
+    Backend SQLite (modo WAL) com tabelas para usuários, progresso por curso,
+    lições completadas, tentativas de exercícios e conquistas.
+
+    Para cada usuário alterado, as linhas são comparadas com as últimas
+    gravadas e apenas as inseridas, modificadas ou removidas são escritas,
+    em uma única transação. Leituras e escritas usam uma conexão compartilhada
+    protegida por lock.
+    """
+
+    def __init__(self, db_path: Path):
+        """
+        Abre (ou cria) o banco e o esquema.
+
+        Args:
+            db_path (Path): Caminho do arquivo SQLite.
+        """
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # Últimas linhas gravadas por usuário: tabela -> {chave: valores}
+        self._persisted_rows: Dict[str, Dict[str, Dict[tuple, tuple]]] = {}
+        logger.info(f"SqliteProgressStorage inicializado em: {self.db_path}")
+
+    @staticmethod
+    def _user_rows(user_id: str, user_data: dict) -> Dict[str, Dict[tuple, tuple]]:
+        """Converte o progresso de um usuário em linhas por tabela ({chave: valores})."""
+        rows: Dict[str, Dict[tuple, tuple]] = {table: {} for table in _TABLES}
+        rows["users"][(user_id,)] = _row(user_data, _USER_FIELDS, ("courses", "achievements"))
+
+        courses = user_data.get("courses", {})
+        if isinstance(courses, dict):
+            for course_id, course in courses.items():
+                if not isinstance(course, dict):
+                    continue
+                rows["course_progress"][(user_id, course_id)] = _row(course, _COURSE_FIELDS, ("lessons", "exercises"))
+                for lesson_id, lesson in (course.get("lessons") or {}).items():
+                    if isinstance(lesson, dict):
+                        rows["lesson_completions"][(user_id, course_id, lesson_id)] = _row(lesson, _LESSON_FIELDS)
+                for exercise_id, exercise in (course.get("exercises") or {}).items():
+                    if isinstance(exercise, dict):
+                        rows["exercise_attempts"][(user_id, course_id, exercise_id)] = _row(exercise, _EXERCISE_FIELDS)
+
+        achievements = user_data.get("achievements", [])
+        if isinstance(achievements, list):
+            for ach in achievements:
+                if isinstance(ach, dict) and "id" in ach:
+                    rows["achievements"][(user_id, str(ach["id"]))] = _row(ach, ("unlocked_at",), ("id",))
+        return rows
+
+    def load(self) -> dict:
+        """Carrega todos os usuários do banco para a estrutura em memória."""
+        data = empty_progress_data()
+        try:
+            with self._lock:
+                meta = dict(self._conn.execute("SELECT key, value FROM meta").fetchall())
+                fetched = {
+                    table: self._conn.execute(
+                        f"SELECT {', '.join(keys + values)} FROM {table} ORDER BY rowid"
+                    ).fetchall()
+                    for table, (keys, values) in _TABLES.items()
+                }
+        except sqlite3.Error as e:
+            logger.error(f"Erro ao ler progresso de '{self.db_path}': {e}", exc_info=True)
+            return {"users": {}}
+
+        data.update({k: v for k, v in meta.items() if k in ("created_at", "last_updated")})
+        users = data["users"]
+        self._persisted_rows = {}
+
+        def record_from(fields, values):
+            # Colunas NULL são omitidas: os chamadores usam .get(campo, padrão) para campos ausentes
+            record = {field: _from_db(field, value) for field, value in zip(fields, values[:-1]) if value is not None}
+            if values[-1]:
+                record.update(json.loads(values[-1]))
+            return record
+
+        for table, (keys, value_columns) in _TABLES.items():
+            fields = value_columns[:-1]
+            for row in fetched[table]:
+                key, values = tuple(row[: len(keys)]), tuple(row[len(keys) :])
+                user_id = key[0]
+                self._persisted_rows.setdefault(user_id, {t: {} for t in _TABLES})[table][key] = values
+                record = record_from(fields, values)
+
+                if table == "users":
+                    users[user_id] = {"courses": {}, "achievements": [], **record}
+                    continue
+                user = users.setdefault(user_id, {"courses": {}, "achievements": []})
+                if table == "achievements":
+                    user["achievements"].append({"id": key[1], **record})
+                    continue
+                course = user["courses"].setdefault(key[1], {"lessons": {}, "exercises": {}})
+                if table == "course_progress":
+                    course.update(record)
+                elif table == "lesson_completions":
+                    course["lessons"][key[2]] = record
+                else:
+                    course["exercises"][key[2]] = record
+
+        logger.info(f"{len(users)} usuários carregados de {self.db_path}")
+        return data
+
+    def save(self, progress_data: dict, user_ids: Optional[Iterable[str]] = None, events=None) -> bool:
+        """Grava apenas as linhas alteradas dos usuários informados."""
+        users = progress_data.get("users", {})
+        targets = list(users.keys()) if user_ids is None else list(user_ids)
+
+        try:
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    changed = 0
+                    for user_id in targets:
+                        changed += self._save_user(user_id, users.get(user_id))
+                    for key in ("created_at", "last_updated"):
+                        if progress_data.get(key):
+                            self._conn.execute(
+                                "INSERT INTO meta (key, value) VALUES (?, ?) "
+                                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                                (key, progress_data[key]),
+                            )
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+            logger.debug(f"Progresso salvo em {self.db_path}: {changed} linhas alteradas")
+            return True
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.error(f"Erro ao salvar progresso em '{self.db_path}': {e}", exc_info=True)
+            return False
+
+    def _save_user(self, user_id: str, user_data) -> int:
+        """Aplica no banco a diferença entre as linhas atuais e as últimas gravadas de um usuário."""
+        if not isinstance(user_data, dict):
+            if user_data is not None:
+                logger.warning(f"Dados do usuário '{user_id}' não são um dicionário. Não gravados.")
+            return 0
+
+        new_rows = self._user_rows(user_id, user_data)
+        old_rows = self._persisted_rows.get(user_id, {table: {} for table in _TABLES})
+        changed = 0
+        for table, (keys, values) in _TABLES.items():
+            old, new = old_rows.get(table, {}), new_rows[table]
+            upserts = [key + row for key, row in new.items() if old.get(key) != row]
+            deletes = [key for key in old if key not in new]
+            if upserts:
+                columns = keys + values
+                updates = ", ".join(f"{col} = excluded.{col}" for col in values)
+                self._conn.executemany(
+                    f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                    f"ON CONFLICT({', '.join(keys)}) DO UPDATE SET {updates}",
+                    upserts,
+                )
+            if deletes:
+                where = " AND ".join(f"{col} = ?" for col in keys)
+                self._conn.executemany(f"DELETE FROM {table} WHERE {where}", deletes)
+            changed += len(upserts) + len(deletes)
+        self._persisted_rows[user_id] = new_rows
+        return changed
+
+    def import_json(self, json_path: Path) -> int:
+        """
+        Importa um arquivo `user_progress.json` existente para o banco.
+
+        Os dados passam por `data_migration.migrate_user_progress` para garantir
+        os campos de conquistas antes de serem gravados.
+
+        Args:
+            json_path (Path): Caminho do arquivo JSON de progresso.
+
+        Returns:
+            int: Número de usuários importados.
+
+        Raises:
+            OSError: Se os dados não puderem ser gravados no banco.
+        """
+        try:
+            from .data_migration import migrate_user_progress
+        except ImportError:
+            from data_migration import migrate_user_progress
+
+        with open(json_path, encoding="utf-8") as f:
+            data = migrate_user_progress(normalize_progress_data(json.load(f)))
+        data.setdefault("created_at", datetime.now().isoformat())
+        data.setdefault("last_updated", datetime.now().isoformat())
+        if not self.save(data):
+            raise OSError(f"Falha ao gravar o progresso importado de '{json_path}' em '{self.db_path}'")
+        logger.info(f"{len(data['users'])} usuários importados de {json_path} para {self.db_path}")
+        return len(data["users"])
+
+    def close(self) -> None:
+        """Fecha a conexão com o banco."""
+        with self._lock:
+            self._conn.close()
+
+
+class JournalProgressStorage(ProgressStorage):
+    """
+    Backend de diário (journal) somente-anexação com snapshot JSON.
+
+    Cada `save` anexa ao arquivo `user_progress.journal` uma linha JSON por
+    usuário alterado (eventos ocorridos e o estado atual do usuário), com um
+    único `fsync` para todo o lote. O custo de cada gravação passa a depender
+    apenas dos usuários alterados, não do tamanho total do progresso.
+
+    Uma thread de compactação grava periodicamente o estado completo em
+    `user_progress.json` (snapshot) e descarta o diário já incorporado. Na
+    inicialização o snapshot é carregado e as linhas posteriores do diário
+    são reaplicadas (a última versão de cada usuário prevalece); uma última
+    linha incompleta, deixada por uma queda durante a escrita, é descartada.
+
+    Formato de cada linha do diário:
+        {"seq": 42, "ts": "...", "user_id": "aluno", "events": ["exercise_attempt"], "user": {...}}
+    """
+
+    def __init__(self, snapshot_file: Path, journal_file: Path, compact_threshold: int = 1000, fsync: bool = True):
+        """
+        Carrega o estado persistido e inicia a thread de compactação.
+
+        Args:
+            snapshot_file (Path): Caminho do snapshot JSON (mesmo formato de `user_progress.json`).
+            journal_file (Path): Caminho do diário de eventos (JSON Lines).
+            compact_threshold (int): Número de registros no diário que dispara a compactação.
+            fsync (bool): Se True, força cada lote anexado para o disco.
+        """
+        self.snapshot_file = Path(snapshot_file)
+        self.journal_file = Path(journal_file)
+        # Diário em compactação: existe apenas entre a rotação e a gravação do snapshot
+        self.compacting_file = self.journal_file.with_name(self.journal_file.name + ".compacting")
+        self.compact_threshold = max(1, compact_threshold)
+        self.fsync = fsync
+
+        self._lock = threading.Lock()  # Protege o arquivo do diário e o contador de sequência
+        self._compact_lock = threading.Lock()  # Uma compactação por vez
+        self.user_lock: Optional[Callable[[str], threading.RLock]] = None
+        self._seq = 0
+        self._records_since_compaction = 0
+        self._journal = None
+        self._progress_data: Optional[dict] = None  # Estado mais recente recebido em save()
+        self._compact_requested = threading.Event()
+        self._closed = False
+        self._compactor = threading.Thread(target=self._compact_loop, name="progress-compactor", daemon=True)
+        self._compactor.start()
+
+    def load(self) -> dict:
+        """Carrega o snapshot e reaplica o diário (inclusive um diário em compactação interrompida)."""
+        with self._lock:
+            data = self._load_snapshot()
+            snapshot_seq = data.pop("journal_seq", 0)
+            self._seq = snapshot_seq if isinstance(snapshot_seq, int) else 0
+
+            replayed = 0
+            for path in (self.compacting_file, self.journal_file):
+                for record in self._read_journal(path):
+                    seq = record.get("seq", 0)
+                    if seq <= snapshot_seq:
+                        continue
+                    user_data = record.get("user")
+                    if user_data is None:
+                        data["users"].pop(record["user_id"], None)
+                    else:
+                        data["users"][record["user_id"]] = user_data
+                    if record.get("ts"):
+                        data["last_updated"] = record["ts"]
+                    self._seq = max(self._seq, seq)
+                    replayed += 1
+
+            self._records_since_compaction = replayed
+            self._progress_data = data
+            self._open_journal()
+
+        logger.info(
+            f"JournalProgressStorage: {len(data['users'])} usuários carregados de {self.snapshot_file} "
+            f"({replayed} registros reaplicados do diário)"
+        )
+        return data
+
+    def _load_snapshot(self) -> dict:
+        """Lê o snapshot JSON; ausente ou corrompido resulta em dados vazios."""
+        if not self.snapshot_file.exists():
+            return empty_progress_data()
+        try:
+            with open(self.snapshot_file, encoding="utf-8") as f:
+                return normalize_progress_data(json.load(f))
+        except json.JSONDecodeError:
+            logger.error(f"Erro ao decodificar JSON de '{self.snapshot_file}'", exc_info=True)
+        except OSError as e:
+            logger.error(f"Erro de I/O ao ler '{self.snapshot_file}': {e}", exc_info=True)
+        return {"users": {}}
+
+    def _read_journal(self, path: Path) -> List[dict]:
+        """
+        Lê os registros válidos de um arquivo de diário.
+
+        Uma última linha incompleta (queda durante a escrita) é removida do
+        arquivo, para que anexações futuras comecem em uma linha nova.
+        """
+        if not path.exists():
+            return []
+
+        records = []
+        valid_size = 0
+        with open(path, "rb") as f:
+            lines = f.readlines()
+        for position, line in enumerate(lines):
+            is_last = position == len(lines) - 1
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("linha sem terminador")
+                record = json.loads(line.decode("utf-8"))
+                if not isinstance(record, dict) or not isinstance(record.get("user_id"), str):
+                    raise ValueError("registro sem user_id")
+            except ValueError as e:  # inclui JSONDecodeError e UnicodeDecodeError
+                if is_last:
+                    logger.warning(f"Diário '{path}': última linha incompleta descartada ({e}).")
+                    break
+                logger.error(f"Diário '{path}': linha {position + 1} inválida ignorada ({e}).")
+                valid_size += len(line)
+                continue
+            records.append(record)
+            valid_size += len(line)
+
+        if valid_size < path.stat().st_size:
+            with open(path, "r+b") as f:
+                f.truncate(valid_size)
+        return records
+
+    def _open_journal(self):
+        """Abre o diário para anexação (chamado com `_lock`)."""
+        self._journal = open(self.journal_file, "ab")
+
+    def save(self, progress_data: dict, user_ids: Optional[Iterable[str]] = None, events=None) -> bool:
+        """Anexa um registro por usuário alterado; sem `user_ids`, grava um snapshot completo."""
+        self._progress_data = progress_data
+        if user_ids is None:
+            return self.compact()
+
+        users = progress_data.get("users", {})
+        timestamp = progress_data.get("last_updated") or datetime.now().isoformat()
+        events = events or {}
+        try:
+            with self._lock:
+                if self._journal is None:
+                    self._open_journal()
+                lines = []
+                for user_id in user_ids:
+                    self._seq += 1
+                    record = {
+                        "seq": self._seq,
+                        "ts": timestamp,
+                        "user_id": user_id,
+                        "events": list(events.get(user_id, [])),
+                        "user": users.get(user_id),
+                    }
+                    lines.append(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+                # Um único write + fsync para o lote inteiro (group commit)
+                self._journal.write("".join(lines).encode("utf-8"))
+                self._journal.flush()
+                if self.fsync:
+                    os.fsync(self._journal.fileno())
+                self._records_since_compaction += len(lines)
+                if self._records_since_compaction >= self.compact_threshold:
+                    self._compact_requested.set()
+            logger.debug(f"Diário de progresso: {len(lines)} registros anexados")
+            return True
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Erro ao anexar ao diário '{self.journal_file}': {e}", exc_info=True)
+            return False
+
+    def bind_user_locks(self, user_lock: Callable[[str], threading.RLock]) -> None:
+        """Usa os locks por usuário ao copiar o estado para o snapshot (ver `compact`)."""
+        self.user_lock = user_lock
+
+    def compact(self) -> bool:
+        """
+        Incorpora o diário ao snapshot.
+
+        Sob `_lock` apenas o diário é rotacionado (anexações seguintes vão para
+        um diário novo) e a lista de usuários é fixada. Cada usuário é então
+        copiado com o seu próprio lock e a cópia é serializada e gravada fora
+        de qualquer lock, de forma atômica; só então o diário rotacionado é
+        removido. Um usuário alterado depois da rotação pode entrar no snapshot
+        já com a alteração: o registro correspondente no diário novo tem o
+        estado completo do usuário e, reaplicado, produz o mesmo resultado.
+
+        Returns:
+            bool: True se o snapshot foi gravado.
+        """
+        with self._compact_lock:
+            with self._lock:
+                if self._progress_data is None:
+                    return False
+                try:
+                    self._rotate_journal()
+                except OSError as e:
+                    logger.error(f"Erro ao rotacionar o diário '{self.journal_file}': {e}", exc_info=True)
+                    return False
+                self._records_since_compaction = 0
+                journal_seq = self._seq
+                progress_data = self._progress_data
+                users = progress_data.get("users", {})
+                user_ids = list(users.copy())  # dict.copy() é atômica sob o GIL
+
+            snapshot = {key: value for key, value in progress_data.items() if key != "users"}
+            snapshot["users"] = {}
+            for user_id in user_ids:
+                user_data = self._copy_user(users, user_id)
+                if user_data is not None:
+                    snapshot["users"][user_id] = user_data
+            snapshot["journal_seq"] = journal_seq
+
+            try:
+                payload = json.dumps(snapshot, ensure_ascii=False, indent=4)
+                atomic_write_text(self.snapshot_file, payload, fsync=self.fsync, fsync_dir=self.fsync)
+                self.compacting_file.unlink()
+            except (OSError, TypeError, ValueError) as e:
+                # O diário rotacionado é mantido e reaplicado na próxima inicialização
+                logger.error(f"Erro ao gravar snapshot '{self.snapshot_file}': {e}", exc_info=True)
+                return False
+        logger.info(f"Diário de progresso compactado em {self.snapshot_file}")
+        return True
+
+    def _copy_user(self, users: dict, user_id: str) -> Optional[dict]:
+        """Cópia profunda do progresso de um usuário, feita com o lock do usuário (se houver)."""
+        with self.user_lock(user_id) if self.user_lock else nullcontext():
+            user_data = users.get(user_id)
+            return copy.deepcopy(user_data) if user_data is not None else None
+
+    def _rotate_journal(self):
+        """Move o diário atual para o arquivo de compactação e abre um diário vazio (chamado com `_lock`)."""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if self.journal_file.exists():
+            if self.compacting_file.exists():
+                # Compactação anterior falhou: acumula no diário já rotacionado
+                with open(self.compacting_file, "ab") as dst, open(self.journal_file, "rb") as src:
+                    dst.write(src.read())
+                    dst.flush()
+                    os.fsync(dst.fileno())
+                self.journal_file.unlink()
+            else:
+                os.replace(self.journal_file, self.compacting_file)
+        elif not self.compacting_file.exists():
+            self.compacting_file.touch()
+        self._open_journal()
+
+    def _compact_loop(self):
+        """Laço da thread de compactação."""
+        while True:
+            self._compact_requested.wait()
+            self._compact_requested.clear()
+            if self._closed:
+                return
+            self.compact()
+
+    def close(self) -> None:
+        """Encerra a thread de compactação, compacta o diário e fecha o arquivo."""
+        if self._closed:
+            return
+        self._closed = True
+        self._compact_requested.set()
+        self._compactor.join(timeout=5)
+        self.compact()
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+
+class UserRecord(dict):
+    """Dicionário de progresso de um usuário que aceita referências fracas (weakref)."""
+
+    __slots__ = ("__weakref__",)
+
+
+class ShardedUserMap(MutableMapping):
+    """
+    Mapeamento `user_id -> progresso` carregado sob demanda a partir dos shards.
+
+    Mantém em memória no máximo `max_cached_users` usuários, removendo o menos
+    recentemente acessado (LRU). Um usuário removido com alterações ainda não
+    gravadas é gravado depois de liberado o lock do mapeamento, com o lock do
+    próprio usuário; se esse lock estiver ocupado, o registro fica em
+    `_unsaved` até o próximo `save`. Enquanto alguma parte do código ainda
+    referenciar o registro removido, o mesmo objeto é devolvido no próximo
+    acesso (via `WeakValueDictionary`), de modo que nenhuma alteração feita
+    nele se perde.
+    """
+
+    def __init__(self, storage: "ShardedProgressStorage", max_cached_users: int):
+        self._storage = storage
+        self.max_cached_users = max(1, max_cached_users)
+        self._cache: "OrderedDict[str, UserRecord]" = OrderedDict()
+        self._evicted: "weakref.WeakValueDictionary[str, UserRecord]" = weakref.WeakValueDictionary()
+        self._unsaved: Dict[str, UserRecord] = {}  # Removidos do LRU, ainda não conferidos/gravados
+        self._hashes: Dict[str, int] = {}  # Hash do último conteúdo gravado por usuário
+        self._lock = threading.RLock()
+        self.loads = 0
+        self.evictions = 0
+
+    def __getitem__(self, user_id: str) -> UserRecord:
+        with self._lock:
+            record = self._cache.get(user_id)
+            if record is not None:
+                self._cache.move_to_end(user_id)
+                return record
+
+            record = self._unsaved.pop(user_id, None)
+            if record is None:
+                record = self._evicted.pop(user_id, None)
+            if record is None:
+                loaded = self._storage._read_user(user_id)
+                if loaded is None:
+                    raise KeyError(user_id)
+                record = UserRecord(loaded)
+                self._hashes[user_id] = hash(_dump_user(record))
+                self.loads += 1
+            evicted = self._admit(user_id, record)
+        self.persist_evicted(evicted)
+        return record
+
+    def __setitem__(self, user_id: str, user_data: dict):
+        with self._lock:
+            record = user_data if isinstance(user_data, UserRecord) else UserRecord(user_data)
+            self._unsaved.pop(user_id, None)
+            self._evicted.pop(user_id, None)
+            self._hashes.pop(user_id, None)  # Ainda não gravado
+            self._cache.pop(user_id, None)
+            evicted = self._admit(user_id, record)
+        self.persist_evicted(evicted)
+
+    def __delitem__(self, user_id: str):
+        with self._lock:
+            in_memory = self._cache.pop(user_id, None) is not None
+            in_memory = self._unsaved.pop(user_id, None) is not None or in_memory
+            in_memory = self._evicted.pop(user_id, None) is not None or in_memory
+            self._hashes.pop(user_id, None)
+            if not self._storage._delete_user(user_id) and not in_memory:
+                raise KeyError(user_id)
+
+    def __iter__(self):
+        with self._lock:
+            user_ids = set(self._cache) | set(self._unsaved) | set(self._evicted.keys())
+        return iter(user_ids | set(self._storage._stored_user_ids()))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def peek(self, user_id: str) -> Optional[UserRecord]:
+        """Retorna o registro se estiver em memória, sem carregá-lo do disco nem alterar a ordem LRU."""
+        with self._lock:
+            for records in (self._cache, self._unsaved, self._evicted):
+                record = records.get(user_id)
+                if record is not None:
+                    return record
+            return None
+
+    def cached_user_ids(self) -> List[str]:
+        """Retorna os usuários atualmente em memória."""
+        with self._lock:
+            return list(dict.fromkeys([*self._cache, *self._unsaved, *self._evicted.keys()]))
+
+    def mark_persisted(self, user_id: str, serialized: str):
+        """Registra o conteúdo gravado de um usuário (usado para detectar alterações na remoção)."""
+        with self._lock:
+            self._hashes[user_id] = hash(serialized)
+            record = self._unsaved.pop(user_id, None)
+            if record is not None:
+                self._evicted[user_id] = record
+
+    def persist_evicted(self, evicted: Optional[List[Tuple[str, UserRecord]]] = None):
+        """
+        Grava os registros removidos do LRU que têm alterações pendentes (chamado sem `_lock`).
+
+        Cada registro é serializado e gravado com o lock do usuário. Se o lock
+        estiver ocupado, o registro está em uso e continua em `_unsaved`, para
+        o próximo `save` desse usuário.
+
+        Args:
+            evicted (list, optional): Pares `(user_id, registro)` a conferir. Padrão: todos de `_unsaved`.
+        """
+        if evicted is None:
+            with self._lock:
+                evicted = list(self._unsaved.items())
+        for user_id, record in evicted:
+            lock = self._storage.user_lock(user_id) if self._storage.user_lock else None
+            if lock is not None and not lock.acquire(blocking=False):
+                continue
+            try:
+                serialized = _dump_user(record)
+                with self._lock:
+                    changed = self._hashes.get(user_id) != hash(serialized)
+                if changed:
+                    self._storage._write_user(user_id, serialized)
+                self.mark_persisted(user_id, serialized)
+            except (OSError, TypeError, ValueError) as e:
+                logger.error(f"Erro ao salvar progresso do usuário '{user_id}': {e}", exc_info=True)
+            finally:
+                if lock is not None:
+                    lock.release()
+
+    def _admit(self, user_id: str, record: UserRecord) -> List[Tuple[str, UserRecord]]:
+        """
+        Insere um registro no LRU e move os excedentes para `_unsaved` (chamado com `_lock`).
+
+        Returns:
+            list: Pares `(user_id, registro)` removidos, a conferir com `persist_evicted`.
+        """
+        self._cache[user_id] = record
+        evicted = []
+        while len(self._cache) > self.max_cached_users:
+            evicted_id, evicted_record = self._cache.popitem(last=False)
+            self._unsaved[evicted_id] = evicted_record
+            evicted.append((evicted_id, evicted_record))
+            self.evictions += 1
+        return evicted
+
+
+def _dump_user(user_data: dict) -> str:
+    """Serializa o progresso de um usuário para um arquivo de shard."""
+    return json.dumps(user_data, ensure_ascii=False, indent=4)
+
+
+class ShardedProgressStorage(ProgressStorage):
+    """
+    Backend com um arquivo JSON por usuário: `<progress_dir>/<shard>/<user_id>.json`.
+
+    O shard são os dois primeiros dígitos hexadecimais do SHA-1 do ID, o que
+    distribui os arquivos em até 256 diretórios. Os usuários são carregados no
+    primeiro acesso e mantidos em um LRU (`ShardedUserMap`); cada gravação
+    reescreve, de forma atômica, apenas os arquivos dos usuários alterados.
+    As datas globais (`created_at`, `last_updated`) ficam em `<progress_dir>/meta.json`;
+    como `last_updated` muda a cada gravação, o arquivo é regravado no máximo a
+    cada `meta_interval` segundos (e sempre em `close()` e em gravações completas).
+    """
+
+    def __init__(
+        self, progress_dir: Path, max_cached_users: int = 1000, fsync: bool = True, meta_interval: float = 60.0
+    ):
+        """
+        Inicializa o backend e cria o diretório se necessário.
+
+        Args:
+            progress_dir (Path): Diretório raiz dos shards.
+            max_cached_users (int): Número máximo de usuários mantidos em memória.
+            fsync (bool): Se True, força cada arquivo gravado para o disco.
+            meta_interval (float): Intervalo mínimo, em segundos, entre gravações de `meta.json`
+                motivadas apenas pela mudança de `last_updated`.
+        """
+        self.progress_dir = Path(progress_dir)
+        self.fsync = fsync
+        self.meta_file = self.progress_dir / "meta.json"
+        self.max_cached_users = max_cached_users
+        self.meta_interval = meta_interval
+        self._lock = threading.Lock()  # Serializa gravações de arquivos
+        self._users: Optional[ShardedUserMap] = None
+        self._meta: dict = {}
+        self._meta_dirty = False  # `_meta` tem alterações ainda não gravadas em meta.json
+        self._meta_saved_at: Optional[float] = None  # time.monotonic() da última gravação de meta.json
+        self.user_lock: Optional[Callable[[str], threading.RLock]] = None
+        self.progress_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _file_name(user_id: str) -> str:
+        """Converte o ID do usuário em um nome de arquivo seguro (reversível)."""
+        name = quote(user_id, safe="")
+        if name.startswith("."):
+            name = "%2E" + name[1:]
+        return name + ".json"
+
+    def _user_file(self, user_id: str) -> Path:
+        """Retorna o caminho do arquivo de um usuário."""
+        shard = hashlib.sha1(user_id.encode("utf-8")).hexdigest()[:2]
+        return self.progress_dir / shard / self._file_name(user_id)
+
+    def bind_user_locks(self, user_lock: Callable[[str], threading.RLock]) -> None:
+        """Usa os locks por usuário ao gravar registros removidos do LRU (ver `ShardedUserMap`)."""
+        self.user_lock = user_lock
+
+    def _read_user(self, user_id: str) -> Optional[dict]:
+        """Lê o progresso de um usuário do seu shard; None se ausente ou corrompido."""
+        user_file = self._user_file(user_id)
+        try:
+            with open(user_file, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError:
+            logger.error(f"Erro ao decodificar JSON de '{user_file}'", exc_info=True)
+            return None
+        except OSError as e:
+            logger.error(f"Erro de I/O ao ler '{user_file}': {e}", exc_info=True)
+            return None
+        if not isinstance(data, dict):
+            logger.error(f"Progresso do usuário '{user_id}' em '{user_file}' não é um dicionário.")
+            return None
+        return data
+
+    def _write_user(self, user_id: str, serialized: str):
+        """Grava o arquivo de um usuário de forma atômica."""
+        user_file = self._user_file(user_id)
+        with self._lock:
+            user_file.parent.mkdir(exist_ok=True)
+            atomic_write_text(user_file, serialized, fsync=self.fsync)
+
+    def _delete_user(self, user_id: str) -> bool:
+        """Remove o arquivo de um usuário. Retorna True se existia."""
+        with self._lock:
+            try:
+                self._user_file(user_id).unlink()
+                return True
+            except FileNotFoundError:
+                return False
+
+    def _stored_user_ids(self) -> List[str]:
+        """Lista os IDs de todos os usuários gravados em disco."""
+        return [unquote(path.name[: -len(".json")]) for path in self.progress_dir.glob("*/*.json")]
+
+    def load(self) -> dict:
+        """Retorna os metadados e um mapeamento de usuários carregado sob demanda."""
+        self._meta = {}
+        self._meta_dirty = False
+        if self.meta_file.exists():
+            try:
+                with open(self.meta_file, encoding="utf-8") as f:
+                    meta = json.load(f)
+                if isinstance(meta, dict):
+                    self._meta = meta
+            except (OSError, json.JSONDecodeError) as e:
+                logger.error(f"Erro ao ler metadados de progresso '{self.meta_file}': {e}", exc_info=True)
+
+        now = datetime.now().isoformat()
+        self._users = ShardedUserMap(self, self.max_cached_users)
+        logger.info(f"ShardedProgressStorage inicializado em: {self.progress_dir}")
+        return {
+            "users": self._users,
+            "created_at": self._meta.get("created_at", now),
+            "last_updated": self._meta.get("last_updated", now),
+        }
+
+    def save(self, progress_data: dict, user_ids: Optional[Iterable[str]] = None, events=None) -> bool:
+        """Grava os arquivos dos usuários alterados; sem `user_ids`, grava todos os usuários em memória."""
+        users = progress_data.get("users", {})
+        full_save = user_ids is None
+        if full_save:
+            user_ids = users.cached_user_ids() if isinstance(users, ShardedUserMap) else list(users)
+
+        written = failed = 0
+        for user_id in user_ids:
+            user_data = users.peek(user_id) if isinstance(users, ShardedUserMap) else users.get(user_id)
+            if user_data is None:
+                continue
+            try:
+                serialized = _dump_user(user_data)
+                self._write_user(user_id, serialized)
+            except (OSError, TypeError, ValueError) as e:
+                logger.error(f"Erro ao salvar progresso do usuário '{user_id}': {e}", exc_info=True)
+                failed += 1
+                continue
+            if isinstance(users, ShardedUserMap):
+                users.mark_persisted(user_id, serialized)
+            written += 1
+
+        meta = {
+            "created_at": progress_data.get("created_at", self._meta.get("created_at")),
+            "last_updated": progress_data.get("last_updated"),
+        }
+        with self._lock:
+            created_changed = meta["created_at"] != self._meta.get("created_at")
+            if meta != self._meta:
+                self._meta = meta
+                self._meta_dirty = True
+        meta_saved = self._save_meta(force=full_save or created_changed)
+        logger.debug(f"Progresso salvo em {self.progress_dir}: {written} usuários")
+        return failed == 0 and meta_saved
+
+    def _save_meta(self, force: bool = True) -> bool:
+        """
+        Grava `meta.json` com as datas globais, se houver alterações pendentes.
+
+        Args:
+            force (bool): Se False, só grava se `meta_interval` segundos se passaram desde
+                a última gravação (a primeira gravação nunca é adiada).
+
+        Returns:
+            bool: False apenas se a gravação foi tentada e falhou.
+        """
+        with self._lock:
+            if not self._meta_dirty:
+                return True
+            now = time.monotonic()
+            if not force and self._meta_saved_at is not None and now - self._meta_saved_at < self.meta_interval:
+                return True
+            try:
+                atomic_write_text(self.meta_file, json.dumps(self._meta, ensure_ascii=False, indent=4), fsync=self.fsync)
+            except OSError as e:
+                logger.error(f"Erro ao salvar metadados de progresso: {e}", exc_info=True)
+                return False
+            self._meta_dirty = False
+            self._meta_saved_at = now
+            return True
+
+    def import_json(self, json_path: Path) -> int:
+        """
+        Converte um arquivo `user_progress.json` existente para o layout por usuário.
+
+        Os dados passam por `data_migration.migrate_user_progress` antes da gravação.
+
+        Args:
+            json_path (Path): Caminho do arquivo JSON de progresso.
+
+        Returns:
+            int: Número de usuários convertidos.
+
+        Raises:
+            OSError: Se algum usuário (ou `meta.json`) não puder ser gravado.
+        """
+        try:
+            from .data_migration import migrate_user_progress
+        except ImportError:
+            from data_migration import migrate_user_progress
+
+        with open(json_path, encoding="utf-8") as f:
+            data = migrate_user_progress(normalize_progress_data(json.load(f)))
+        data.setdefault("created_at", datetime.now().isoformat())
+        data.setdefault("last_updated", datetime.now().isoformat())
+        if not self.save(data):
+            raise OSError(f"Falha ao gravar o progresso convertido de '{json_path}' em '{self.progress_dir}'")
+        logger.info(f"{len(data['users'])} usuários importados de {json_path} para {self.progress_dir}")
+        return len(data["users"])
+
+    def close(self) -> None:
+        """Grava os registros removidos do LRU ainda pendentes e os metadados globais."""
+        if self._users is not None:
+            self._users.persist_evicted()
+        self._save_meta()
+
+
+# Nomes aceitos em `create_progress_storage`
+STORAGE_BACKENDS: List[str] = ["json", "sqlite", "journal", "sharded"]
+
+
+def create_progress_storage(backend: str, data_dir: Path) -> ProgressStorage:
+    """
+    Cria o backend de armazenamento de progresso pelo nome.
+
+    Args:
+        backend (str): 'json' (padrão, `user_progress.json`), 'sqlite' (`user_progress.db`)
+            'journal' (`user_progress.json` como snapshot mais `user_progress.journal`)
+            ou 'sharded' (um arquivo por usuário em `progress/<shard>/`).
+        data_dir (Path): Diretório de dados.
+
+    Returns:
+        ProgressStorage: Instância do backend.
+
+    Raises:
+        ValueError: Se o backend não for suportado.
+    """
+    backend = (backend or "json").lower()
+    if backend == "json":
+        return JsonFileProgressStorage(Path(data_dir) / "user_progress.json")
+    if backend == "sqlite":
+        return SqliteProgressStorage(Path(data_dir) / "user_progress.db")
+    if backend == "journal":
+        return JournalProgressStorage(Path(data_dir) / "user_progress.json", Path(data_dir) / "user_progress.journal")
+    if backend == "sharded":
+        return ShardedProgressStorage(Path(data_dir) / "progress")
+    raise ValueError(f"Backend de progresso '{backend}' não suportado. Opções: {', '.join(STORAGE_BACKENDS)}")
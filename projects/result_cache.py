@@ -0,0 +1,190 @@
+"""
+Módulo de cache de resultados de verificação de exercícios.
+
+Alunos reenviam com frequência exatamente o mesmo código, e em sala de aula
+a mesma solução canônica é submetida centenas de vezes. Como o veredito de
+um exercício determinístico depende apenas do código do aluno e do conteúdo
+do exercício, ele pode ser reaproveitado sem nova execução.
+
+A chave é (ID do exercício, versão do conteúdo, SHA-256 do código
+normalizado). A versão do conteúdo é um hash do `test_code`, de modo que
+editar o exercício invalida os vereditos antigos. A memória é limitada por
+número de entradas (LRU) e por tempo de vida (TTL).
+
+Exercícios com testes não determinísticos (aleatoriedade, horário) devem
+declarar `"cache_results": false` no `exercises.json`.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 10000
+DEFAULT_TTL_SECONDS = 3600.0
+
+# Erros que dependem da carga do servidor, e não do código: nunca são reaproveitados
+TRANSIENT_ERROR_TYPES = frozenset({"TimeoutError", "WorkerCrashed", "SandboxBusy", "MemoryError"})
+
+ResultKey = Tuple[str, str, str]
+
+
+def normalize_code(code: str) -> str:
+    """
+    Normaliza o código do aluno para a comparação de submissões.
+
+    Unifica as quebras de linha e remove espaços em branco no fim do arquivo;
+    o restante é preservado, pois espaços no meio do código podem alterar a saída.
+
+    Args:
+        code (str): Código submetido.
+
+    Returns:
+        str: Código normalizado.
+    """
+    return code.replace("\r\n", "\n").replace("\r", "\n").rstrip()
+
+
+def content_version(exercise: Dict) -> str:
+    """
+    Calcula a versão do conteúdo de um exercício que determina o veredito.
+
+    Args:
+        exercise (dict): Dados do exercício.
+
+    Returns:
+        str: SHA-256 (abreviado) do `test_code` do exercício.
+    """
+    test_code = exercise.get("test_code") or ""
+    return hashlib.sha256(test_code.encode("utf-8")).hexdigest()[:16]
+
+
+def result_key(exercise: Dict, user_code: str, limits: Optional[Dict[str, int]] = None) -> ResultKey:
+    """
+    Monta a chave de cache de uma submissão.
+
+    Args:
+        exercise (dict): Dados do exercício.
+        user_code (str): Código submetido pelo aluno.
+        limits (dict, optional): Limites efetivos da execução (ver `execution_limits`);
+            alterá-los invalida os vereditos anteriores.
+
+    Returns:
+        tuple: (ID do exercício, versão do conteúdo, SHA-256 do código normalizado).
+    """
+    digest = hashlib.sha256(normalize_code(user_code).encode("utf-8")).hexdigest()
+    version = content_version(exercise)
+    if limits:
+        version += ":" + ",".join(f"{field}={value}" for field, value in sorted(limits.items()))
+    return (str(exercise.get("id")), version, digest)
+
+
+def is_cacheable_exercise(exercise: Dict) -> bool:
+    """Indica se o exercício permite reaproveitar vereditos (`cache_results`, padrão True)."""
+    return exercise.get("cache_results", True) is not False
+
+
+class ResultCache:
+    """
+    Cache LRU com TTL de vereditos de verificação de exercícios.
+
+    Os valores armazenados são dicionários com o veredito (success, output,
+    details); os chamadores recebem cópias rasas e continuam responsáveis por
+    registrar a tentativa do aluno.
+
+    Attributes:
+        max_entries (int): Número máximo de vereditos mantidos.
+        ttl (float): Tempo de vida de cada veredito, em segundos.
+        hits (int): Consultas atendidas pelo cache.
+        misses (int): Consultas sem veredito válido.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL_SECONDS, clock=time.monotonic):
+        """
+        Inicializa o cache.
+
+        Args:
+            max_entries (int): Número máximo de vereditos mantidos.
+            ttl (float): Tempo de vida de cada veredito, em segundos.
+            clock (Callable[[], float]): Relógio monotônico (substituível em testes).
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: "OrderedDict[ResultKey, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: ResultKey) -> Optional[Dict[str, Any]]:
+        """
+        Retorna o veredito armazenado para a chave, se ainda válido.
+
+        Args:
+            key (tuple): Chave gerada por `result_key`.
+
+        Returns:
+            dict | None: Cópia do veredito ou None.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, verdict = entry
+                if expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return dict(verdict)
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return None
+
+    def put(self, key: ResultKey, verdict: Dict[str, Any]):
+        """
+        Armazena um veredito.
+
+        Args:
+            key (tuple): Chave gerada por `result_key`.
+            verdict (dict): Veredito (success, output, details).
+        """
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, dict(verdict))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Esvazia o cache e zera os contadores."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.expirations = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas de uso do cache.
+
+        Returns:
+            dict: Acertos, faltas, taxa de acerto, remoções, expirações e entradas.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+            }
@@ -0,0 +1,691 @@
+"""
+Módulo de execução de código em um pool de processos pré-aquecidos.
+
+`code_executor.execute_code` roda o código do aluno com `exec()` na própria
+thread do Flask: `redirect_stdout` é global ao processo (saídas de
+requisições concorrentes se misturam) e um laço infinito prende a thread
+para sempre. Este módulo executa cada submissão em um processo trabalhador
+separado, criado antecipadamente e reutilizado entre execuções:
+
+- limite de tempo real (wall-clock): o trabalhador que excede o prazo é
+  encerrado e substituído;
+- limite de tempo de CPU e de memória por trabalhador via `resource`
+  (rlimits), quando disponível (Unix);
+- reciclagem do trabalhador após `max_jobs_per_worker` execuções, limitando
+  o acúmulo de estado entre submissões;
+- módulos pré-carregados (`preload_modules`): importados uma vez no processo
+  do forkserver, de onde os trabalhadores são bifurcados já com eles residentes
+  (copy-on-write); o `import numpy` de um exercício passa a custar uma consulta
+  a `sys.modules`.
+
+O isolamento é de recursos e de falhas, não de segurança: o código continua
+podendo acessar o sistema de arquivos e a rede do trabalhador.
+"""
+
+import atexit
+import importlib
+import importlib.util
+import logging
+import math
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Windows: sem rlimits
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+_SIGXCPU = getattr(signal, "SIGXCPU", None)
+
+# Limites padrão (sobrescritos pelas variáveis de ambiente SANDBOX_* em `get_sandbox_pool`)
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_CPU_TIME_LIMIT = 5
+DEFAULT_MEMORY_LIMIT_MB = 256
+DEFAULT_MAX_JOBS_PER_WORKER = 100
+DEFAULT_MAX_OUTPUT_BYTES = 256 * 1024
+# Módulos importados pelos exercícios dos cursos avançados; os ausentes no ambiente são ignorados
+DEFAULT_PRELOAD_MODULES = (
+    "numpy",
+    "pandas",
+    "sklearn",
+    "sqlalchemy",
+    "asyncio",
+    "sqlite3",
+    "csv",
+    "json",
+    "collections",
+    "functools",
+    "ast",
+)
+
+
+def _error_result(error_type: str, message: str) -> Dict:
+    """Monta um resultado de falha no formato de `code_executor.execute_code`."""
+    return {"returncode": 1, "stdout": "", "stderr": f"{error_type}: {message}", "error_type": error_type}
+
+
+def _cpu_seconds_used() -> float:
+    """Tempo de CPU (usuário + sistema) já consumido pelo processo atual."""
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _available_modules(modules: Iterable[str]) -> Tuple[str, ...]:
+    """Filtra os módulos que podem ser importados no ambiente atual, sem importá-los."""
+    available = []
+    for name in modules:
+        try:
+            found = importlib.util.find_spec(name) is not None
+        except (ImportError, ValueError):
+            found = False
+        if found:
+            available.append(name)
+        else:
+            logger.info(f"Sandbox: módulo '{name}' indisponível; não será pré-carregado.")
+    return tuple(available)
+
+
+def _preload(modules: Iterable[str]):
+    """Importa os módulos pré-carregados (já residentes quando bifurcado do forkserver)."""
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except Exception:  # Um módulo quebrado não impede o trabalhador de iniciar
+            pass
+
+
+def _address_space_bytes() -> int:
+    """Tamanho atual do espaço de endereçamento do processo (0 se indisponível)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _apply_memory_limit(memory_limit_mb: Optional[int], baseline: int = 0):
+    """
+    Limita o espaço de endereçamento do trabalhador (MemoryError ao exceder).
+
+    O limite é contado a partir de `baseline` (o espaço já ocupado após o
+    pré-aquecimento), para que os módulos pré-carregados não consumam a cota
+    do código do aluno.
+    """
+    if resource is None or not memory_limit_mb:
+        return
+    limit = baseline + memory_limit_mb * 1024 * 1024
+    try:
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except (ValueError, OSError) as e:
+        logger.warning(f"Sandbox: não foi possível aplicar o limite de memória: {e}")
+
+
+def _restore_memory_limit(saved: Optional[tuple]):
+    """Restaura o limite de memória do trabalhador após um job com limite próprio."""
+    if resource is None or saved is None:
+        return
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, saved)
+    except (ValueError, OSError) as e:
+        logger.warning(f"Sandbox: não foi possível restaurar o limite de memória: {e}")
+
+
+def _apply_cpu_limit(cpu_time_limit: Optional[int]):
+    """Permite mais `cpu_time_limit` segundos de CPU ao trabalhador (SIGXCPU ao exceder)."""
+    if resource is None or not cpu_time_limit:
+        return
+    soft = int(_cpu_seconds_used()) + int(cpu_time_limit) + 1
+    try:
+        _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    except (ValueError, OSError) as e:
+        logger.warning(f"Sandbox: não foi possível aplicar o limite de CPU: {e}")
+
+
+def _worker_main(
+    conn, cpu_time_limit: Optional[int], memory_limit_mb: Optional[int], preload_modules: Tuple[str, ...] = ()
+):
+    """
+    Laço do processo trabalhador: recebe jobs pelo pipe e devolve os resultados.
+
+    Cada job é `("code", código, globals, chave)`, `("check", código do usuário,
+    código de teste, chave do teste, limites)`, executado com `code_executor.execute_with_test`
+    (limites opcionais de CPU, memória e saída daquele exercício, ver `execution_limits`;
+    o trabalhador volta aos limites do pool ao fim do job),
+    ou `("stream", código, globals, limite de bytes)`, que envia blocos
+    `("output", fluxo, texto)` durante a execução e termina com `("result", dict)`.
+    Com chave (ver `code_cache.code_key`), o código é compilado uma única vez por
+    trabalhador. `None` encerra o trabalhador.
+    """
+    try:
+        from . import code_executor
+        from .code_cache import CodeMemo
+    except ImportError:
+        import code_executor
+        from code_cache import CodeMemo
+
+    memo = CodeMemo()
+
+    def forward(name, text):
+        """Envia um bloco de saída de um job de streaming ao processo principal."""
+        conn.send(("output", name, text))
+
+    # Pré-aquecimento: importações e primeira execução antes de aceitar jobs
+    _preload(preload_modules)
+    code_executor.execute_code("pass")
+    baseline = _address_space_bytes()
+    _apply_memory_limit(memory_limit_mb, baseline)
+    worker_memory_limit = resource.getrlimit(resource.RLIMIT_AS) if resource is not None else None
+    conn.send("ready")
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:
+            break
+
+        kind = job[0]
+        limits = job[4] if kind == "check" else {}
+        _apply_cpu_limit(limits.get("cpu_time_limit") or cpu_time_limit)
+        try:
+            if kind == "check":
+                _, user_code, test_code, key, limits = job
+                if test_code:
+                    try:
+                        test_code = memo.compile(key, test_code)
+                    except (SyntaxError, ValueError):
+                        pass  # O executor reporta o erro no formato padrão
+                _apply_memory_limit(limits.get("max_memory_mb"), baseline)
+                result = code_executor.execute_with_test(user_code, test_code, limits.get("max_output_bytes"))
+            elif kind == "stream":
+                _, code_string, execution_globals, max_output_bytes = job
+                result = code_executor.execute_code_streaming(code_string, forward, execution_globals, max_output_bytes)
+            else:
+                _, code_string, execution_globals, key = job
+                result = code_executor.execute_code(memo.compile(key, code_string), execution_globals)
+        except BaseException as e:  # SystemExit, KeyboardInterrupt... não derrubam o trabalhador
+            result = _error_result(type(e).__name__, str(e))
+            if kind == "check":
+                result = {"user": result, "test": None}
+            elif kind == "stream":
+                result["truncated"] = False
+        finally:
+            if limits.get("max_memory_mb"):
+                _restore_memory_limit(worker_memory_limit)
+            if limits.get("cpu_time_limit"):
+                _apply_cpu_limit(cpu_time_limit)
+        if kind == "stream":
+            result = ("result", result)
+        try:
+            conn.send(result)
+        except Exception as e:  # Resultado não serializável
+            conn.send(_error_result(type(e).__name__, f"Resultado não serializável: {e}"))
+    conn.close()
+
+
+class _Worker:
+    """Processo trabalhador e a ponta do pipe usada pelo processo principal."""
+
+    def __init__(self, ctx, cpu_time_limit, memory_limit_mb, preload_modules=()):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, cpu_time_limit, memory_limit_mb, preload_modules),
+            name="sandbox-worker",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+        self.ready = False
+
+    def wait_ready(self, timeout: float) -> bool:
+        """Aguarda o sinal de pré-aquecimento do trabalhador."""
+        if not self.ready and self.conn.poll(timeout):
+            try:
+                self.ready = self.conn.recv() == "ready"
+            except (EOFError, OSError):
+                self.ready = False
+        return self.ready
+
+    def stop(self, kill: bool = False):
+        """Encerra o processo (educadamente ou à força)."""
+        try:
+            if kill:
+                self.process.kill()
+            else:
+                self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=1)
+        self.conn.close()
+
+
+class SandboxPool:
+    """
+    Pool de processos pré-aquecidos para executar código do usuário em paralelo.
+
+    Attributes:
+        size (int): Número de processos trabalhadores.
+        timeout (float): Limite de tempo real, em segundos, por execução.
+        cpu_time_limit (int | None): Limite de tempo de CPU, em segundos, por execução.
+        memory_limit_mb (int | None): Limite de memória (espaço de endereçamento) por trabalhador,
+            além do ocupado após o pré-aquecimento.
+        max_jobs_per_worker (int): Execuções após as quais o trabalhador é reciclado.
+        preload_modules (tuple): Módulos disponíveis pré-carregados em cada trabalhador.
+        acquire_timeout (float): Espera máxima, em segundos, por um trabalhador livre.
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        cpu_time_limit: Optional[int] = DEFAULT_CPU_TIME_LIMIT,
+        memory_limit_mb: Optional[int] = DEFAULT_MEMORY_LIMIT_MB,
+        max_jobs_per_worker: int = DEFAULT_MAX_JOBS_PER_WORKER,
+        start_method: Optional[str] = None,
+        preload_modules: Optional[Iterable[str]] = DEFAULT_PRELOAD_MODULES,
+        acquire_timeout: Optional[float] = None,
+    ):
+        """
+        Cria o pool e inicia os trabalhadores.
+
+        Args:
+            size (int, optional): Número de trabalhadores. Padrão: número de CPUs (máx. 4).
+            timeout (float): Limite de tempo real por execução, em segundos.
+            cpu_time_limit (int, optional): Limite de CPU por execução, em segundos (None desativa).
+            memory_limit_mb (int, optional): Limite de memória por trabalhador, em MB (None desativa).
+            max_jobs_per_worker (int): Número de execuções antes de reciclar um trabalhador.
+            start_method (str, optional): Método do multiprocessing. Padrão: 'forkserver'
+                quando disponível, senão 'spawn'.
+            preload_modules (Iterable[str], optional): Módulos importados antes do primeiro job.
+                Com 'forkserver', são importados no processo servidor (compartilhado por
+                todos os pools do processo; vale a lista do primeiro pool criado) e
+                herdados pelos trabalhadores; com 'spawn', cada trabalhador os importa ao iniciar.
+            acquire_timeout (float, optional): Espera máxima por um trabalhador livre, independente
+                dos limites de tempo de cada exercício. Padrão: o dobro de `timeout`.
+        """
+        if start_method is None:
+            methods = multiprocessing.get_all_start_methods()
+            start_method = "forkserver" if "forkserver" in methods else "spawn"
+        self._ctx = multiprocessing.get_context(start_method)
+        self.preload_modules = _available_modules(preload_modules or ())
+        if start_method == "forkserver":
+            self._ctx.set_forkserver_preload([__name__, *self.preload_modules])
+        self.size = max(1, size or min(4, os.cpu_count() or 1))
+        self.timeout = timeout
+        self.acquire_timeout = timeout * 2 if acquire_timeout is None else acquire_timeout
+        self.cpu_time_limit = cpu_time_limit
+        self.memory_limit_mb = memory_limit_mb
+        self.max_jobs_per_worker = max(1, max_jobs_per_worker)
+
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._workers: List[_Worker] = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self.stats = {"executions": 0, "timeouts": 0, "crashes": 0, "recycled": 0}
+
+        for _ in range(self.size):
+            self._idle.put(self._spawn())
+        logger.info(
+            f"SandboxPool iniciado: {self.size} trabalhadores ({start_method}), timeout {timeout}s, "
+            f"CPU {cpu_time_limit}s, memória {memory_limit_mb} MB, reciclagem a cada {self.max_jobs_per_worker} jobs, "
+            f"módulos pré-carregados: {', '.join(self.preload_modules) or 'nenhum'}"
+        )
+
+    def _count(self, stat: str):
+        """Incrementa um contador de `stats` de forma thread-safe."""
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _spawn(self) -> _Worker:
+        """Cria um novo trabalhador e o registra."""
+        worker = _Worker(self._ctx, self.cpu_time_limit, self.memory_limit_mb, self.preload_modules)
+        with self._lock:
+            self._workers.append(worker)
+        return worker
+
+    def _retire(self, worker: _Worker, kill: bool = False):
+        """Encerra um trabalhador e o remove do registro."""
+        with self._lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+        worker.stop(kill=kill)
+
+    def _replace(self, worker: _Worker, kill: bool = False):
+        """Substitui um trabalhador por um novo no conjunto de ociosos."""
+        self._retire(worker, kill=kill)
+        if not self._closed:
+            self._idle.put(self._spawn())
+
+    def execute(
+        self,
+        code_string: str,
+        execution_globals: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        acquire_timeout: Optional[float] = None,
+        cache_key: Optional[tuple] = None,
+    ) -> Dict:
+        """
+        Executa código em um trabalhador livre.
+
+        Args:
+            code_string (str): Código Python a executar.
+            execution_globals (dict, optional): Escopo global inicial (deve ser serializável com pickle).
+            timeout (float, optional): Limite de tempo real desta execução. Padrão: `self.timeout`.
+            acquire_timeout (float, optional): Espera máxima por um trabalhador livre.
+                Padrão: `self.acquire_timeout`.
+            cache_key (tuple, optional): Chave de `code_cache.code_key` para código estático;
+                o trabalhador reutiliza o objeto compilado nas execuções seguintes.
+
+        Returns:
+            dict: Mesmo formato de `code_executor.execute_code`. Estouro de tempo
+            resulta em `error_type` "TimeoutError"; queda do trabalhador, em "WorkerCrashed".
+        """
+        return self._run_job(("code", code_string, execution_globals, cache_key), timeout, acquire_timeout)
+
+    def execute_with_test(
+        self,
+        user_code: str,
+        test_code: Optional[str] = None,
+        timeout: Optional[float] = None,
+        acquire_timeout: Optional[float] = None,
+        cache_key: Optional[tuple] = None,
+        memory_limit_mb: Optional[int] = None,
+        max_output_bytes: Optional[int] = None,
+    ) -> Dict:
+        """
+        Executa o código do usuário e o código de teste em um único trabalhador.
+
+        O limite de tempo (real e de CPU) vale para a unidade inteira. Com `timeout`,
+        o limite de CPU do job passa a ser `timeout` arredondado para cima (em vez do
+        limite de CPU do pool). Os limites de tempo, memória e saída informados valem
+        apenas para este job; o trabalhador volta aos limites do pool em seguida.
+
+        Args:
+            user_code (str): Código submetido pelo usuário.
+            test_code (str, optional): Código de teste do exercício.
+            timeout (float, optional): Limite de tempo real da unidade. Padrão: `self.timeout`.
+            acquire_timeout (float, optional): Espera máxima por um trabalhador livre.
+                Padrão: `self.acquire_timeout`.
+            cache_key (tuple, optional): Chave de `code_cache.code_key` do código de teste.
+            memory_limit_mb (int, optional): Limite de memória do job, em MB. Padrão: o do pool.
+            max_output_bytes (int, optional): Limite de bytes capturados do código do usuário.
+
+        Returns:
+            dict: Mesmo formato de `code_executor.execute_with_test`. Falhas do
+            ambiente (tempo esgotado, queda, pool ocupado) são atribuídas a "user".
+        """
+        cpu_time_limit = math.ceil(timeout) if timeout is not None and self.cpu_time_limit else None
+        limits = {
+            "max_memory_mb": memory_limit_mb,
+            "max_output_bytes": max_output_bytes,
+            "cpu_time_limit": cpu_time_limit,
+        }
+        job = ("check", user_code, test_code, cache_key, limits)
+        result = self._run_job(job, timeout, acquire_timeout, cpu_time_limit)
+        if "user" not in result:
+            result = {"user": result, "test": None}
+        return result
+
+    def execute_stream(
+        self,
+        code_string: str,
+        execution_globals: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        acquire_timeout: Optional[float] = None,
+        max_output_bytes: int = DEFAULT_MAX_OUTPUT_BYTES,
+    ) -> Iterator[tuple]:
+        """
+        Executa código em um trabalhador livre, gerando a saída à medida que é produzida.
+
+        Se o consumidor abandonar o gerador antes do fim (ex.: cliente desconectado),
+        o trabalhador é encerrado e substituído.
+
+        Args:
+            code_string (str): Código Python a executar.
+            execution_globals (dict, optional): Escopo global inicial (serializável com pickle).
+            timeout (float, optional): Limite de tempo real da execução. Padrão: `self.timeout`.
+            acquire_timeout (float, optional): Espera máxima por um trabalhador livre.
+                Padrão: `self.acquire_timeout`.
+            max_output_bytes (int): Limite de bytes de saída capturados (ver `code_executor.execute_code_streaming`).
+
+        Yields:
+            tuple: ("output", nome do fluxo, texto) e, por último, ("result", dict no
+            formato de `code_executor.execute_code_streaming`).
+        """
+        timeout = self.timeout if timeout is None else timeout
+        worker, error = self._acquire(timeout, acquire_timeout)
+        if error:
+            yield ("result", dict(error, truncated=False))
+            return
+
+        started = time.monotonic()
+        deadline = started + timeout
+        settled = False
+        try:
+            worker.conn.send(("stream", code_string, execution_globals, max_output_bytes))
+            while True:
+                if not worker.conn.poll(max(0.0, deadline - time.monotonic())):
+                    settled = True
+                    yield ("result", dict(self._timed_out(worker, timeout), truncated=False))
+                    return
+                message = worker.conn.recv()
+                if message[0] == "result":
+                    settled = True
+                    self._release(worker, started)
+                    yield message
+                    return
+                yield message
+        except (EOFError, OSError):
+            settled = True
+            yield ("result", dict(self._broken(worker), truncated=False))
+        finally:
+            if not settled:
+                logger.info("SandboxPool: streaming interrompido pelo consumidor; trabalhador encerrado.")
+                self._replace(worker, kill=True)
+
+    def _run_job(
+        self,
+        job: tuple,
+        timeout: Optional[float],
+        acquire_timeout: Optional[float],
+        cpu_time_limit: Optional[int] = None,
+    ) -> Dict:
+        """Envia um job a um trabalhador livre e aguarda o resultado, aplicando o limite de tempo real."""
+        timeout = self.timeout if timeout is None else timeout
+        worker, error = self._acquire(timeout, acquire_timeout)
+        if error:
+            return error
+
+        started = time.monotonic()
+        try:
+            worker.conn.send(job)
+            if not worker.conn.poll(timeout):
+                return self._timed_out(worker, timeout)
+            result = worker.conn.recv()
+        except (EOFError, OSError):
+            return self._broken(worker, cpu_time_limit)
+
+        self._release(worker, started)
+        return result
+
+    def _acquire(self, timeout: float, acquire_timeout: Optional[float]):
+        """Obtém um trabalhador livre e pronto; retorna (trabalhador, None) ou (None, resultado de erro)."""
+        if self._closed:
+            raise RuntimeError("SandboxPool encerrado")
+        acquire_timeout = self.acquire_timeout if acquire_timeout is None else acquire_timeout
+
+        try:
+            worker = self._idle.get(timeout=acquire_timeout)
+        except queue.Empty:
+            logger.warning("SandboxPool: nenhum trabalhador livre dentro do prazo.")
+            return None, _error_result("SandboxBusy", "Servidor ocupado. Tente novamente em instantes.")
+
+        if not worker.wait_ready(timeout=max(timeout, 10.0)) or not worker.process.is_alive():
+            logger.error("SandboxPool: trabalhador não inicializou; substituindo.")
+            self._count("crashes")
+            self._replace(worker, kill=True)
+            return None, _error_result("WorkerCrashed", "Falha ao iniciar o ambiente de execução.")
+        return worker, None
+
+    def _release(self, worker: _Worker, started: float):
+        """Devolve o trabalhador ao conjunto de ociosos (ou o recicla) após uma execução concluída."""
+        self._count("executions")
+        worker.jobs += 1
+        if worker.jobs >= self.max_jobs_per_worker:
+            self._count("recycled")
+            self._replace(worker)
+        else:
+            self._idle.put(worker)
+        logger.debug(f"SandboxPool: execução concluída em {time.monotonic() - started:.3f}s")
+
+    def _timed_out(self, worker: _Worker, timeout: float) -> Dict:
+        """Encerra o trabalhador que excedeu o limite de tempo real."""
+        self._count("timeouts")
+        logger.warning(f"SandboxPool: execução excedeu {timeout}s; trabalhador encerrado.")
+        self._replace(worker, kill=True)
+        return _error_result("TimeoutError", f"Tempo limite de execução excedido ({timeout:g}s).")
+
+    def _broken(self, worker: _Worker, cpu_time_limit: Optional[int] = None) -> Dict:
+        """Substitui o trabalhador cujo pipe foi interrompido e classifica a falha."""
+        self._replace(worker, kill=True)
+        exitcode = worker.process.exitcode
+        if _SIGXCPU is not None and exitcode == -_SIGXCPU:
+            self._count("timeouts")
+            limit = cpu_time_limit or self.cpu_time_limit
+            return _error_result("TimeoutError", f"Limite de tempo de CPU excedido ({limit}s).")
+        self._count("crashes")
+        logger.error(f"SandboxPool: trabalhador terminou inesperadamente (código {exitcode}).")
+        return _error_result("WorkerCrashed", "O processo de execução terminou inesperadamente.")
+
+    def close(self):
+        """Encerra todos os trabalhadores."""
+        if self._closed:
+            return
+        self._closed = True
+        with self._lock:
+            workers = list(self._workers)
+        for worker in workers:
+            self._retire(worker)
+
+
+_pool: Optional[SandboxPool] = None
+_pool_lock = threading.Lock()
+
+
+def _preload_from_env() -> Tuple[str, ...]:
+    """Lê a lista de módulos pré-carregados de SANDBOX_PRELOAD (padrão: DEFAULT_PRELOAD_MODULES)."""
+    value = os.environ.get("SANDBOX_PRELOAD")
+    if value is None:
+        return DEFAULT_PRELOAD_MODULES
+    return tuple(name.strip() for name in value.split(",") if name.strip())
+
+
+def get_sandbox_pool() -> SandboxPool:
+    """
+    Retorna o pool compartilhado do processo, criando-o no primeiro uso.
+
+    Configuração por variáveis de ambiente: SANDBOX_WORKERS, SANDBOX_TIMEOUT,
+    SANDBOX_CPU_LIMIT, SANDBOX_MEMORY_MB, SANDBOX_MAX_JOBS, SANDBOX_ACQUIRE_TIMEOUT
+    (espera por um trabalhador livre) e SANDBOX_PRELOAD (módulos separados por
+    vírgula; vazio desativa o pré-carregamento).
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = SandboxPool(
+                    size=int(os.environ.get("SANDBOX_WORKERS", "0")) or None,
+                    timeout=float(os.environ.get("SANDBOX_TIMEOUT", DEFAULT_TIMEOUT)),
+                    cpu_time_limit=int(os.environ.get("SANDBOX_CPU_LIMIT", DEFAULT_CPU_TIME_LIMIT)) or None,
+                    memory_limit_mb=int(os.environ.get("SANDBOX_MEMORY_MB", DEFAULT_MEMORY_LIMIT_MB)) or None,
+                    max_jobs_per_worker=int(os.environ.get("SANDBOX_MAX_JOBS", DEFAULT_MAX_JOBS_PER_WORKER)),
+                    preload_modules=_preload_from_env(),
+                    acquire_timeout=float(os.environ.get("SANDBOX_ACQUIRE_TIMEOUT", "0")) or None,
+                )
+                atexit.register(_pool.close)
+    return _pool
+
+
+def execute_isolated(
+    code_string: str, execution_globals: Optional[dict] = None, cache_key: Optional[tuple] = None
+) -> Dict:
+    """
+    Executa código no pool compartilhado (mesmo contrato de `code_executor.execute_code`).
+
+    Args:
+        code_string (str): Código Python a executar.
+        execution_globals (dict, optional): Escopo global inicial (serializável com pickle).
+        cache_key (tuple, optional): Chave de `code_cache.code_key` para código estático.
+
+    Returns:
+        dict: Resultado da execução (returncode, stdout, stderr, error_type).
+    """
+    return get_sandbox_pool().execute(code_string, execution_globals, cache_key=cache_key)
+
+
+def stream_isolated(
+    code_string: str, execution_globals: Optional[dict] = None, max_output_bytes: int = DEFAULT_MAX_OUTPUT_BYTES
+) -> Iterator[tuple]:
+    """
+    Executa código no pool compartilhado gerando a saída em blocos (ver `SandboxPool.execute_stream`).
+
+    Args:
+        code_string (str): Código Python a executar.
+        execution_globals (dict, optional): Escopo global inicial.
+        max_output_bytes (int): Limite de bytes de saída capturados.
+
+    Yields:
+        tuple: ("output", fluxo, texto) e, por último, ("result", dict).
+    """
+    return get_sandbox_pool().execute_stream(code_string, execution_globals, max_output_bytes=max_output_bytes)
+
+
+def execute_isolated_with_test(
+    user_code: str,
+    test_code: Optional[str] = None,
+    cache_key: Optional[tuple] = None,
+    timeout: Optional[float] = None,
+    memory_limit_mb: Optional[int] = None,
+    max_output_bytes: Optional[int] = None,
+) -> Dict:
+    """
+    Executa código do usuário e teste no pool compartilhado, em uma única ida e volta.
+
+    Args:
+        user_code (str): Código submetido pelo usuário.
+        test_code (str, optional): Código de teste do exercício.
+        cache_key (tuple, optional): Chave de `code_cache.code_key` do código de teste.
+        timeout (float, optional): Limite de tempo real da unidade. Padrão: o do pool.
+        memory_limit_mb (int, optional): Limite de memória do job, em MB. Padrão: o do pool.
+        max_output_bytes (int, optional): Limite de bytes capturados do código do usuário.
+
+    Returns:
+        dict: Mesmo formato de `code_executor.execute_with_test`.
+    """
+    return get_sandbox_pool().execute_with_test(
+        user_code,
+        test_code,
+        timeout=timeout,
+        cache_key=cache_key,
+        memory_limit_mb=memory_limit_mb,
+        max_output_bytes=max_output_bytes,
+    )
@@ -0,0 +1,66 @@
+// Cliente da fila de execução do servidor (/api/jobs/*), usado pelos editores de código.
+// Submete a tarefa, reenvia quando a fila está cheia (HTTP 429 + Retry-After) e aguarda o
+// resultado via Server-Sent Events, recorrendo a long-polling quando o SSE não está disponível.
+
+// Intervalo de espera (s) de cada consulta quando o navegador não suporta Server-Sent Events
+const JOB_POLL_WAIT = 10;
+// Número máximo de reenvios quando a fila do servidor está cheia (HTTP 429)
+const JOB_MAX_RETRIES = 3;
+
+// Submete uma tarefa à fila do servidor (/api/jobs/<tipo>) e resolve com o resultado.
+// O resultado tem o mesmo formato das rotas síncronas (/api/execute-code, /api/check-exercise).
+async function runCodeJob(kind, payload, retries = JOB_MAX_RETRIES) {
+    const response = await fetch('/api/jobs/' + kind, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json; charset=utf-8'
+        },
+        body: JSON.stringify(payload)
+    });
+
+    if (response.status === 429 && retries > 0) {
+        // Fila cheia: aguardar o tempo sugerido pelo servidor e reenviar
+        const retryAfter = parseInt(response.headers.get('Retry-After'), 10) || 1;
+        await new Promise(resolve => setTimeout(resolve, retryAfter * 1000));
+        return runCodeJob(kind, payload, retries - 1);
+    }
+
+    const job = await response.json();
+    if (response.status !== 202) {
+        // Erro de validação (400/404) ou fila cheia: mesmo formato de resposta das rotas síncronas
+        return job;
+    }
+
+    const finished = window.EventSource ? await waitJobEvents(job) : await pollJob(job);
+    return finished.result;
+}
+
+// Aguarda o evento 'result' do stream SSE da tarefa
+function waitJobEvents(job) {
+    return new Promise((resolve, reject) => {
+        const source = new EventSource(job.events_url);
+        source.addEventListener('result', event => {
+            source.close();
+            resolve(JSON.parse(event.data));
+        });
+        source.onerror = () => {
+            // Conexão interrompida: continuar por polling
+            source.close();
+            pollJob(job).then(resolve, reject);
+        };
+    });
+}
+
+// Consulta a tarefa (long-polling) até que ela termine
+async function pollJob(job) {
+    for (;;) {
+        const response = await fetch(job.poll_url + '?wait=' + JOB_POLL_WAIT);
+        if (!response.ok) {
+            throw new Error('Tarefa não encontrada ou expirada.');
+        }
+        const data = await response.json();
+        if (data.status === 'done' || data.status === 'failed') {
+            return data;
+        }
+    }
+}
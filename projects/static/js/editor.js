@@ -1,3 +1,4 @@
+// Requer js/code_jobs.js (runCodeJob), carregado antes deste arquivo
 let codeEditor; // Variável global para o editor
 
 document.addEventListener('DOMContentLoaded', function() {
@@ -39,23 +40,16 @@ document.addEventListener('DOMContentLoaded', function() {
         // Mudar para a aba de saída
         outputTab.click();
 
-        // Enviar o código para o servidor para execução
-        fetch('/api/execute-code', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json; charset=utf-8'
-            },
-            body: JSON.stringify({ code: code })
-        })
-        .then(response => response.json())
+        // Enviar o código para a fila de execução do servidor
+        runCodeJob('execute-code', { code: code })
         .then(data => {
             // Exibir a saída
-            if (data.returncode === 0) {
+            if (data.success) {
                 // Execução bem-sucedida
-                outputDiv.innerHTML = '<pre class="success">' + (data.stdout || 'Programa executado com sucesso (sem saída).') + '</pre>';
+                outputDiv.innerHTML = '<pre class="success">' + (data.output || 'Programa executado com sucesso (sem saída).') + '</pre>';
             } else {
                 // Erro na execução
-                outputDiv.innerHTML = '<pre class="error">' + (data.stderr || 'Erro desconhecido.') + '</pre>';
+                outputDiv.innerHTML = '<pre class="error">' + (data.details || 'Erro desconhecido.') + '</pre>';
             }
         })
         .catch(error => {
@@ -76,30 +70,24 @@ document.addEventListener('DOMContentLoaded', function() {
             // Mudar para a aba de saída
             outputTab.click();
 
-            // Enviar o código para o servidor para verificação
-            fetch('/api/check-exercise', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json; charset=utf-8'
-                },
-                body: JSON.stringify({
-                    exercise_id: exerciseId,
-                    code: code
-                })
-            })
-            .then(response => response.json())
+            // Enviar o código para a fila de verificação do servidor
+            const payload = { exercise_id: exerciseId, code: code };
+            if (typeof courseId !== 'undefined') {
+                payload.course_id = courseId;
+            }
+            runCodeJob('check-exercise', payload)
             .then(data => {
                 // Exibir o resultado da verificação
                 if (data.success) {
                     outputDiv.innerHTML = '<div class="alert alert-success">' +
                         '<h4 class="alert-heading">Parabéns!</h4>' +
-                        '<p>' + data.message + '</p>' +
+                        '<p>' + data.details + '</p>' +
                         (data.output ? '<pre>' + data.output + '</pre>' : '') +
                         '</div>';
                 } else {
                     outputDiv.innerHTML = '<div class="alert alert-danger">' +
                         '<h4 class="alert-heading">Não passou nos testes</h4>' +
-                        '<p>' + data.message + '</p>' +
+                        '<p>' + data.details + '</p>' +
                         (data.output ? '<pre>' + data.output + '</pre>' : '') +
                         '</div>';
                 }
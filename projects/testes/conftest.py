@@ -1,6 +1,7 @@
 # c:\Users\lucin\OneDrive\Dev_Python\Projetos Python\Curso-Interartivo-Python\projects\testes\conftest.py
 import json
 import logging
+import os
 import sys
 from pathlib import Path
 
@@ -176,3 +177,13 @@ def app_test_data(app, tmp_path, monkeypatch):
     # Teardown: The tmp_path fixture automatically cleans up the temporary directory.
     # The monkeypatch fixture automatically undoes the patches.
     # No explicit teardown needed here.
+
+
+def pytest_collection_modifyitems(config, items):
+    """Ignora os testes marcados com `benchmark`, exceto com RUN_BENCHMARKS=1 (ver `make benchmark`)."""
+    if os.environ.get("RUN_BENCHMARKS") == "1":
+        return
+    skip_benchmark = pytest.mark.skip(reason="benchmark: defina RUN_BENCHMARKS=1 para executar")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
@@ -0,0 +1,86 @@
+"""
+Testes para o módulo code_cache.
+
+Verifica a pré-compilação do código dos exercícios no carregamento, o relato
+de erros de compilação do conteúdo e a reutilização dos objetos compilados.
+"""
+
+import json
+
+from projects import code_executor
+from projects.code_cache import CodeMemo, CompiledCodeCache, code_cache, code_key
+
+
+class TestCompiledCodeCache:
+    """Testes do CompiledCodeCache."""
+
+    def test_key_changes_with_content(self):
+        assert code_key(1, "test_code", "a = 1") == code_key("1", "test_code", "a = 1")
+        assert code_key(1, "test_code", "a = 1") != code_key(1, "test_code", "a = 2")
+
+    def test_get_or_compile_reuses_code_object(self):
+        cache = CompiledCodeCache()
+        key = code_key("ex", "test_code", "print('ok')")
+
+        first = cache.get_or_compile(key, "print('ok')")
+        second = cache.get_or_compile(key, "print('ok')")
+
+        assert first is second
+        assert cache.get_stats()["hits"] == 1
+        assert code_executor.execute_code(first)["stdout"] == "ok\n"
+
+    def test_precompile_reports_content_errors(self):
+        cache = CompiledCodeCache()
+        exercises = [
+            {"id": "bom", "test_code": "assert output == 'x'", "solution_code": "print('x')"},
+            {"id": "ruim", "test_code": "assert output ==", "solution_code": ""},
+            "registro inválido",
+        ]
+
+        errors = cache.precompile_exercises(exercises, "exercises.json")
+
+        assert [(e["exercise_id"], e["field"]) for e in errors] == [("ruim", "test_code")]
+        assert errors[0]["error"].startswith("SyntaxError")
+        assert cache.get_stats()["entries"] == 2
+        assert ("ruim", "test_code") in cache.compile_errors
+
+    def test_lru_limit(self):
+        cache = CompiledCodeCache(max_entries=2)
+        for i in range(3):
+            source = f"x = {i}"
+            cache.get_or_compile(code_key("ex", "test_code", source), source)
+        assert cache.get_stats()["entries"] == 2
+
+
+class TestCodeMemo:
+    """Testes da memória de código dos trabalhadores."""
+
+    def test_compiles_once_per_key(self):
+        memo = CodeMemo(max_entries=1)
+        key = code_key("ex", "test_code", "x = 1")
+
+        assert memo.compile(key, "x = 1") is memo.compile(key, "x = 1")
+        assert memo.compile(None, "x = 2") == "x = 2"
+
+
+class TestExerciseLoadPrecompiles:
+    """O ExerciseManager pré-compila o código ao carregar o arquivo de exercícios."""
+
+    def test_load_populates_code_cache(self, app_test_data):
+        from projects import exercise_manager
+        from projects.content_cache import content_cache
+
+        exercises_file = exercise_manager.DATA_DIR / "basic" / "exercises.json"
+        exercises = json.loads(exercises_file.read_text(encoding="utf-8"))
+        exercises.append({"id": "quebrado", "lesson_id": "x", "test_code": "def (:"})
+        exercises_file.write_text(json.dumps(exercises), encoding="utf-8")
+        content_cache.invalidate(exercises_file)
+
+        exercise_manager.ExerciseManager().load_exercises_from_file("basic/exercises.json")
+
+        assert ("quebrado", "test_code") in code_cache.compile_errors
+        first = next(e for e in exercises if e.get("test_code") and e["id"] != "quebrado")
+        key = code_key(first["id"], "test_code", first["test_code"])
+        hits_before = code_cache.get_stats()["hits"]
+        code_cache.get_or_compile(key, first["test_code"])
+        assert code_cache.get_stats()["hits"] == hits_before + 1
@@ -0,0 +1,88 @@
+"""
+Testes da execução com saída em streaming (code_executor.execute_code_streaming
+e rota /api/execute-code/stream).
+"""
+
+import json
+
+import pytest
+
+from projects import app as app_module
+from projects import code_executor
+
+
+class TestExecuteCodeStreaming:
+    """Testes de execute_code_streaming."""
+
+    def test_output_is_capped_with_marker(self):
+        chunks = []
+        result = code_executor.execute_code_streaming(
+            "for i in range(100000):\n    print(i)", lambda name, text: chunks.append(text), max_output_bytes=1000
+        )
+
+        marker = code_executor.truncation_marker(1000)
+        assert result["truncated"] is True
+        assert result["stdout"].endswith(marker)
+        assert len(result["stdout"].encode("utf-8")) <= 1000 + len(marker.encode("utf-8"))
+        assert "".join(chunks) == result["stdout"]
+
+    def test_budget_is_shared_between_streams(self):
+        code = "import sys\nprint('a' * 60)\nprint('b' * 60, file=sys.stderr)"
+        result = code_executor.execute_code_streaming(code, lambda name, text: None, max_output_bytes=100)
+
+        assert result["truncated"] is True
+        assert result["stdout"] == "a" * 60 + "\n"
+        assert result["stderr"].startswith("b" * 39)
+
+    def test_error_keeps_partial_output(self):
+        chunks = []
+        result = code_executor.execute_code_streaming(
+            "print('antes')\n1/0", lambda name, text: chunks.append((name, text))
+        )
+
+        assert result["stdout"] == "antes\n"
+        assert result["error_type"] == "ZeroDivisionError"
+        assert ("stdout", "antes\n") in chunks
+
+
+def _parse_sse(body):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class TestExecuteCodeStreamRoute:
+    """Testes da rota /api/execute-code/stream."""
+
+    @pytest.fixture(autouse=True)
+    def pool_sandbox(self, monkeypatch):
+        monkeypatch.setattr(app_module, "CODE_SANDBOX", "pool")
+        monkeypatch.setattr(app_module, "STREAM_MAX_OUTPUT_BYTES", 200)
+
+    def test_streams_output_and_result(self, client):
+        response = client.post("/api/execute-code/stream", json={"code": "print('olá')"})
+
+        assert response.mimetype == "text/event-stream"
+        events = _parse_sse(response.get_data(as_text=True))
+        assert events[0] == ("output", {"stream": "stdout", "text": "olá\n"})
+        assert events[-1] == ("result", {"success": True, "details": "", "truncated": False})
+
+    def test_runaway_output_is_truncated(self, client):
+        response = client.post("/api/execute-code/stream", json={"code": "for _ in range(10**5):\n    print('x' * 50)"})
+
+        events = _parse_sse(response.get_data(as_text=True))
+        text = "".join(payload["text"] for name, payload in events if name == "output")
+        assert events[-1][1]["truncated"] is True
+        assert text.endswith(code_executor.truncation_marker(200))
+
+    def test_invalid_payload(self, client):
+        assert client.post("/api/execute-code/stream", json={}).status_code == 400
+
+    def test_inline_mode_refuses_streaming(self, client, monkeypatch):
+        monkeypatch.setattr(app_module, "CODE_SANDBOX", "inline")
+        response = client.post("/api/execute-code/stream", json={"code": "print('olá')"})
+
+        assert response.status_code == 501
+        assert "/api/execute-code" in response.get_json()["details"]
@@ -0,0 +1,90 @@
+"""
+Testes para o módulo compression e para a compressão das respostas da aplicação.
+"""
+
+import gzip
+
+import pytest
+
+from projects import app as app_module
+from projects import compression
+from projects.compression import CompressionCache
+
+GZIP = {"Accept-Encoding": "gzip"}
+
+
+@pytest.fixture
+def compressing(monkeypatch):
+    """Comprime qualquer resposta de texto, com um cache próprio do teste."""
+    cache = CompressionCache()
+    monkeypatch.setattr(app_module, "COMPRESSION_ENABLED", True)
+    monkeypatch.setattr(app_module, "COMPRESS_MIN_BYTES", 0)
+    monkeypatch.setattr(app_module, "compression_cache", cache)
+    return cache
+
+
+class TestDynamicCompression:
+    """Testes da compressão de respostas JSON/HTML."""
+
+    def test_content_api_is_compressed_once_per_etag(self, client, compressing):
+        plain = client.get("/api/courses/python-basico/lessons")
+        first = client.get("/api/courses/python-basico/lessons", headers=GZIP)
+        second = client.get("/api/courses/python-basico/lessons", headers=GZIP)
+
+        assert first.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in first.headers["Vary"]
+        assert gzip.decompress(first.data) == plain.data
+        assert first.headers["ETag"] == plain.headers["ETag"][:-1] + '-gzip"'
+        assert second.data == first.data
+        assert (compressing.hits, compressing.misses) == (1, 1)
+
+    def test_compressed_etag_revalidates(self, client, compressing):
+        etag = client.get("/api/courses", headers=GZIP).headers["ETag"]
+        assert client.get("/api/courses", headers={**GZIP, "If-None-Match": etag}).status_code == 304
+
+    def test_without_accept_encoding_response_is_plain(self, client, compressing):
+        response = client.get("/api/courses")
+        assert "Content-Encoding" not in response.headers
+        assert "Accept-Encoding" in response.headers["Vary"]
+
+    def test_small_responses_are_not_compressed(self, client, compressing, monkeypatch):
+        monkeypatch.setattr(app_module, "COMPRESS_MIN_BYTES", 10**9)
+        assert "Content-Encoding" not in client.get("/api/courses", headers=GZIP).headers
+
+    def test_brotli_is_preferred_when_available(self, client, compressing):
+        brotli = pytest.importorskip("brotli")
+        response = client.get("/api/courses", headers={"Accept-Encoding": "gzip, br"})
+        assert response.headers["Content-Encoding"] == "br"
+        assert brotli.decompress(response.data) == client.get("/api/courses").data
+
+
+class TestStaticCompression:
+    """Testes dos arquivos estáticos pré-comprimidos."""
+
+    def test_static_css_is_served_compressed(self, client, compressing):
+        plain = client.get("/static/css/style.css")
+        response = client.get("/static/css/style.css", headers=GZIP)
+
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert response.mimetype == "text/css"
+        assert gzip.decompress(response.data) == plain.data
+        revalidation = {**GZIP, "If-None-Match": response.headers["ETag"]}
+        assert client.get("/static/css/style.css", headers=revalidation).status_code == 304
+        plain.close()
+
+    def test_precompressed_file_is_used_and_rebuilt_incrementally(self, tmp_path):
+        (tmp_path / "js").mkdir()
+        source = tmp_path / "js" / "app.js"
+        source.write_text("console.log('olá');\n" * 200, encoding="utf-8")
+
+        first = compression.precompress_static(tmp_path)
+        second = compression.precompress_static(tmp_path)
+        encodings = len(compression.supported_encodings())
+
+        assert (first["written"], second["written"], second["skipped"]) == (encodings, 0, encodings)
+        gz_file = tmp_path / "js" / "app.js.gz"
+        assert gzip.decompress(gz_file.read_bytes()) == source.read_bytes()
+
+        cache = CompressionCache()
+        assert compression.static_variant(source, "gzip", cache) == gz_file.read_bytes()
+        assert cache.misses == 0  # veio do arquivo pré-comprimido
@@ -0,0 +1,90 @@
+"""
+Testes das respostas condicionais (ETag / Last-Modified / 304) das APIs de conteúdo e das páginas.
+"""
+
+import json
+
+from projects import app as app_module
+
+
+def _count_calls(monkeypatch, target, name):
+    """Substitui `target.name` por um invólucro que conta as chamadas."""
+    calls = []
+    original = getattr(target, name)
+
+    def wrapper(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(target, name, wrapper)
+    return calls
+
+
+class TestContentApiConditionalGet:
+    """Testes das APIs de cursos, lições e exercícios."""
+
+    def test_matching_etag_returns_304_without_loading_content(self, client, monkeypatch):
+        first = client.get("/api/courses/python-basico/lessons")
+        assert first.status_code == 200
+        assert first.headers["Cache-Control"] == "no-cache"
+        assert first.last_modified is not None
+        etag = first.headers["ETag"]
+
+        loads = _count_calls(monkeypatch, app_module.lesson_mgr, "load_lessons_from_file")
+        second = client.get("/api/courses/python-basico/lessons", headers={"If-None-Match": etag})
+
+        assert second.status_code == 304
+        assert second.data == b""
+        assert second.headers["ETag"] == etag
+        assert loads == []
+
+    def test_etag_changes_with_file(self, client, app_test_data):
+        etag = client.get("/api/courses/python-basico/exercises").headers["ETag"]
+
+        exercises_file = app_test_data / "basic" / "exercises.json"
+        exercises = json.loads(exercises_file.read_text(encoding="utf-8"))
+        exercises[0]["title"] = "Título revisado"
+        exercises_file.write_text(json.dumps(exercises), encoding="utf-8")
+
+        response = client.get("/api/courses/python-basico/exercises", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+        assert response.get_json()[0]["title"] == "Título revisado"
+
+    def test_if_modified_since(self, client):
+        first = client.get("/api/courses")
+        last_modified = first.headers["Last-Modified"]
+
+        assert client.get("/api/courses", headers={"If-Modified-Since": last_modified}).status_code == 304
+        # If-None-Match tem precedência sobre If-Modified-Since
+        headers = {"If-Modified-Since": last_modified, "If-None-Match": '"outra"'}
+        assert client.get("/api/courses", headers=headers).status_code == 200
+
+    def test_not_found_is_not_cached(self, client):
+        response = client.get("/api/courses/nao-existe/lessons")
+        assert response.status_code == 404
+        assert "ETag" not in response.headers
+
+
+class TestPageConditionalGet:
+    """Testes das páginas de roadmap e de lição."""
+
+    def test_roadmap_304_skips_template_rendering(self, client, monkeypatch):
+        etag = client.get("/courses/python-basico/roadmap").headers["ETag"]
+
+        renders = _count_calls(monkeypatch, app_module, "render_template")
+        response = client.get("/courses/python-basico/roadmap", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert renders == []
+
+    def test_lesson_page_304_still_records_progress(self, client, monkeypatch):
+        url = "/courses/python-basico/lessons/introducao-python"
+        etag = client.get(url).headers["ETag"]
+        assert etag != client.get("/courses/python-basico/roadmap").headers["ETag"]
+
+        marks = _count_calls(monkeypatch, app_module.progress_mgr, "mark_lesson_complete")
+        response = client.get(url, headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert len(marks) == 1
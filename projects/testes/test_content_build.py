@@ -0,0 +1,80 @@
+"""
+Testes para o módulo content_build (pré-renderização do conteúdo das lições).
+"""
+
+import json
+
+import pytest
+
+from projects import content_build
+from projects.content_renderer import ContentRendererFactory, render_content
+
+LESSONS = [
+    {"id": "l1", "content": "# Variáveis\n\nTexto **fixo**.", "summary": "Resumo da lição.", "examples": []},
+    {"id": "l2", "content": "```python\nprint('oi')\n```", "examples": "| A |\n|---|\n| 1 |"},
+]
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """Diretório de dados com dois cursos."""
+    for course, lessons in (("basic", LESSONS[:1]), ("advanced", LESSONS[1:])):
+        (tmp_path / course).mkdir()
+        (tmp_path / course / "lessons.json").write_text(json.dumps(lessons), encoding="utf-8")
+    return tmp_path
+
+
+@pytest.fixture
+def clean_render_cache():
+    """Isola o cache de renderização global do teste."""
+    ContentRendererFactory.clear_cache()
+    yield
+    ContentRendererFactory.load_prerendered("markdown", {})
+    ContentRendererFactory.clear_cache()
+
+
+class TestContentBuild:
+    """Testes da geração do bundle."""
+
+    def test_collects_markdown_fields(self, data_dir):
+        sources = content_build.collect_sources(data_dir)
+        assert sorted(sources.values()) == sorted(
+            [LESSONS[0]["content"], LESSONS[0]["summary"], LESSONS[1]["content"], LESSONS[1]["examples"]]
+        )
+
+    def test_rebuild_is_incremental(self, data_dir):
+        first = content_build.build_bundle(data_dir, workers=2)
+        assert (first["entries"], first["rendered"], first["reused"]) == (4, 4, 0)
+
+        lessons_file = data_dir / "basic" / "lessons.json"
+        lessons = json.loads(lessons_file.read_text(encoding="utf-8"))
+        lessons[0]["summary"] = "Resumo revisado."
+        lessons_file.write_text(json.dumps(lessons), encoding="utf-8")
+
+        second = content_build.build_bundle(data_dir, workers=1)
+        assert (second["entries"], second["rendered"], second["reused"], second["removed"]) == (4, 1, 3, 1)
+        assert content_build.build_bundle(data_dir, full=True)["rendered"] == 4
+
+    def test_outdated_bundle_is_ignored(self, data_dir):
+        content_build.build_bundle(data_dir, workers=1)
+        bundle_path = data_dir / content_build.BUNDLE_FILENAME
+        bundle = json.loads(bundle_path.read_text(encoding="utf-8"))
+        bundle["version"]["markdown"] = "0.0"
+        bundle_path.write_text(json.dumps(bundle), encoding="utf-8")
+
+        assert content_build.read_bundle(bundle_path) is None
+        assert content_build.build_bundle(data_dir, workers=1)["rendered"] == 4
+
+
+def test_loaded_bundle_serves_prerendered_html(data_dir, clean_render_cache):
+    """O filtro serve o HTML do bundle e renderiza ao vivo apenas textos ausentes."""
+    content_build.build_bundle(data_dir, workers=1)
+    live = render_content(LESSONS[0]["content"], "markdown")
+    ContentRendererFactory.clear_cache()
+
+    assert content_build.load_bundle(data_dir / content_build.BUNDLE_FILENAME) == 4
+    assert render_content(LESSONS[0]["content"], "markdown") == live
+    render_content("Texto fora do bundle.", "markdown")
+
+    stats = ContentRendererFactory.get_cache_stats()
+    assert (stats["prerendered_hits"], stats["misses"], stats["prerendered_entries"]) == (1, 1, 4)
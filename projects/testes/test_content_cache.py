@@ -0,0 +1,124 @@
+"""
+Testes para o módulo content_cache.
+
+Verifica invalidação por (mtime, tamanho), remoção LRU e contadores de acertos/faltas.
+"""
+
+import json
+import os
+
+import pytest
+
+from projects.content_cache import ContentCache
+
+
+def _write_json(path, data, mtime_ns=None):
+    """Escreve JSON e, opcionalmente, fixa o mtime do arquivo."""
+    path.write_text(json.dumps(data), encoding="utf-8")
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class TestContentCache:
+    """Testes para o ContentCache."""
+
+    def test_second_load_is_a_hit(self, tmp_path):
+        """A segunda leitura de um arquivo inalterado vem do cache."""
+        cache = ContentCache()
+        file_path = tmp_path / "lessons.json"
+        _write_json(file_path, [{"id": "1"}])
+
+        first = cache.load_json(file_path)
+        second = cache.load_json(file_path)
+
+        assert first == [{"id": "1"}]
+        assert second is first
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    def test_invalidates_when_mtime_changes(self, tmp_path):
+        """Alterar o mtime (mesmo tamanho) força nova leitura."""
+        cache = ContentCache()
+        file_path = tmp_path / "lessons.json"
+        _write_json(file_path, [{"id": "1"}], mtime_ns=1_000_000_000)
+        cache.load_json(file_path)
+
+        _write_json(file_path, [{"id": "2"}], mtime_ns=2_000_000_000)
+        assert cache.load_json(file_path) == [{"id": "2"}]
+        assert cache.get_stats()["misses"] == 2
+
+    def test_invalidates_when_size_changes(self, tmp_path):
+        """Alterar o tamanho (mesmo mtime) força nova leitura."""
+        cache = ContentCache()
+        file_path = tmp_path / "lessons.json"
+        _write_json(file_path, [{"id": "1"}], mtime_ns=1_000_000_000)
+        cache.load_json(file_path)
+
+        _write_json(file_path, [{"id": "1"}, {"id": "22"}], mtime_ns=1_000_000_000)
+        assert len(cache.load_json(file_path)) == 2
+
+    def test_lru_eviction_by_entries(self, tmp_path):
+        """Com limite de entradas, o arquivo menos usado é removido."""
+        cache = ContentCache(max_entries=2)
+        paths = []
+        for name in ("a", "b", "c"):
+            path = tmp_path / f"{name}.json"
+            _write_json(path, [name])
+            paths.append(path)
+
+        cache.load_json(paths[0])
+        cache.load_json(paths[1])
+        cache.load_json(paths[0])  # 'a' passa a ser o mais recente
+        cache.load_json(paths[2])  # remove 'b'
+
+        stats = cache.get_stats()
+        assert stats["entries"] == 2
+        assert stats["evictions"] == 1
+
+        cache.load_json(paths[0])
+        assert cache.get_stats()["hits"] == 2
+        cache.load_json(paths[1])
+        assert cache.get_stats()["misses"] == 4
+
+    def test_lru_eviction_by_bytes(self, tmp_path):
+        """O total de bytes em cache nunca ultrapassa max_bytes."""
+        big = tmp_path / "big.json"
+        small = tmp_path / "small.json"
+        _write_json(big, ["x" * 100])
+        _write_json(small, ["y"])
+        cache = ContentCache(max_bytes=big.stat().st_size + 1)
+
+        cache.load_json(big)
+        cache.load_json(small)
+
+        stats = cache.get_stats()
+        assert stats["bytes"] <= cache.max_bytes
+        assert stats["entries"] == 1
+
+    def test_missing_file_raises(self, tmp_path):
+        """Arquivo inexistente levanta FileNotFoundError."""
+        cache = ContentCache()
+        with pytest.raises(FileNotFoundError):
+            cache.load_json(tmp_path / "missing.json")
+
+
+class TestManagersUseCache:
+    """Os managers de lições e exercícios leem através do cache compartilhado."""
+
+    def test_lesson_manager_hits_cache(self, app_test_data):
+        from projects.content_cache import content_cache
+        from projects.lesson_manager import LessonManager
+
+        mgr = LessonManager()
+        mgr.load_lessons_from_file("basic/lessons.json")
+        hits_before = content_cache.get_stats()["hits"]
+        lessons = mgr.load_lessons_from_file("basic/lessons.json")
+
+        assert lessons[0]["id"] == "introducao-python"
+        assert content_cache.get_stats()["hits"] == hits_before + 1
+
+    def test_exercise_manager_missing_file_returns_empty(self, app_test_data):
+        from projects.exercise_manager import ExerciseManager
+
+        assert ExerciseManager().load_exercises_from_file("inexistente/exercises.json") == []
@@ -1,19 +1,35 @@
 """
 Testes para o módulo content_renderer.
 
-Testa a funcionalidade de renderização de conteúdo seguindo os princípios SOLID.
+Testa a funcionalidade de renderização de conteúdo seguindo os princípios SOLID
+e inclui um benchmark opcional (RUN_BENCHMARKS=1) do custo por renderização
+com instâncias de `Markdown` reaproveitadas por thread, comparado a `markdown.markdown()`.
 """
 
+import logging
+import statistics
+import threading
+import time
+
+import markdown
 import pytest
+from markdown.extensions import codehilite
 
 from projects.content_renderer import (
     ContentRenderer,
     ContentRendererFactory,
     MarkdownRenderer,
     PlainTextRenderer,
+    RenderCache,
+    cached_highlight,
+    get_highlight_cache_stats,
+    install_highlight_cache,
     render_content,
+    uninstall_highlight_cache,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class TestMarkdownRenderer:
     """Testes para o MarkdownRenderer."""
@@ -184,6 +200,151 @@ class TestRenderContentFunction:
         assert render_content("", "plain") == ""
 
 
+class TestRenderCache:
+    """Testes para o cache de HTML renderizado."""
+
+    def test_repeated_render_uses_cache(self):
+        """Testa que o mesmo conteúdo é renderizado uma única vez."""
+        ContentRendererFactory.clear_cache()
+        content = "# Lição\n\nTexto estático."
+
+        first = render_content(content, "markdown")
+        second = render_content(content, "markdown")
+        render_content(content, "plain")
+
+        stats = ContentRendererFactory.get_cache_stats()
+        assert first == second
+        assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 2)
+
+    def test_key_includes_extensions(self):
+        """Testa que renderizadores com extensões diferentes não compartilham entradas."""
+        content = "| A |\n|---|\n| 1 |"
+        key_tables = RenderCache.make_key("markdown", MarkdownRenderer(["tables"]), content)
+        key_default = RenderCache.make_key("markdown", MarkdownRenderer(), content)
+        assert key_tables != key_default
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        """Testa a remoção LRU ao exceder o limite de bytes."""
+        cache = RenderCache(max_bytes=10)
+        cache.put("a", "xxxx")
+        cache.put("b", "yyyy")
+        cache.get("a")
+        cache.put("c", "zzzz")
+        cache.put("grande", "w" * 11)  # Maior que o limite: não é armazenado
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "xxxx" and cache.get("c") == "zzzz"
+        assert cache.get_stats()["bytes"] == 8
+        assert cache.get_stats()["evictions"] == 1
+
+
+@pytest.fixture
+def highlight_cache():
+    """Instala o cache de realce durante o teste (desfazendo a instalação feita por ele)."""
+    installed = install_highlight_cache()
+    yield
+    if installed:
+        uninstall_highlight_cache()
+
+
+@pytest.mark.usefixtures("highlight_cache")
+class TestHighlightCache:
+    """Testes para o cache de blocos de código realçados."""
+
+    def test_repeated_snippet_is_highlighted_once(self):
+        """Testa que o mesmo bloco em conteúdos diferentes reaproveita o realce."""
+        snippet = "```python\nimport os\nprint(os.getcwd())  # bloco-de-cache\n```"
+        before = get_highlight_cache_stats()
+
+        first = MarkdownRenderer().render("# Lição A\n\n" + snippet)
+        second = MarkdownRenderer().render("# Lição B\n\n" + snippet)
+
+        after = get_highlight_cache_stats()
+        assert after["misses"] - before["misses"] == 1
+        assert after["hits"] - before["hits"] == 1
+        assert first.split("</h1>", 1)[1] == second.split("</h1>", 1)[1]
+
+    def test_language_is_part_of_the_key(self):
+        """Testa que o mesmo código em linguagens diferentes não compartilha entradas."""
+        python_html = MarkdownRenderer().render("```python\necho $HOME\n```")
+        bash_html = MarkdownRenderer().render("```bash\necho $HOME\n```")
+        assert python_html != bash_html
+
+    def test_other_markdown_users_bypass_the_cache(self):
+        """Testa que conversões fora do `MarkdownRenderer` chamam o Pygments diretamente."""
+        snippet = "```python\nprint('fora do renderizador')\n```"
+        before = get_highlight_cache_stats()
+
+        for _ in range(2):
+            markdown.markdown(snippet, extensions=["codehilite", "fenced_code"])
+
+        after = get_highlight_cache_stats()
+        assert (after["hits"], after["misses"]) == (before["hits"], before["misses"])
+
+    def test_uninstall_restores_pygments(self):
+        """Testa que a instalação é explícita e pode ser desfeita."""
+        assert codehilite.highlight is cached_highlight
+        uninstall_highlight_cache()
+        try:
+            assert codehilite.highlight is not cached_highlight
+            before = get_highlight_cache_stats()
+            MarkdownRenderer().render("```python\nprint('sem cache')\n```")
+            assert get_highlight_cache_stats()["misses"] == before["misses"]
+        finally:
+            install_highlight_cache()
+
+
+class TestMarkdownInstanceReuse:
+    """Testes das instâncias de `Markdown` reaproveitadas por thread."""
+
+    CONTENT = "# Título\n\nUm parágrafo com **negrito** e `código`.\n\n- item 1\n- item 2\n"
+
+    def test_reuse_matches_fresh_instance(self):
+        """Testa que o estado de uma conversão não vaza para a seguinte (ids do toc, notas etc.)."""
+        renderer = MarkdownRenderer()
+        expected = markdown.markdown(self.CONTENT, extensions=renderer.extensions)
+        assert [renderer.render(self.CONTENT) for _ in range(3)] == [expected] * 3
+
+    def test_threads_use_their_own_instance(self):
+        """Testa renderizações concorrentes no renderizador compartilhado."""
+        renderer = MarkdownRenderer()
+        contents = [f"# Seção {i}\n\n" + "texto " * 200 for i in range(8)]
+        expected = [markdown.markdown(c, extensions=renderer.extensions) for c in contents]
+        results = [None] * len(contents)
+
+        def work(i):
+            for _ in range(20):
+                results[i] = renderer.render(contents[i])
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(len(contents))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == expected
+
+    @pytest.mark.benchmark
+    def test_benchmark_per_render_overhead(self):
+        """Benchmark: reaproveitar a instância evita recriar o `Markdown` e suas extensões."""
+        renderer = MarkdownRenderer()
+
+        def median_us(render, rounds=5, renders=200):
+            samples = []
+            for _ in range(rounds):
+                start = time.perf_counter_ns()
+                for _ in range(renders):
+                    render(self.CONTENT)
+                samples.append((time.perf_counter_ns() - start) / renders / 1000)
+            return statistics.median(samples)
+
+        before = median_us(lambda content: markdown.markdown(content, extensions=renderer.extensions))
+        after = median_us(renderer.render)
+        logger.info(f"Renderização de Markdown: {before:.0f} µs (markdown.markdown) -> {after:.0f} µs (reaproveitado)")
+
+        assert after < before * 0.85
+
+
 class TestIntegration:
     """Testes de integração para o sistema de renderização."""
 
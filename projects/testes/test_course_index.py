@@ -0,0 +1,90 @@
+"""
+Testes para o módulo course_index.
+
+Verifica as consultas O(1) de lições/exercícios, o filtro por nível do curso
+e a reconstrução do índice somente quando o conteúdo muda.
+"""
+
+from projects.course_index import CourseIndex, clear_course_indexes, get_course_index
+
+COURSE = {"id": "python-basico", "level": "Básico"}
+
+LESSONS = [
+    {"id": "l1", "title": "Lição 1"},
+    {"id": "l2", "title": "Lição 2"},
+    {"id": "l3", "title": "Lição 3"},
+]
+
+EXERCISES = [
+    {"id": "e1", "lesson_id": "l1", "level": "básico"},
+    {"id": "e-avancado", "lesson_id": "l1", "level": "avançado"},
+    {"id": "e2", "lesson_id": "l1", "level": "BÁSICO"},
+    {"id": "e3", "lesson_id": "l2", "level": "básico"},
+    {"id": 4, "lesson_id": "l2"},
+]
+
+
+class TestCourseIndex:
+    """Testes para o CourseIndex."""
+
+    def test_lookup_by_id(self):
+        index = CourseIndex(COURSE, LESSONS, EXERCISES)
+
+        assert index.get_lesson("l2")["title"] == "Lição 2"
+        assert index.get_exercise("e3")["lesson_id"] == "l2"
+        assert index.get_lesson("inexistente") is None
+
+    def test_exercises_filtered_by_course_level(self):
+        index = CourseIndex(COURSE, LESSONS, EXERCISES)
+
+        assert index.get_exercise("e-avancado") is None
+        assert index.get_exercise("4") is None  # sem nível não corresponde ao nível do curso
+        assert [ex["id"] for ex in index.get_exercises_for_lesson("l1")] == ["e1", "e2"]
+        assert index.get_exercises_for_lesson("l3") == []
+
+    def test_course_without_level_keeps_all_exercises(self):
+        index = CourseIndex({"id": "livre"}, LESSONS, EXERCISES)
+
+        assert index.get_exercise("e-avancado") is not None
+        assert index.get_exercise("4") is not None
+
+    def test_next_and_previous_pointers(self):
+        index = CourseIndex(COURSE, LESSONS, EXERCISES)
+
+        assert index.get_next_exercise("e1")["id"] == "e2"
+        assert index.get_next_exercise("e2") is None
+        assert index.get_previous_exercise("e2")["id"] == "e1"
+        assert index.get_next_lesson("l1")["id"] == "l2"
+        assert index.get_next_lesson("l3") is None
+        assert index.get_previous_lesson("l1") is None
+        assert index.get_lesson_for_exercise("e3")["id"] == "l2"
+
+
+class TestCourseIndexRegistry:
+    """Testes para get_course_index."""
+
+    def setup_method(self):
+        clear_course_indexes()
+
+    def test_reuses_index_for_same_lists(self):
+        first = get_course_index(COURSE, LESSONS, EXERCISES)
+        assert get_course_index(COURSE, LESSONS, EXERCISES) is first
+
+    def test_rebuilds_when_content_changes(self):
+        first = get_course_index(COURSE, LESSONS, EXERCISES)
+        reloaded = list(EXERCISES)
+        assert get_course_index(COURSE, LESSONS, reloaded) is not first
+
+    def test_rebuilds_when_level_changes(self):
+        first = get_course_index(COURSE, LESSONS, EXERCISES)
+        second = get_course_index({"id": "python-basico", "level": "Avançado"}, LESSONS, EXERCISES)
+        assert second is not first
+        assert second.get_exercise("e-avancado") is not None
+
+
+def test_get_exercise_by_id_uses_index(app_test_data):
+    """get_exercise_by_id encontra exercícios pelo índice do arquivo."""
+    from projects.exercise_manager import get_exercise_by_id
+
+    assert get_exercise_by_id("ex-introducao-1", "basic")["title"] == "Olá, Mundo!"
+    assert get_exercise_by_id("nao-existe", "basic") is None
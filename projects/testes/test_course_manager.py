@@ -0,0 +1,134 @@
+"""
+Testes para o CourseManager.
+
+Verifica o snapshot imutável id -> curso (consistência após escritas), que
+`get_course_by_id` consulta apenas o índice (sem percorrer a lista) e inclui
+um benchmark opcional (RUN_BENCHMARKS=1) mostrando que o custo da busca não
+cresce com o número de cursos em `courses.json`.
+"""
+
+import json
+import logging
+import random
+import statistics
+import time
+
+import pytest
+
+from projects.course_manager import CourseManager
+
+logger = logging.getLogger(__name__)
+
+
+def _make_manager(tmp_path, courses):
+    """Cria um CourseManager lendo um courses.json temporário."""
+    data_dir = tmp_path / "data"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    with open(data_dir / "courses.json", "w", encoding="utf-8") as f:
+        json.dump(courses, f, ensure_ascii=False)
+    # Caminho absoluto: Path(base_dir) / absoluto resulta no próprio caminho absoluto
+    return CourseManager(data_dir_path_str=str(data_dir))
+
+
+def _fake_courses(count):
+    return [{"id": f"curso-{i}", "name": f"Curso {i}", "level": "Básico"} for i in range(count)]
+
+
+class _NoScanList(list):
+    """Lista que falha se for percorrida ou indexada."""
+
+    def __iter__(self):
+        raise AssertionError("a lista de cursos foi percorrida")
+
+    def __getitem__(self, index):
+        raise AssertionError("a lista de cursos foi indexada")
+
+    def __contains__(self, item):
+        raise AssertionError("a lista de cursos foi percorrida")
+
+
+class TestCourseSnapshot:
+    """Testes de consistência do snapshot de cursos."""
+
+    def test_lookup_by_id(self, tmp_path):
+        mgr = _make_manager(tmp_path, _fake_courses(3))
+        assert mgr.get_course_by_id("curso-1")["name"] == "Curso 1"
+        assert mgr.get_course_by_id("nao-existe") is None
+        assert mgr.get_course_by_id("") is None
+
+    def test_lookup_uses_index_not_list_scan(self, tmp_path):
+        mgr = _make_manager(tmp_path, _fake_courses(1000))
+        snapshot = mgr._snapshot
+        mgr._snapshot = snapshot._replace(courses=_NoScanList())
+
+        assert mgr.get_course_by_id("curso-999") is snapshot.by_id["curso-999"]
+        assert mgr.get_course_by_id(999) is None
+
+    def test_add_course_updates_snapshot(self, tmp_path):
+        mgr = _make_manager(tmp_path, _fake_courses(1))
+        old_courses = mgr.get_courses()
+
+        added = mgr.add_course({"id": "novo", "name": "Novo"})
+
+        assert added is not None
+        assert mgr.get_course_by_id("novo") is added
+        assert len(mgr.get_courses()) == 2
+        assert len(old_courses) == 1  # leitores do snapshot anterior não são afetados
+        assert mgr.add_course({"id": "novo", "name": "Duplicado"}) is None
+
+    def test_update_course_is_copy_on_write(self, tmp_path):
+        mgr = _make_manager(tmp_path, _fake_courses(2))
+        before = mgr.get_course_by_id("curso-0")
+
+        updated = mgr.update_course("curso-0", {"name": "Renomeado", "id": "outro-id"})
+
+        assert updated["name"] == "Renomeado"
+        assert updated["id"] == "curso-0"
+        assert before["name"] == "Curso 0"
+        assert mgr.get_course_by_id("curso-0") is updated
+        with open(mgr.courses_file, encoding="utf-8") as f:
+            assert json.load(f)[0]["name"] == "Renomeado"
+
+    def test_delete_course_updates_snapshot(self, tmp_path):
+        mgr = _make_manager(tmp_path, _fake_courses(2))
+        assert mgr.delete_course("curso-1") is True
+        assert mgr.get_course_by_id("curso-1") is None
+        assert mgr.delete_course("curso-1") is False
+
+    def test_assigning_courses_rebuilds_index(self, tmp_path):
+        mgr = _make_manager(tmp_path, _fake_courses(1))
+        mgr.courses = [{"id": "x", "name": "X"}]
+        assert mgr.get_course_by_id("x")["name"] == "X"
+        assert mgr.get_course_by_id("curso-0") is None
+
+
+@pytest.mark.benchmark
+class TestCourseLookupBenchmark:
+    """Benchmark: o custo da busca por ID permanece constante com o crescimento do catálogo."""
+
+    LOOKUPS = 20000
+
+    def _median_lookup_ns(self, mgr, course_count):
+        ids = [f"curso-{random.randrange(course_count)}" for _ in range(self.LOOKUPS)]
+        samples = []
+        for _ in range(5):
+            start = time.perf_counter_ns()
+            for course_id in ids:
+                mgr.get_course_by_id(course_id)
+            samples.append((time.perf_counter_ns() - start) / self.LOOKUPS)
+        return statistics.median(samples)
+
+    def test_lookup_cost_is_flat(self, tmp_path):
+        timings = {}
+        for count in (10, 1000, 5000):
+            mgr = _make_manager(tmp_path / str(count), _fake_courses(count))
+            timings[count] = self._median_lookup_ns(mgr, count)
+            logger.info(f"get_course_by_id com {count} cursos: {timings[count]:.0f} ns/busca")
+
+        # Uma busca linear seria ~500x mais lenta com 5000 cursos do que com 10
+        assert timings[5000] < timings[10] * 3
+
+    def test_lookup_is_fast(self, tmp_path):
+        mgr = _make_manager(tmp_path, _fake_courses(5000))
+        assert self._median_lookup_ns(mgr, 5000) < 20_000  # bem abaixo de 20 µs por busca
+
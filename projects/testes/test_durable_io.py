@@ -0,0 +1,91 @@
+"""
+Testes para o módulo durable_io.
+
+Verifica a substituição atômica (o destino sobrevive a falhas na escrita) e o
+agrupamento de gravações concorrentes do GroupCommitWriter.
+"""
+
+import os
+import threading
+import time
+
+import pytest
+
+from projects.durable_io import GroupCommitWriter, atomic_write_bytes, atomic_write_text
+
+
+class TestAtomicWrite:
+    """Testes de atomic_write_bytes / atomic_write_text."""
+
+    def test_replaces_content(self, tmp_path):
+        target = tmp_path / "dados.json"
+        atomic_write_text(target, "antigo")
+        atomic_write_text(target, "novo ✓", fsync_dir=True)
+
+        assert target.read_text(encoding="utf-8") == "novo ✓"
+        assert [p.name for p in tmp_path.glob("*dados.json*")] == ["dados.json"]
+
+    def test_failure_keeps_original_and_removes_temp(self, tmp_path, monkeypatch):
+        target = tmp_path / "dados.json"
+        atomic_write_text(target, "original")
+
+        def failing_replace(src, dst):
+            raise OSError("disco cheio")
+
+        monkeypatch.setattr(os, "replace", failing_replace)
+        with pytest.raises(OSError):
+            atomic_write_bytes(target, b"parcial")
+
+        assert target.read_text(encoding="utf-8") == "original"
+        assert [p.name for p in tmp_path.glob("*dados.json*")] == ["dados.json"]
+
+
+class TestGroupCommitWriter:
+    """Testes do GroupCommitWriter."""
+
+    def test_commit_writes_current_render(self, tmp_path):
+        state = {"value": b"1"}
+        writer = GroupCommitWriter(tmp_path / "f", lambda: state["value"])
+
+        writer.commit()
+        state["value"] = b"2"
+        writer.commit()
+
+        assert (tmp_path / "f").read_bytes() == b"2"
+        assert writer.commits == 2
+
+    def test_concurrent_commits_are_grouped(self, tmp_path):
+        counter = {"value": 0}
+        lock = threading.Lock()
+
+        def slow_render():
+            time.sleep(0.02)  # simula um fsync lento
+            with lock:
+                return str(counter["value"]).encode()
+
+        writer = GroupCommitWriter(tmp_path / "f", slow_render)
+
+        def worker():
+            with lock:
+                counter["value"] += 1
+            writer.commit()
+
+        threads = [threading.Thread(target=worker) for _ in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert writer.requests == 20
+        assert writer.commits < 20
+        # A última gravação reflete todas as alterações
+        assert (tmp_path / "f").read_bytes() == b"20"
+
+    def test_failure_is_raised_to_waiters(self, tmp_path):
+        def failing_render():
+            raise OSError("falha de escrita")
+
+        writer = GroupCommitWriter(tmp_path / "f", failing_render)
+        with pytest.raises(OSError):
+            writer.commit()
+        assert not (tmp_path / "f").exists()
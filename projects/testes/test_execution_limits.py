@@ -0,0 +1,125 @@
+"""
+Testes para o módulo execution_limits e para a aplicação dos limites por exercício.
+"""
+
+import json
+import threading
+import time
+import uuid
+
+import pytest
+
+from projects import app as app_module
+from projects import code_executor
+from projects.execution_limits import resolve_limits
+from projects.result_cache import result_key
+from projects.sandbox_pool import SandboxPool, resource
+
+
+class TestResolveLimits:
+    """Testes da combinação de limites do curso e do exercício."""
+
+    def test_exercise_overrides_course_defaults(self):
+        course = {"id": "c", "default_limits": {"timeout_ms": 3000, "max_memory_mb": 128}}
+        exercise = {"id": "e", "limits": {"timeout_ms": 500}}
+
+        assert resolve_limits(exercise, course) == {"timeout_ms": 500, "max_memory_mb": 128}
+        assert resolve_limits({"id": "e"}) == {}
+
+    def test_invalid_values_are_ignored(self):
+        exercise = {"id": "e", "limits": {"timeout_ms": -1, "max_memory_mb": "muito", "cpu": 1, "max_output_bytes": 10}}
+        assert resolve_limits(exercise) == {"max_output_bytes": 10}
+        assert resolve_limits({"id": "e", "limits": [1, 2]}) == {}
+
+    def test_limits_change_result_key(self):
+        exercise = {"id": "e", "test_code": "pass"}
+        assert result_key(exercise, "print(1)") == result_key(exercise, "print(1)", {})
+        assert result_key(exercise, "print(1)") != result_key(exercise, "print(1)", {"timeout_ms": 100})
+
+
+class TestExecutorLimits:
+    """Testes da aplicação dos limites na execução."""
+
+    def test_output_cap_truncates_inline(self):
+        result = code_executor.execute_with_test("print('x' * 1000)", "pass", max_output_bytes=100)
+
+        assert result["user"]["stdout"].startswith("x" * 100)
+        assert result["user"]["stdout"].endswith(code_executor.truncation_marker(100))
+
+    @pytest.mark.skipif(resource is None, reason="rlimits indisponíveis nesta plataforma")
+    def test_pool_applies_per_job_memory_and_timeout(self):
+        pool = SandboxPool(size=1, timeout=5, cpu_time_limit=5, memory_limit_mb=512)
+        try:
+            allocate = "data = bytearray(200 * 1024 * 1024)\nprint('ok')"
+            limited = pool.execute_with_test(allocate, None, memory_limit_mb=100)
+            assert limited["user"]["error_type"] == "MemoryError"
+
+            # O trabalhador volta ao limite do pool no job seguinte
+            assert pool.execute_with_test(allocate, None)["user"]["stdout"] == "ok\n"
+
+            slow = pool.execute_with_test("import time\ntime.sleep(5)", "pass", timeout=0.3)
+            assert slow["user"]["error_type"] == "TimeoutError"
+        finally:
+            pool.close()
+
+    @pytest.mark.skipif(resource is None, reason="rlimits indisponíveis nesta plataforma")
+    def test_declared_timeout_above_pool_cpu_limit(self):
+        pool = SandboxPool(size=1, timeout=20, cpu_time_limit=1, preload_modules=())
+        try:
+            busy = "import time\nend = time.process_time() + 2.5\nwhile time.process_time() < end: pass\nprint('ok')"
+            result = pool.execute_with_test(busy, "pass", timeout=10)
+            assert result["user"]["stdout"] == "ok\n"
+
+            # O trabalhador volta ao limite de CPU do pool no job seguinte
+            limited = pool.execute_with_test("while True: pass", "pass")
+            assert limited["user"]["error_type"] == "TimeoutError"
+            assert "CPU" in limited["user"]["stderr"]
+        finally:
+            pool.close()
+
+    def test_acquire_wait_does_not_depend_on_declared_timeout(self):
+        pool = SandboxPool(size=1, timeout=5, preload_modules=())
+        try:
+            busy = threading.Thread(target=pool.execute, args=("import time\ntime.sleep(1)",))
+            busy.start()
+            time.sleep(0.2)  # o único trabalhador fica ocupado por ~1s
+
+            result = pool.execute_with_test("print('ok')", "pass", timeout=0.2)
+            busy.join()
+            assert result["user"]["stdout"] == "ok\n"
+        finally:
+            pool.close()
+
+
+def test_check_exercise_uses_declared_limits(client, app_test_data, monkeypatch):
+    """Os limites de courses.json e exercises.json chegam até o executor."""
+    courses_file = app_test_data / "courses.json"
+    courses = json.loads(courses_file.read_text(encoding="utf-8"))
+    courses[0]["default_limits"] = {"timeout_ms": 2000, "max_output_bytes": 4096}
+    courses_file.write_text(json.dumps(courses), encoding="utf-8")
+    app_module.course_mgr.courses = app_module.course_mgr._load_courses()
+    exercises_file = app_test_data / "basic" / "exercises.json"
+    exercises = json.loads(exercises_file.read_text(encoding="utf-8"))
+    exercises[0]["limits"] = {"max_output_bytes": 20}
+    exercises_file.write_text(json.dumps(exercises), encoding="utf-8")
+
+    seen = []
+    original = app_module._run_submission
+
+    def run(user_code, test_code=None, cache_key=None, limits=None):
+        seen.append(limits)
+        return original(user_code, test_code, cache_key=cache_key, limits=limits)
+
+    monkeypatch.setattr(app_module, "CODE_SANDBOX", "inline")
+    monkeypatch.setattr(app_module, "_run_submission", run)
+    payload = {
+        "course_id": "python-basico",
+        "exercise_id": exercises[0]["id"],
+        "code": "print('x' * 100)",
+        "user_id": f"limits-{uuid.uuid4().hex}",
+    }
+
+    data = client.post("/api/check-exercise", json=payload).get_json()
+
+    assert seen == [{"timeout_ms": 2000, "max_output_bytes": 20}]
+    assert "saída truncada" in data["output"]
@@ -0,0 +1,125 @@
+"""
+Testes para o módulo exercise_validator e para o endpoint /api/admin/validate-exercises.
+"""
+
+import json
+import threading
+
+import pytest
+
+from projects import app as app_module
+from projects import exercise_validator
+
+
+@pytest.fixture
+def catalog(app_test_data):
+    """Catálogo de teste com um exercício reprovado e um sem test_code."""
+    exercises_file = app_test_data / "basic" / "exercises.json"
+    exercises = json.loads(exercises_file.read_text(encoding="utf-8"))
+    exercises.append({"id": "ex-errado", "solution_code": "print(1)", "test_code": "assert output == '2\\n'"})
+    exercises.append({"id": "ex-sem-teste", "solution_code": "print(1)"})
+    exercises_file.write_text(json.dumps(exercises), encoding="utf-8")
+
+    extra_dir = app_test_data / "rascunho"
+    extra_dir.mkdir()
+    (extra_dir / "exercises.json").write_text(
+        json.dumps([{"id": "ex-loop", "solution_code": "while True: pass", "test_code": "pass"}]), encoding="utf-8"
+    )
+    return app_test_data
+
+
+class TestExerciseValidator:
+    """Testes da validação em lote."""
+
+    def test_collect_uses_course_ids_and_directory_names(self, catalog):
+        exercises = exercise_validator.collect_exercises(catalog)
+
+        courses = {course_id for course_id, _, _ in exercises}
+        assert courses == {"python-basico", "rascunho"}
+        assert len(exercise_validator.collect_exercises(catalog, ["rascunho"])) == 1
+
+    def test_validate_catalog_reports_each_exercise(self, catalog):
+        report = exercise_validator.validate_catalog(catalog, workers=2, timeout=1)
+
+        by_id = {r["exercise_id"]: r for r in report["results"]}
+        assert (report["total"], report["passed"], report["failed"], report["skipped"]) == (5, 2, 2, 1)
+        assert by_id["ex-introducao-5"]["status"] == "passed"
+        assert by_id["ex-errado"]["details"].startswith("test_code falhou")
+        assert "TimeoutError" in by_id["ex-loop"]["details"]
+        assert by_id["ex-sem-teste"]["status"] == "skipped"
+        assert all(r["duration_ms"] >= 0 for r in report["results"])
+
+    def test_cli_exit_code(self, catalog, monkeypatch, capsys):
+        argv = ["exercise_validator", "--data-dir", str(catalog), "--course", "python-basico", "--workers", "1"]
+        monkeypatch.setattr("sys.argv", argv)
+
+        with pytest.raises(SystemExit) as excinfo:
+            exercise_validator.main()
+
+        assert excinfo.value.code == 1
+        assert "2 aprovados, 1 reprovados, 1 ignorados" in capsys.readouterr().out
+
+
+class TestAdminValidateEndpoint:
+    """Testes do endpoint administrativo."""
+
+    def test_disabled_without_admin_token(self, client, monkeypatch):
+        monkeypatch.setattr(app_module, "ADMIN_TOKEN", "")
+        assert client.post("/api/admin/validate-exercises").status_code == 403
+
+    def test_rejects_wrong_token(self, client, monkeypatch):
+        monkeypatch.setattr(app_module, "ADMIN_TOKEN", "segredo")
+        response = client.post("/api/admin/validate-exercises", headers={"X-Admin-Token": "errado"})
+        assert response.status_code == 403
+
+    def test_validates_catalog_as_job(self, client, monkeypatch):
+        monkeypatch.setattr(app_module, "ADMIN_TOKEN", "segredo")
+        response = client.post(
+            "/api/admin/validate-exercises",
+            json={"course_ids": ["python-basico"], "workers": 1},
+            headers={"Authorization": "Bearer segredo"},
+        )
+
+        assert response.status_code == 202
+        job = client.get(response.get_json()["poll_url"] + "?wait=30").get_json()
+        assert job["status"] == "done"
+        assert (job["result"]["total"], job["result"]["passed"]) == (2, 2)
+
+    @pytest.mark.parametrize(
+        "payload",
+        [{"workers": "4"}, {"workers": 0}, {"workers": True}, {"timeout": "x"}, {"timeout": -1}, {"course_ids": "a"}],
+    )
+    def test_rejects_invalid_parameters(self, client, monkeypatch, payload):
+        monkeypatch.setattr(app_module, "ADMIN_TOKEN", "segredo")
+        response = client.post("/api/admin/validate-exercises", json=payload, headers={"X-Admin-Token": "segredo"})
+        assert response.status_code == 400
+        assert "error" in response.get_json()
+
+    def test_workers_are_clamped_to_cpu_count(self, client, monkeypatch):
+        monkeypatch.setattr(app_module, "ADMIN_TOKEN", "segredo")
+        monkeypatch.setattr(app_module.os, "cpu_count", lambda: 2)
+        report = {"total": 0, "passed": 0, "duration_ms": 0.0}
+        monkeypatch.setattr(app_module, "validate_catalog", lambda data_dir, **kwargs: dict(report, **kwargs))
+
+        response = client.post(
+            "/api/admin/validate-exercises", json={"workers": 5000}, headers={"X-Admin-Token": "segredo"}
+        )
+        job = client.get(response.get_json()["poll_url"] + "?wait=30").get_json()
+        assert job["result"]["workers"] == 2
+
+    def test_only_one_validation_at_a_time(self, client, monkeypatch):
+        monkeypatch.setattr(app_module, "ADMIN_TOKEN", "segredo")
+        monkeypatch.setattr(app_module, "_catalog_validation", None)
+        release = threading.Event()
+        report = {"total": 0, "passed": 0, "duration_ms": 0.0}
+        monkeypatch.setattr(app_module, "validate_catalog", lambda data_dir, **kwargs: release.wait(30) and report)
+        headers = {"X-Admin-Token": "segredo"}
+
+        first = client.post("/api/admin/validate-exercises", headers=headers)
+        second = client.post("/api/admin/validate-exercises", headers=headers)
+        assert (first.status_code, second.status_code) == (202, 409)
+        assert second.get_json()["job_id"] == first.get_json()["job_id"]
+
+        release.set()
+        assert client.get(first.get_json()["poll_url"] + "?wait=30").get_json()["status"] == "done"
+        assert client.post("/api/admin/validate-exercises", headers=headers).status_code == 202
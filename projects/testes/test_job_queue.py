@@ -0,0 +1,147 @@
+"""
+Testes para o módulo job_queue e para as rotas /api/jobs/*.
+"""
+
+import threading
+import time
+import uuid
+
+import pytest
+
+from projects import app as app_module
+from projects.job_queue import DONE, FAILED, JobQueue, JobQueueFull
+
+
+class TestJobQueue:
+    """Testes da JobQueue."""
+
+    def test_runs_job_and_keeps_result(self):
+        jobs = JobQueue(workers=2)
+        try:
+            job = jobs.submit("soma", lambda a, b: a + b, 2, 3)
+            assert job.wait(5)
+            assert (job.status, job.result) == (DONE, 5)
+            assert jobs.get(job.id) is job
+        finally:
+            jobs.close()
+
+    def test_failure_uses_error_result(self):
+        jobs = JobQueue(workers=1, error_result=lambda e: {"details": f"falhou: {e}"})
+        try:
+            job = jobs.submit("erro", lambda: 1 / 0)
+            assert job.wait(5)
+            assert job.status == FAILED
+            assert job.result["details"].startswith("falhou: division by zero")
+            assert jobs.get_stats()["failed"] == 1
+        finally:
+            jobs.close()
+
+    def test_full_queue_rejects_with_retry_after(self):
+        release = threading.Event()
+        jobs = JobQueue(workers=1, max_pending=1)
+        try:
+            running = jobs.submit("bloqueia", release.wait)
+            while running.status != "running":
+                time.sleep(0.01)
+            jobs.submit("pendente", lambda: None)
+
+            with pytest.raises(JobQueueFull) as excinfo:
+                jobs.submit("excedente", lambda: None)
+
+            assert excinfo.value.retry_after >= 1
+            assert jobs.get_stats()["rejected"] == 1
+        finally:
+            release.set()
+            jobs.close()
+
+    def test_finished_jobs_expire(self):
+        jobs = JobQueue(workers=1, result_ttl=0)
+        try:
+            job = jobs.submit("rápida", lambda: None)
+            assert job.wait(5)
+            time.sleep(0.01)
+            assert jobs.get(job.id) is None
+        finally:
+            jobs.close()
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    """Fila própria do teste, com execução inline."""
+    queue = JobQueue(workers=2, max_pending=4)
+    monkeypatch.setattr(app_module, "job_queue", queue)
+    monkeypatch.setattr(app_module, "CODE_SANDBOX", "inline")
+    yield queue
+    queue.close()
+
+
+class TestJobRoutes:
+    """Testes das rotas de submissão e consulta de tarefas."""
+
+    def test_execute_code_job_poll(self, client, jobs):
+        response = client.post("/api/jobs/execute-code", json={"code": "print('fila')"})
+        assert response.status_code == 202
+        submitted = response.get_json()
+        assert response.headers["Location"].endswith(submitted["poll_url"])
+
+        data = client.get(submitted["poll_url"] + "?wait=5").get_json()
+
+        assert data["status"] == "done"
+        assert data["result"] == {"success": True, "output": "fila\n", "details": ""}
+
+    def test_check_exercise_job_events(self, client, jobs):
+        payload = {
+            "course_id": "python-basico",
+            "exercise_id": "ex-introducao-5",
+            "code": "print('Olá, Python!')",
+            "user_id": f"job-{uuid.uuid4().hex}",
+        }
+        submitted = client.post("/api/jobs/check-exercise", json=payload).get_json()
+
+        response = client.get(submitted["events_url"])
+        body = response.get_data(as_text=True)
+
+        assert response.mimetype == "text/event-stream"
+        assert body.startswith("event: status\n")
+        assert "event: result\n" in body
+        assert '"success": true' in body
+        assert '"attempts": 1' in body
+
+    def test_check_exercise_job_validates_before_enqueue(self, client, jobs):
+        payload = {"course_id": "python-basico", "exercise_id": "nao-existe", "code": "print(1)"}
+        response = client.post("/api/jobs/check-exercise", json=payload)
+
+        assert response.status_code == 404
+        assert jobs.get_stats()["submitted"] == 0
+
+    def test_full_queue_returns_429(self, client, monkeypatch):
+        release = threading.Event()
+        queue = JobQueue(workers=1, max_pending=1)
+        monkeypatch.setattr(app_module, "job_queue", queue)
+        monkeypatch.setattr(app_module, "_execute_code_payload", lambda code: release.wait(5) and {})
+        try:
+            first = client.post("/api/jobs/execute-code", json={"code": "1"})
+            while queue.pending():
+                time.sleep(0.01)  # a primeira tarefa ocupa o único trabalhador
+            second = client.post("/api/jobs/execute-code", json={"code": "1"})
+            rejected = client.post("/api/jobs/execute-code", json={"code": "1"})
+
+            assert (first.status_code, second.status_code) == (202, 202)
+            assert rejected.status_code == 429
+            assert int(rejected.headers["Retry-After"]) >= 1
+        finally:
+            release.set()
+            queue.close()
+
+    def test_unknown_job(self, client, jobs):
+        assert client.get("/api/jobs/desconhecida").status_code == 404
+        assert client.get("/api/jobs/desconhecida/events").status_code == 404
+
+    @pytest.mark.parametrize("url", ["/editor", "/courses/python-basico/exercise/ex-introducao-1/editor"])
+    def test_editor_pages_submit_through_the_queue(self, client, url):
+        page = client.get(url).get_data(as_text=True)
+
+        assert "js/code_jobs.js" in page
+        assert "runCodeJob('execute-code'" in page
+        assert "fetch('/api/execute-code'" not in page
+        assert "fetch('/api/check-exercise'" not in page
@@ -0,0 +1,107 @@
+"""
+Testes de concorrência do ProgressManager (locks por usuário).
+
+Várias threads atualizam os mesmos usuários ao mesmo tempo; os contadores
+devem permanecer exatos.
+"""
+
+import sys
+import threading
+import time
+
+import pytest
+
+from projects.progress_manager import ProgressManager
+from projects.progress_storage import ProgressStorage
+
+
+class ContendedRecord(dict):
+    """Registro de usuário cujo `get` cede o GIL, abrindo a janela de corrida entre leitura e escrita."""
+
+    def get(self, key, default=None):
+        value = super().get(key, default)
+        time.sleep(0)
+        return value
+
+
+class MemoryStorage(ProgressStorage):
+    """Backend em memória (sem I/O), para isolar a contenção no ProgressManager."""
+
+    def __init__(self, user_ids=()):
+        self.user_ids = user_ids
+
+    def load(self):
+        return {"users": {user_id: ContendedRecord(courses={}, achievements=[]) for user_id in self.user_ids}}
+
+    def save(self, progress_data, user_ids=None, events=None):
+        pass
+
+
+@pytest.fixture
+def fast_switching():
+    """Força trocas de thread frequentes para expor condições de corrida."""
+    previous = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(previous)
+
+
+def _run_threads(target, count):
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+class TestPerUserLocking:
+    """Testes da tabela de locks por usuário."""
+
+    def test_same_user_counters_stay_exact(self, fast_switching):
+        mgr = ProgressManager(storage=MemoryStorage(["aluno"]))
+        threads, exercises_per_thread, attempts_per_exercise = 8, 25, 4
+
+        def worker(thread_index):
+            for n in range(exercises_per_thread):
+                exercise_id = f"ex-{thread_index}-{n}"
+                for attempt in range(attempts_per_exercise):
+                    mgr.mark_exercise_attempt("aluno", "python-basico", exercise_id, success=attempt == 0)
+                    # Todas as threads também disputam o mesmo exercício
+                    mgr.mark_exercise_attempt("aluno", "python-basico", "compartilhado", success=False)
+                mgr.mark_lesson_complete("aluno", "python-basico", f"licao-{thread_index}-{n}")
+
+        _run_threads(worker, threads)
+
+        user = mgr.get_user_progress("aluno")
+        exercises = user["courses"]["python-basico"]["exercises"]
+        total = threads * exercises_per_thread
+        assert user["total_exercises_completed"] == total
+        assert user["total_lessons_completed"] == total
+        assert user["achievement_stats"]["perfect_exercises_count"] == total
+        assert exercises["compartilhado"]["attempts"] == total * attempts_per_exercise
+        assert exercises["compartilhado"]["failed_attempts"] == total * attempts_per_exercise
+
+    def test_many_users_update_concurrently(self, fast_switching):
+        users = [f"user-{i}" for i in range(12)]
+        mgr = ProgressManager(storage=MemoryStorage(users), lock_stripes=4)
+
+        def worker(thread_index):
+            for user_id in users:
+                mgr.mark_exercise_attempt(user_id, "python-basico", f"ex-{thread_index}", success=True)
+                mgr.unlock_achievement(user_id, "primeiro-passo")
+
+        _run_threads(worker, 6)
+
+        for user_id in users:
+            user = mgr.get_user_progress(user_id)
+            assert user["total_exercises_completed"] == 6
+            assert [a["id"] for a in user["achievements"]] == ["primeiro-passo"]
+
+    def test_user_lock_is_stable_and_reentrant(self):
+        mgr = ProgressManager(storage=MemoryStorage(), lock_stripes=8)
+        lock = mgr._user_lock("aluno")
+
+        assert mgr._user_lock("aluno") is lock
+        with lock:
+            # Métodos aninhados (mark_* -> get_course_progress -> get_user_progress) readquirem o mesmo lock
+            mgr.mark_lesson_complete("aluno", "python-basico", "intro")
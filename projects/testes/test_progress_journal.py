@@ -0,0 +1,170 @@
+"""
+Testes para o backend de diário de progresso (JournalProgressStorage).
+
+Verifica a anexação de eventos, a reaplicação do diário na inicialização,
+a tolerância a uma última linha incompleta e a compactação em snapshot.
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from projects.progress_manager import ProgressManager
+from projects.progress_storage import JournalProgressStorage, create_progress_storage
+
+
+def _journal_records(path):
+    """Lê as linhas do diário como dicionários."""
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+@pytest.fixture
+def journal_manager(tmp_path):
+    """ProgressManager usando o backend de diário em um diretório temporário."""
+    mgr = ProgressManager(data_dir_path_str=str(tmp_path), storage_backend="journal")
+    yield mgr
+    mgr.close()
+
+
+class TestJournalProgressStorage:
+    """Testes do backend de diário."""
+
+    def test_factory_creates_journal_backend(self, tmp_path):
+        storage = create_progress_storage("journal", tmp_path)
+        try:
+            assert isinstance(storage, JournalProgressStorage)
+            assert storage.journal_file == tmp_path / "user_progress.journal"
+        finally:
+            storage.close()
+
+    def test_appends_one_record_per_change_with_event(self, tmp_path, journal_manager):
+        journal_manager.mark_lesson_complete("aluno", "python-basico", "intro")
+        journal_manager.mark_exercise_attempt("aluno", "python-basico", "ex-1", success=True)
+
+        records = _journal_records(tmp_path / "user_progress.journal")
+        events = [event for record in records for event in record["events"]]
+
+        assert "lesson_completed" in events
+        assert events[-1] == "exercise_attempt"
+        assert [r["seq"] for r in records] == sorted(r["seq"] for r in records)
+        assert records[-1]["user"]["courses"]["python-basico"]["exercises"]["ex-1"]["completed"] is True
+        # O snapshot não é reescrito a cada alteração
+        assert not (tmp_path / "user_progress.json").exists()
+
+    def test_replays_journal_after_crash(self, tmp_path, journal_manager):
+        journal_manager.mark_lesson_complete("aluno", "python-basico", "intro")
+        journal_manager.unlock_achievement("aluno", "primeiro-passo")
+        # Simula uma queda: o processo termina sem close() (sem compactação)
+
+        reloaded = ProgressManager(data_dir_path_str=str(tmp_path), storage_backend="journal")
+        try:
+            user = reloaded.get_user_progress("aluno")
+            assert user["courses"]["python-basico"]["lessons"]["intro"]["completed"] is True
+            assert [a["id"] for a in user["achievements"]] == ["primeiro-passo"]
+        finally:
+            reloaded.close()
+
+    def test_torn_last_line_is_discarded(self, tmp_path, journal_manager):
+        journal_manager.mark_lesson_complete("aluno", "python-basico", "intro")
+        journal_file = tmp_path / "user_progress.journal"
+        with open(journal_file, "ab") as f:
+            f.write(b'{"seq": 999, "user_id": "aluno", "user": {"cour')
+
+        reloaded = ProgressManager(data_dir_path_str=str(tmp_path), storage_backend="journal")
+        try:
+            user = reloaded.get_user_progress("aluno")
+            assert user["total_lessons_completed"] == 1
+            assert journal_file.read_bytes().endswith(b"\n")
+
+            # Novas anexações continuam legíveis após o truncamento
+            reloaded.mark_lesson_complete("aluno", "python-basico", "variaveis")
+            assert _journal_records(journal_file)[-1]["events"] == ["lesson_completed"]
+        finally:
+            reloaded.close()
+
+    def test_compaction_folds_journal_into_snapshot(self, tmp_path):
+        storage = JournalProgressStorage(tmp_path / "user_progress.json", tmp_path / "user_progress.journal")
+        mgr = ProgressManager(data_dir_path_str=str(tmp_path), storage=storage)
+        mgr.mark_lesson_complete("aluno", "python-basico", "intro")
+
+        assert storage.compact() is True
+        assert (tmp_path / "user_progress.journal").read_bytes() == b""
+        assert not storage.compacting_file.exists()
+        snapshot = json.loads((tmp_path / "user_progress.json").read_text(encoding="utf-8"))
+        assert snapshot["users"]["aluno"]["total_lessons_completed"] == 1
+
+        mgr.mark_lesson_complete("aluno", "python-basico", "variaveis")
+        mgr.close()
+
+        reloaded = ProgressManager(data_dir_path_str=str(tmp_path), storage_backend="journal")
+        try:
+            assert reloaded.get_user_progress("aluno")["total_lessons_completed"] == 2
+            assert "journal_seq" not in reloaded.progress_data
+        finally:
+            reloaded.close()
+
+    def test_compaction_does_not_block_appends(self, tmp_path, journal_manager):
+        journal_manager.mark_lesson_complete("aluno", "python-basico", "intro")
+        storage = journal_manager.storage
+        compaction = threading.Thread(target=storage.compact)
+
+        # A cópia do usuário espera o lock dele; o diário continua aceitando anexações
+        with journal_manager._user_lock("aluno"):
+            compaction.start()
+            deadline = time.monotonic() + 5
+            while not storage.compacting_file.exists() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            journal_manager.progress_data["users"]["outro"] = {"total_lessons_completed": 0}
+            storage.save(journal_manager.progress_data, user_ids=["outro"])
+            assert compaction.is_alive()
+            assert _journal_records(tmp_path / "user_progress.journal")[-1]["user_id"] == "outro"
+        compaction.join(timeout=5)
+
+        snapshot = json.loads((tmp_path / "user_progress.json").read_text(encoding="utf-8"))
+        assert snapshot["users"]["aluno"]["total_lessons_completed"] == 1
+        assert snapshot["journal_seq"] < _journal_records(tmp_path / "user_progress.journal")[-1]["seq"]
+
+    def test_interrupted_compaction_is_replayed(self, tmp_path, journal_manager):
+        journal_manager.mark_lesson_complete("aluno", "python-basico", "intro")
+        storage = journal_manager.storage
+        # Rotação feita, mas o snapshot não chegou a ser gravado
+        with storage._lock:
+            storage._rotate_journal()
+
+        reloaded = ProgressManager(data_dir_path_str=str(tmp_path), storage_backend="journal")
+        try:
+            assert reloaded.get_user_progress("aluno")["total_lessons_completed"] == 1
+        finally:
+            reloaded.close()
+
+    def test_threshold_triggers_background_compaction(self, tmp_path):
+        storage = JournalProgressStorage(
+            tmp_path / "user_progress.json", tmp_path / "user_progress.journal", compact_threshold=3
+        )
+        mgr = ProgressManager(data_dir_path_str=str(tmp_path), storage=storage)
+        try:
+            for lesson in ("a", "b", "c"):
+                mgr.mark_lesson_complete("aluno", "python-basico", lesson)
+            deadline = time.monotonic() + 5
+            while not (tmp_path / "user_progress.json").exists() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert (tmp_path / "user_progress.json").exists()
+        finally:
+            mgr.close()
+
+    def test_write_behind_groups_events_into_one_batch(self, tmp_path):
+        mgr = ProgressManager(
+            data_dir_path_str=str(tmp_path), storage_backend="journal", write_behind=True, flush_interval=60
+        )
+        try:
+            mgr.mark_exercise_attempt("aluno", "python-basico", "ex-1", success=False)
+            mgr.mark_exercise_attempt("aluno", "python-basico", "ex-1", success=True)
+            mgr.flush()
+
+            records = _journal_records(tmp_path / "user_progress.journal")
+            assert len(records) == 1
+            assert records[0]["events"] == ["user_created", "course_started", "exercise_attempt", "exercise_attempt"]
+        finally:
+            mgr.close()
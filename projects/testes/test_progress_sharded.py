@@ -0,0 +1,205 @@
+"""
+Testes para o backend de progresso com um arquivo por usuário (ShardedProgressStorage).
+
+Verifica o layout dos shards, o carregamento sob demanda, a remoção LRU sem
+perda de alterações e a conversão a partir de um user_progress.json.
+"""
+
+import json
+import threading
+
+import pytest
+
+from projects.data_migration import migrate_to_sharded
+from projects.progress_manager import ProgressManager
+from projects.progress_storage import ShardedProgressStorage
+
+
+@pytest.fixture
+def sharded_manager(tmp_path):
+    """ProgressManager usando o backend por usuário em um diretório temporário."""
+    mgr = ProgressManager(data_dir_path_str=str(tmp_path), storage_backend="sharded")
+    yield mgr
+    mgr.close()
+
+
+class TestShardedProgressStorage:
+    """Testes do backend por usuário."""
+
+    def test_writes_one_file_per_user(self, tmp_path, sharded_manager):
+        sharded_manager.mark_lesson_complete("aluno", "python-basico", "intro")
+        sharded_manager.mark_lesson_complete("outro", "python-basico", "intro")
+
+        user_file = sharded_manager.storage._user_file("aluno")
+        assert user_file.parent.parent == tmp_path / "progress"
+        assert len(user_file.parent.name) == 2
+        assert json.loads(user_file.read_text(encoding="utf-8"))["total_lessons_completed"] == 1
+        assert sorted(sharded_manager.progress_data["users"]) == ["aluno", "outro"]
+
+    def test_unsafe_user_ids_stay_inside_progress_dir(self, tmp_path, sharded_manager):
+        for user_id in ("../fora", "..", "a/b"):
+            sharded_manager.mark_lesson_complete(user_id, "python-basico", "intro")
+            assert sharded_manager.storage._user_file(user_id).parent.parent == tmp_path / "progress"
+        assert sorted(sharded_manager.progress_data["users"]) == ["..", "../fora", "a/b"]
+
+    def test_users_are_loaded_lazily(self, tmp_path, sharded_manager):
+        sharded_manager.mark_lesson_complete("aluno", "python-basico", "intro")
+        sharded_manager.mark_lesson_complete("outro", "python-basico", "intro")
+        sharded_manager.close()
+
+        reloaded = ProgressManager(data_dir_path_str=str(tmp_path), storage_backend="sharded")
+        try:
+            users = reloaded.progress_data["users"]
+            assert users.cached_user_ids() == []
+            assert reloaded.get_user_progress("aluno")["total_lessons_completed"] == 1
+            assert users.cached_user_ids() == ["aluno"]
+            assert users.loads == 1
+        finally:
+            reloaded.close()
+
+    def test_lru_eviction_keeps_unsaved_changes(self, tmp_path):
+        storage = ShardedProgressStorage(tmp_path / "progress", max_cached_users=2)
+        mgr = ProgressManager(data_dir_path_str=str(tmp_path), storage=storage, write_behind=True, flush_interval=60)
+        try:
+            # Alterações ainda não gravadas (write-behind) no usuário que será removido
+            mgr.mark_lesson_complete("u1", "python-basico", "intro")
+            mgr.get_user_progress("u2")
+            mgr.get_user_progress("u3")
+
+            users = mgr.progress_data["users"]
+            assert users.evictions >= 1
+            assert "u1" not in users._cache
+            assert storage._read_user("u1")["total_lessons_completed"] == 1
+        finally:
+            mgr.close()
+
+    def test_evicted_record_still_referenced_is_reused(self, tmp_path):
+        storage = ShardedProgressStorage(tmp_path / "progress", max_cached_users=1)
+        mgr = ProgressManager(data_dir_path_str=str(tmp_path), storage=storage)
+        try:
+            held = mgr.get_user_progress("u1")
+            mgr.get_user_progress("u2")  # remove u1 do LRU
+            held["total_lessons_completed"] = 7  # alteração em um registro já removido
+
+            assert mgr.get_user_progress("u1") is held
+            assert mgr.get_user_progress("u1")["total_lessons_completed"] == 7
+        finally:
+            mgr.close()
+
+    def test_eviction_skips_user_locked_by_another_thread(self, tmp_path):
+        storage = ShardedProgressStorage(tmp_path / "progress", max_cached_users=1)
+        mgr = ProgressManager(data_dir_path_str=str(tmp_path), storage=storage, write_behind=True, flush_interval=60)
+        try:
+            mgr.mark_lesson_complete("u1", "python-basico", "intro")
+            locked, release = threading.Event(), threading.Event()
+
+            def hold_u1():
+                with mgr._user_lock("u1"):
+                    locked.set()
+                    release.wait(5)
+
+            holder = threading.Thread(target=hold_u1)
+            holder.start()
+            locked.wait(5)
+            other = next(f"u{i}" for i in range(2, 100) if mgr._user_lock(f"u{i}") is not mgr._user_lock("u1"))
+            mgr.get_user_progress(other)  # remove u1 sem esperar pelo lock dele
+
+            users = mgr.progress_data["users"]
+            assert "u1" in users._unsaved
+            assert storage._read_user("u1") is None
+            release.set()
+            holder.join()
+
+            mgr.flush()
+            assert storage._read_user("u1")["total_lessons_completed"] == 1
+            assert "u1" not in users._unsaved
+        finally:
+            release.set()
+            mgr.close()
+
+    def test_eviction_write_error_is_not_raised(self, tmp_path, monkeypatch):
+        storage = ShardedProgressStorage(tmp_path / "progress", max_cached_users=1)
+        mgr = ProgressManager(data_dir_path_str=str(tmp_path), storage=storage, write_behind=True, flush_interval=60)
+        try:
+            mgr.mark_lesson_complete("u1", "python-basico", "intro")
+
+            def fail(user_id, serialized):
+                raise OSError("disco cheio")
+
+            monkeypatch.setattr(storage, "_write_user", fail)
+            assert mgr.get_user_progress("u2")["total_lessons_completed"] == 0
+            assert "u1" in mgr.progress_data["users"]._unsaved
+
+            monkeypatch.undo()
+            mgr.flush()
+            assert storage._read_user("u1")["total_lessons_completed"] == 1
+        finally:
+            mgr.close()
+
+    def test_meta_is_written_on_save(self, tmp_path):
+        mgr = ProgressManager(data_dir_path_str=str(tmp_path), storage_backend="sharded")
+        mgr.mark_lesson_complete("aluno", "python-basico", "intro")
+        created_at = mgr.progress_data["created_at"]
+        last_updated = mgr.progress_data["last_updated"]
+
+        # Sem close(): simula um processo encerrado abruptamente
+        reloaded = ProgressManager(data_dir_path_str=str(tmp_path), storage_backend="sharded")
+        try:
+            assert reloaded.progress_data["created_at"] == created_at
+            # last_updated é gravado de forma adiada: pode estar até `meta_interval` atrasado
+            assert reloaded.progress_data["last_updated"] <= last_updated
+        finally:
+            reloaded.close()
+            mgr.close()
+
+
+    def test_last_updated_is_written_lazily(self, tmp_path, monkeypatch):
+        storage = ShardedProgressStorage(tmp_path / "progress", meta_interval=3600)
+        mgr = ProgressManager(data_dir_path_str=str(tmp_path), storage=storage)
+        writes = []
+        save_meta = storage._save_meta
+
+        def counting_save_meta(force=True):
+            saved_at = storage._meta_saved_at
+            save_meta(force)
+            if storage._meta_saved_at != saved_at:
+                writes.append(storage._meta["last_updated"])
+
+        monkeypatch.setattr(storage, "_save_meta", counting_save_meta)
+        try:
+            for lesson in ("a", "b", "c"):
+                mgr.mark_lesson_complete("aluno", "python-basico", lesson)
+            assert len(writes) == 1  # Apenas a primeira gravação; as seguintes aguardam o intervalo
+            assert storage._meta_dirty
+        finally:
+            mgr.close()
+
+        assert len(writes) == 2
+        meta = json.loads((tmp_path / "progress" / "meta.json").read_text(encoding="utf-8"))
+        assert meta["last_updated"] == writes[-1] == mgr.progress_data["last_updated"]
+
+
+class TestMigrateToSharded:
+    """Testes da conversão de user_progress.json para o layout por usuário."""
+
+    def test_converts_and_migrates_users(self, tmp_path):
+        json_path = tmp_path / "user_progress.json"
+        json_path.write_text(
+            json.dumps({"users": {"aluno": {"courses": {}, "total_lessons_completed": 3}}, "created_at": "2024-01-01"}),
+            encoding="utf-8",
+        )
+
+        assert migrate_to_sharded(str(json_path), str(tmp_path / "progress")) is True
+
+        mgr = ProgressManager(data_dir_path_str=str(tmp_path), storage_backend="sharded")
+        try:
+            user = mgr.get_user_progress("aluno")
+            assert user["total_lessons_completed"] == 3
+            assert user["achievements"] == []
+            assert "perfect_exercises_count" in user["achievement_stats"]
+            assert mgr.progress_data["created_at"] == "2024-01-01"
+        finally:
+            mgr.close()
+
+    def test_missing_file_returns_false(self, tmp_path):
+        assert migrate_to_sharded(str(tmp_path / "missing.json"), str(tmp_path / "progress")) is False
@@ -0,0 +1,208 @@
+"""
+Testes para os backends de armazenamento de progresso (progress_storage).
+
+Verifica o round-trip do backend SQLite através do ProgressManager, a gravação
+apenas das linhas afetadas e a importação de um user_progress.json existente.
+"""
+
+import json
+import sqlite3
+import sys
+
+import pytest
+
+from projects.progress_manager import ProgressManager
+from projects import data_migration
+from projects.progress_storage import (
+    JsonFileProgressStorage,
+    ShardedProgressStorage,
+    SqliteProgressStorage,
+    create_progress_storage,
+)
+
+
+@pytest.fixture
+def sqlite_manager(tmp_path):
+    """ProgressManager usando o backend SQLite em um diretório temporário."""
+    mgr = ProgressManager(data_dir_path_str=str(tmp_path), storage_backend="sqlite")
+    yield mgr
+    mgr.close()
+
+
+class TestSqliteProgressStorage:
+    """Testes do backend SQLite."""
+
+    def test_uses_wal_mode(self, sqlite_manager):
+        mode = sqlite_manager.storage._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode.lower() == "wal"
+
+    def test_round_trip_through_progress_manager(self, tmp_path, sqlite_manager):
+        sqlite_manager.mark_lesson_complete("aluno", "python-basico", "intro")
+        sqlite_manager.mark_exercise_attempt("aluno", "python-basico", "ex-1", success=False)
+        sqlite_manager.mark_exercise_attempt("aluno", "python-basico", "ex-1", success=True)
+        sqlite_manager.unlock_achievement("aluno", "primeiro-passo")
+        sqlite_manager.close()
+
+        reloaded = ProgressManager(data_dir_path_str=str(tmp_path), storage_backend="sqlite")
+        try:
+            user = reloaded.get_user_progress("aluno")
+            course = user["courses"]["python-basico"]
+            exercise = course["exercises"]["ex-1"]
+
+            assert course["lessons"]["intro"]["completed"] is True
+            assert exercise["attempts"] == 2
+            assert exercise["successful_attempts"] == 1
+            assert exercise["failed_attempts"] == 1
+            assert exercise["completed"] is True
+            assert exercise["first_attempt_success"] is False
+            assert user["total_lessons_completed"] == 1
+            assert user["total_exercises_completed"] == 1
+            assert [a["id"] for a in user["achievements"]] == ["primeiro-passo"]
+            assert user["achievement_stats"]["lessons_in_day"] == 1
+        finally:
+            reloaded.close()
+
+    def test_save_touches_only_affected_rows(self, sqlite_manager):
+        for i in range(50):
+            sqlite_manager.mark_lesson_complete(f"aluno-{i}", "python-basico", "intro")
+
+        conn = sqlite_manager.storage._conn
+        changes_before = conn.total_changes
+        sqlite_manager.mark_exercise_attempt("aluno-7", "python-basico", "ex-1", success=False)
+
+        # Linha do exercício + linha do curso (last_accessed) + metadados; nada dos outros 49 usuários
+        assert conn.total_changes - changes_before <= 4
+
+    def test_unknown_fields_are_preserved(self, tmp_path):
+        storage = SqliteProgressStorage(tmp_path / "p.db")
+        data = {"users": {"u": {"courses": {"c": {"lessons": {}, "exercises": {"e": {"attempts": 1, "nota": 9}}}}}}}
+        storage.save(data)
+        storage.close()
+
+        loaded = SqliteProgressStorage(tmp_path / "p.db")
+        try:
+            assert loaded.load()["users"]["u"]["courses"]["c"]["exercises"]["e"] == {"attempts": 1, "nota": 9}
+        finally:
+            loaded.close()
+
+    def test_import_json(self, tmp_path):
+        json_path = tmp_path / "user_progress.json"
+        legacy = {
+            "users": {
+                "u1": {
+                    "courses": {"c": {"lessons": {"l": {"completed": True}}, "exercises": {}}},
+                    "total_lessons_completed": 1,
+                }
+            }
+        }
+        json_path.write_text(json.dumps(legacy), encoding="utf-8")
+
+        storage = SqliteProgressStorage(tmp_path / "p.db")
+        try:
+            assert storage.import_json(json_path) == 1
+            user = storage.load()["users"]["u1"]
+            assert user["courses"]["c"]["lessons"]["l"]["completed"] is True
+            assert user["achievements"] == []  # campos adicionados por migrate_user_progress
+            assert user["achievement_stats"]["perfect_exercises_count"] == 0
+        finally:
+            storage.close()
+
+    def test_migrate_to_sqlite(self, tmp_path):
+        from projects.data_migration import migrate_to_sqlite
+
+        json_path = tmp_path / "user_progress.json"
+        json_path.write_text(json.dumps({"users": {"u1": {"courses": {}}}}), encoding="utf-8")
+
+        assert migrate_to_sqlite(str(json_path), str(tmp_path / "p.db")) is True
+        assert migrate_to_sqlite(str(tmp_path / "nao-existe.json"), str(tmp_path / "p.db")) is False
+
+    def test_failed_import_is_reported(self, tmp_path, monkeypatch):
+        json_path = tmp_path / "user_progress.json"
+        json_path.write_text(json.dumps({"users": {"u1": {"courses": {}}}}), encoding="utf-8")
+
+        def fail(self, user_id, user_data):
+            raise sqlite3.OperationalError("disk I/O error")
+
+        monkeypatch.setattr(SqliteProgressStorage, "_save_user", fail)
+        storage = SqliteProgressStorage(tmp_path / "p.db")
+        try:
+            with pytest.raises(OSError):
+                storage.import_json(json_path)
+        finally:
+            storage.close()
+        assert data_migration.migrate_to_sqlite(str(json_path), str(tmp_path / "p.db")) is False
+
+
+class TestJsonFileProgressStorage:
+    """Testes da serialização incremental do backend JSON."""
+
+    def test_file_matches_full_dump(self, tmp_path):
+        mgr = ProgressManager(data_dir_path_str=str(tmp_path))
+        for i in range(5):
+            mgr.mark_lesson_complete(f"aluno-{i}", "python-básico", "intro")
+        mgr.mark_exercise_attempt("aluno-2", "python-básico", "ex-1", success=True)
+
+        written = (tmp_path / "user_progress.json").read_text(encoding="utf-8")
+        expected = {"users": mgr.progress_data["users"]}
+        expected.update((k, v) for k, v in mgr.progress_data.items() if k != "users")
+        assert written == json.dumps(expected, indent=4, ensure_ascii=False)
+
+    def test_save_serializes_only_changed_users(self, tmp_path, monkeypatch):
+        mgr = ProgressManager(data_dir_path_str=str(tmp_path))
+        for i in range(20):
+            mgr.mark_lesson_complete(f"aluno-{i}", "python-basico", "intro")
+
+        serialized = []
+        original = JsonFileProgressStorage._serialize_user
+        monkeypatch.setattr(
+            JsonFileProgressStorage,
+            "_serialize_user",
+            staticmethod(lambda user_id, data: serialized.append(user_id) or original(user_id, data)),
+        )
+        mgr.mark_exercise_attempt("aluno-7", "python-basico", "ex-1", success=True)
+
+        assert serialized == ["aluno-7"]
+        reloaded = ProgressManager(data_dir_path_str=str(tmp_path))
+        assert len(reloaded.progress_data["users"]) == 20
+        assert reloaded.get_user_progress("aluno-7")["total_exercises_completed"] == 1
+
+    def test_replaced_users_dict_triggers_full_rewrite(self, tmp_path):
+        mgr = ProgressManager(data_dir_path_str=str(tmp_path))
+        mgr.mark_lesson_complete("antigo", "python-basico", "intro")
+
+        mgr.progress_data["users"] = {}
+        mgr.mark_lesson_complete("novo", "python-basico", "intro")
+
+        reloaded = ProgressManager(data_dir_path_str=str(tmp_path))
+        assert list(reloaded.progress_data["users"]) == ["novo"]
+
+
+class TestStorageFactory:
+    """Testes de create_progress_storage."""
+
+    def test_default_is_json_file(self, tmp_path):
+        storage = create_progress_storage("json", tmp_path)
+        assert isinstance(storage, JsonFileProgressStorage)
+        assert (tmp_path / "user_progress.json").exists()
+
+    def test_unknown_backend_raises(self, tmp_path):
+        with pytest.raises(ValueError):
+            create_progress_storage("redis", tmp_path)
+
+
+class TestMigrationCli:
+    """Testes da linha de comando de data_migration."""
+
+    def test_exits_non_zero_when_nothing_is_written(self, tmp_path, monkeypatch):
+        json_path = tmp_path / "user_progress.json"
+        json_path.write_text(json.dumps({"users": {"u1": {"courses": {}}}}), encoding="utf-8")
+
+        def fail(self, user_id, serialized):
+            raise OSError("disco cheio")
+
+        monkeypatch.setattr(ShardedProgressStorage, "_write_user", fail)
+        monkeypatch.setattr(data_migration.logging, "basicConfig", lambda **kwargs: None)
+        monkeypatch.setattr(sys, "argv", ["data_migration", str(json_path), "--to-sharded", str(tmp_path / "progress")])
+        with pytest.raises(SystemExit) as exit_info:
+            data_migration.main()
+        assert exit_info.value.code == 1
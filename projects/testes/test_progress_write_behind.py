@@ -0,0 +1,109 @@
+"""
+Testes do modo write-behind do ProgressManager.
+
+Verifica que rajadas de alterações são agrupadas em poucas gravações, que o
+tamanho do lote antecipa a gravação e que `close()` grava o que estiver pendente.
+"""
+
+import threading
+import time
+
+from projects.progress_manager import ProgressManager
+from projects.progress_storage import ProgressStorage
+
+
+class CountingStorage(ProgressStorage):
+    """Backend em memória que conta as gravações."""
+
+    def __init__(self):
+        self.saves = []
+        self.saved_event = threading.Event()
+        self.closed = False
+
+    def load(self):
+        return {"users": {}}
+
+    def save(self, progress_data, user_ids=None, events=None):
+        self.saves.append(None if user_ids is None else sorted(user_ids))
+        self.saved_event.set()
+
+    def close(self):
+        self.closed = True
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestWriteBehind:
+    """Testes do agrupamento de gravações."""
+
+    def test_synchronous_mode_saves_every_change(self, tmp_path):
+        storage = CountingStorage()
+        mgr = ProgressManager(data_dir_path_str=str(tmp_path), storage=storage)
+
+        mgr.mark_lesson_complete("u1", "c1", "l1")
+
+        # Criação do usuário, do curso e a marcação da lição
+        assert len(storage.saves) == 3
+
+    def test_burst_collapses_into_single_write(self, tmp_path):
+        storage = CountingStorage()
+        mgr = ProgressManager(data_dir_path_str=str(tmp_path), storage=storage, write_behind=True, flush_interval=60)
+        try:
+            for i in range(20):
+                mgr.mark_exercise_attempt("u1", "c1", f"ex-{i}", success=True)
+                mgr.mark_lesson_complete("u2", "c1", f"l-{i}")
+            assert storage.saves == []
+
+            mgr.flush()
+            assert storage.saves == [["u1", "u2"]]
+        finally:
+            mgr.close()
+
+    def test_interval_triggers_background_flush(self, tmp_path):
+        storage = CountingStorage()
+        mgr = ProgressManager(data_dir_path_str=str(tmp_path), storage=storage, write_behind=True, flush_interval=0.05)
+        try:
+            mgr.mark_lesson_complete("u1", "c1", "l1")
+            assert storage.saved_event.wait(2.0)
+            assert storage.saves[0] == ["u1"]
+        finally:
+            mgr.close()
+
+    def test_batch_size_triggers_early_flush(self, tmp_path):
+        storage = CountingStorage()
+        mgr = ProgressManager(
+            data_dir_path_str=str(tmp_path), storage=storage, write_behind=True, flush_interval=60, flush_batch_size=5
+        )
+        try:
+            for i in range(5):
+                mgr.unlock_achievement("u1", f"ach-{i}")
+            assert _wait_for(lambda: len(storage.saves) >= 1)
+        finally:
+            mgr.close()
+
+    def test_close_flushes_pending_changes(self, tmp_path):
+        storage = CountingStorage()
+        mgr = ProgressManager(data_dir_path_str=str(tmp_path), storage=storage, write_behind=True, flush_interval=60)
+
+        mgr.mark_lesson_complete("u1", "c1", "l1")
+        mgr.close()
+
+        assert storage.saves == [["u1"]]
+        assert storage.closed is True
+        mgr.close()  # idempotente
+        assert len(storage.saves) == 1
+
+    def test_json_backend_persists_on_close(self, tmp_path):
+        mgr = ProgressManager(data_dir_path_str=str(tmp_path), write_behind=True, flush_interval=60)
+        mgr.mark_lesson_complete("u1", "c1", "l1")
+        mgr.close()
+
+        reloaded = ProgressManager(data_dir_path_str=str(tmp_path))
+        assert reloaded.get_course_progress("u1", "c1")["lessons"]["l1"]["completed"] is True
@@ -0,0 +1,125 @@
+"""
+Testes para o módulo result_cache e para o reaproveitamento de vereditos em /api/check-exercise.
+"""
+
+import json
+import uuid
+
+import pytest
+
+from projects import app as app_module
+from projects.result_cache import ResultCache, normalize_code, result_key
+
+EXERCISE = {"id": "ex-1", "test_code": "assert output == 'a\\n'"}
+
+
+class TestResultCache:
+    """Testes do ResultCache."""
+
+    def test_key_ignores_line_endings_and_trailing_whitespace(self):
+        assert normalize_code("print(1)\r\nprint(2)  \n\n") == "print(1)\nprint(2)"
+        assert result_key(EXERCISE, "print('a')\r\n") == result_key(EXERCISE, "print('a')")
+
+    def test_key_changes_with_exercise_content(self):
+        edited = dict(EXERCISE, test_code="assert output == 'b\\n'")
+        assert result_key(EXERCISE, "print('a')") != result_key(edited, "print('a')")
+
+    def test_ttl_expires_entries(self):
+        now = {"t": 0.0}
+        cache = ResultCache(ttl=10, clock=lambda: now["t"])
+        key = result_key(EXERCISE, "print('a')")
+        cache.put(key, {"success": True, "output": "a\n", "details": "Teste passou."})
+
+        now["t"] = 5
+        assert cache.get(key)["success"] is True
+        now["t"] = 11
+        assert cache.get(key) is None
+
+        stats = cache.get_stats()
+        assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 1, 1)
+        assert stats["hit_rate"] == 0.5
+
+    def test_lru_limit(self):
+        cache = ResultCache(max_entries=2)
+        keys = [result_key(EXERCISE, f"print({i})") for i in range(3)]
+        for key in keys:
+            cache.put(key, {"success": False})
+        assert cache.get(keys[0]) is None
+        assert cache.get_stats()["evictions"] == 1
+
+
+@pytest.fixture
+def counting_executor(monkeypatch):
+    """Ativa o cache de vereditos e conta as execuções de código."""
+    calls = []
+    original = app_module._run_submission
+
+    def run(user_code, test_code=None, cache_key=None, limits=None):
+        calls.append(user_code)
+        return original(user_code, test_code, cache_key=cache_key, limits=limits)
+
+    monkeypatch.setattr(app_module, "RESULT_CACHE_ENABLED", True)
+    monkeypatch.setattr(app_module, "CODE_SANDBOX", "inline")
+    monkeypatch.setattr(app_module, "result_cache", ResultCache())
+    monkeypatch.setattr(app_module, "_run_submission", run)
+    return calls
+
+
+def _check(client, code, user_id, exercise_id="ex-introducao-5"):
+    payload = {"course_id": "python-basico", "exercise_id": exercise_id, "code": code, "user_id": user_id}
+    response = client.post("/api/check-exercise", json=payload)
+    assert response.status_code == 200
+    return response.get_json()
+
+
+class TestCheckExerciseResultCache:
+    """Testes do reaproveitamento de vereditos na verificação de exercícios."""
+
+    def test_identical_submission_reuses_verdict_and_counts_attempt(self, client, counting_executor):
+        user_id = f"cache-{uuid.uuid4().hex}"
+
+        first = _check(client, "print('Olá, Python!')", user_id)
+        second = _check(client, "print('Olá, Python!')\r\n", user_id)
+
+        assert len(counting_executor) == 1  # executado apenas na primeira vez
+        assert first["cached"] is False and second["cached"] is True
+        assert (second["success"], second["output"], second["details"]) == (
+            first["success"],
+            first["output"],
+            first["details"],
+        )
+        assert second["stats"]["attempts"] == 2
+        assert app_module.result_cache.get_stats()["hits"] == 1
+
+    def test_exercise_opt_out_always_executes(self, client, counting_executor, app_test_data):
+        exercises_file = app_test_data / "basic" / "exercises.json"
+        exercises = json.loads(exercises_file.read_text(encoding="utf-8"))
+        exercises[0]["cache_results"] = False
+        exercises_file.write_text(json.dumps(exercises), encoding="utf-8")
+        user_id = f"cache-{uuid.uuid4().hex}"
+
+        _check(client, "print('Olá, Python!')", user_id)
+        result = _check(client, "print('Olá, Python!')", user_id)
+
+        assert result["cached"] is False
+        assert len(counting_executor) == 2
+
+    def test_transient_errors_are_not_cached(self, client, counting_executor, monkeypatch):
+        def busy(user_code, test_code=None, cache_key=None, limits=None):
+            counting_executor.append(user_code)
+            error = {"returncode": 1, "stdout": "", "stderr": "SandboxBusy: ocupado", "error_type": "SandboxBusy"}
+            return {"user": error, "test": None}
+
+        monkeypatch.setattr(app_module, "_run_submission", busy)
+        user_id = f"cache-{uuid.uuid4().hex}"
+
+        _check(client, "print('Olá, Python!')", user_id)
+        result = _check(client, "print('Olá, Python!')", user_id)
+
+        assert result["cached"] is False
+        assert app_module.result_cache.get_stats()["entries"] == 0
+
+    def test_cache_stats_endpoint(self, client):
+        data = client.get("/api/cache/stats").get_json()
+        assert {"content", "compiled_code", "results"} <= set(data)
+        assert "hit_rate" in data["results"]
@@ -0,0 +1,138 @@
+"""
+Testes para o módulo sandbox_pool.
+
+Verifica o isolamento da saída entre execuções concorrentes, os limites de
+tempo real, CPU e memória e a reciclagem dos processos trabalhadores.
+"""
+
+import threading
+
+import pytest
+
+from projects.sandbox_pool import SandboxPool, resource
+
+
+@pytest.fixture(scope="module")
+def pool():
+    """Pool pequeno compartilhado pelos testes do módulo."""
+    sandbox = SandboxPool(size=2, timeout=2, cpu_time_limit=5, memory_limit_mb=256, max_jobs_per_worker=50)
+    yield sandbox
+    sandbox.close()
+
+
+class TestSandboxPool:
+    """Testes do SandboxPool."""
+
+    def test_executes_code_and_captures_output(self, pool):
+        result = pool.execute("print('olá')")
+        assert result == {"returncode": 0, "stdout": "olá\n", "stderr": "", "error_type": None}
+
+    def test_globals_are_passed_to_worker(self, pool):
+        result = pool.execute("assert output == 'x'\nprint('SUCCESS')", {"output": "x"})
+        assert result["stdout"] == "SUCCESS\n"
+
+    def test_cache_key_runs_memoized_code(self, pool):
+        from projects.code_cache import code_key
+
+        key = code_key("ex", "test_code", "assert output == 'x'\nprint('SUCCESS')")
+        for _ in range(3):
+            result = pool.execute("assert output == 'x'\nprint('SUCCESS')", {"output": "x"}, cache_key=key)
+            assert result["stdout"] == "SUCCESS\n"
+
+    def test_execute_with_test_runs_in_one_round_trip(self, pool):
+        before = pool.stats["executions"]
+        result = pool.execute_with_test("print('x')", "assert output == 'x\\n'\nprint('SUCCESS')")
+
+        assert result["user"]["stdout"] == "x\n"
+        assert result["test"]["stdout"] == "SUCCESS\n"
+        assert pool.stats["executions"] == before + 1
+
+    def test_execute_with_test_skips_test_when_user_code_fails(self, pool):
+        result = pool.execute_with_test("1/0", "print('não executa')")
+        assert result["user"]["error_type"] == "ZeroDivisionError"
+        assert result["test"] is None
+
+    def test_execute_with_test_timeout_is_reported_as_user_error(self, pool):
+        result = pool.execute_with_test("import time\ntime.sleep(30)", "pass", timeout=0.5)
+        assert result["user"]["error_type"] == "TimeoutError"
+        assert result["test"] is None
+
+    def test_execute_stream_yields_output_then_result(self, pool):
+        events = list(pool.execute_stream("import time\nfor i in range(3):\n    print(i)\n    time.sleep(0.1)"))
+
+        chunks = [event[2] for event in events if event[0] == "output"]
+        assert len(chunks) >= 2  # saída entregue durante a execução, não só no fim
+        assert "".join(chunks) == "0\n1\n2\n"
+        assert events[-1] == (
+            "result",
+            {"returncode": 0, "stdout": "0\n1\n2\n", "stderr": "", "error_type": None, "truncated": False},
+        )
+
+    def test_execute_stream_abandoned_replaces_worker(self, pool):
+        events = pool.execute_stream("import time\nwhile True:\n    print('x')\n    time.sleep(0.01)")
+        assert next(events)[0] == "output"
+        events.close()
+
+        assert pool.execute("print('ok')")["stdout"] == "ok\n"
+
+    def test_errors_keep_executor_format(self, pool):
+        result = pool.execute("1/0")
+        assert result["returncode"] == 1
+        assert result["error_type"] == "ZeroDivisionError"
+
+    def test_system_exit_does_not_kill_worker(self, pool):
+        assert pool.execute("raise SystemExit(3)")["error_type"] == "SystemExit"
+        assert pool.execute("print(1)")["stdout"] == "1\n"
+
+    def test_concurrent_outputs_do_not_interleave(self, pool):
+        results = {}
+
+        def run(i):
+            results[i] = pool.execute(f"for _ in range(200): print({i})")
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for i, result in results.items():
+            assert result["stdout"] == f"{i}\n" * 200
+
+    def test_wall_clock_timeout_replaces_worker(self, pool):
+        result = pool.execute("import time\ntime.sleep(30)", timeout=0.5)
+        assert result["error_type"] == "TimeoutError"
+        assert pool.execute("print('ainda funciona')")["stdout"] == "ainda funciona\n"
+
+    @pytest.mark.skipif(resource is None, reason="rlimits indisponíveis nesta plataforma")
+    def test_memory_limit(self, pool):
+        result = pool.execute("x = bytearray(1024 * 1024 * 1024)")
+        assert result["error_type"] == "MemoryError"
+
+    @pytest.mark.skipif(resource is None, reason="rlimits indisponíveis nesta plataforma")
+    def test_cpu_limit(self):
+        sandbox = SandboxPool(size=1, timeout=20, cpu_time_limit=1)
+        try:
+            result = sandbox.execute("while True: pass")
+            assert result["error_type"] == "TimeoutError"
+            assert "CPU" in result["stderr"]
+        finally:
+            sandbox.close()
+
+    def test_worker_is_recycled_after_max_jobs(self):
+        sandbox = SandboxPool(size=1, max_jobs_per_worker=2)
+        try:
+            pids = [sandbox.execute("import os; print(os.getpid())")["stdout"] for _ in range(3)]
+            assert pids[0] == pids[1] != pids[2]
+            assert sandbox.stats["recycled"] == 1
+        finally:
+            sandbox.close()
+
+    def test_preloaded_modules_are_resident_before_first_job(self):
+        sandbox = SandboxPool(size=1, preload_modules=["xml.dom.minidom", "modulo_inexistente"], start_method="spawn")
+        try:
+            assert sandbox.preload_modules == ("xml.dom.minidom",)
+            result = sandbox.execute("import sys\nprint('xml.dom.minidom' in sys.modules)")
+            assert result["stdout"] == "True\n"
+        finally:
+            sandbox.close()